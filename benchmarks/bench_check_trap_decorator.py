@@ -0,0 +1,59 @@
+"""Benchmark of the overhead CheckTrap.decorate adds to each call of a function.
+
+Compares a bare call with a decorated function while CheckTrap.disabled is set, and, with pings sent, the
+decorator with a ``with CheckTrap(...)`` block. Pings go to an httpx MockTransport that answers 200 OK in process,
+so the pinged cases measure the client's own work rather than the network. Reports the time per call.
+
+Run with ``python benchmarks/bench_check_trap_decorator.py``.
+"""
+
+import timeit
+from typing import Callable
+
+from httpx import MockTransport
+from httpx import Request
+from httpx import Response
+
+from healthchecks_io import CheckTrap
+from healthchecks_io import Client
+
+CALLS = 1_000_000
+PINGED_CALLS = 5000
+
+
+def job() -> int:
+    """The monitored function."""
+    return 1
+
+
+def ok(request: Request) -> Response:
+    """Answers every ping with a 200 OK."""
+    return Response(200, text="OK")
+
+
+def bench(name: str, call: Callable[[], object], number: int) -> None:
+    """Times a call, best of three runs, and prints the time per call."""
+    best = min(timeit.repeat(call, number=number, repeat=3))
+    print(f"{name:<36} {best / number * 1e9:12.0f} ns per call")
+
+
+def main() -> None:
+    """Runs the benchmarks."""
+    client = Client(ping_url="http://hc-ping.test/", ping_transport=MockTransport(ok))
+    decorated = CheckTrap.decorate(client, uuid="test")(job)
+
+    def with_block() -> int:
+        with CheckTrap(client, uuid="test"):
+            return job()
+
+    bench("bare call", job, CALLS)
+    CheckTrap.disabled = True
+    bench("decorated, disabled", decorated, CALLS)
+    bench("with CheckTrap, disabled", with_block, CALLS // 10)
+    CheckTrap.disabled = False
+    bench("decorated, two pings", decorated, PINGED_CALLS)
+    bench("with CheckTrap, two pings", with_block, PINGED_CALLS)
+
+
+if __name__ == "__main__":
+    main()
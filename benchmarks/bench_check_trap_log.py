@@ -0,0 +1,56 @@
+"""Benchmark of the memory CheckTrap's log takes for a job that logs a million lines.
+
+Compares the list of lines CheckTrap used to keep, joined into the ping's body at exit, with LogBuffer. Reports
+the time to add the lines and build the body, the peak memory, measured with tracemalloc in a second run, and
+the body's size.
+
+Run with ``python benchmarks/bench_check_trap_log.py``.
+"""
+
+import time
+import tracemalloc
+from typing import Callable
+from typing import List
+
+from healthchecks_io import LogBuffer
+
+LINES = 1_000_000
+
+
+def unbounded() -> str:
+    """Keeps every line, like CheckTrap did."""
+    lines: List[str] = list()
+    for index in range(LINES):
+        lines.append(f"2024-01-01 00:00:00 INFO processed item {index} of {LINES}")
+    return "\n".join(lines)
+
+
+def log_buffer() -> str:
+    """Keeps the first and last lines in a LogBuffer."""
+    log = LogBuffer()
+    for index in range(LINES):
+        log.append(f"2024-01-01 00:00:00 INFO processed item {index} of {LINES}")
+    return log.getvalue()
+
+
+def bench(name: str, job: Callable[[], str]) -> None:
+    """Runs a job, then again under tracemalloc, which slows it down, and prints its results."""
+    start = time.perf_counter()
+    job()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    body = job()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    size = len(body.encode("utf-8"))
+    print(f"{name:<12} {peak / 2**20:9.1f} MiB peak {elapsed:7.2f} s {size / 1000:9.1f} KB body")
+
+
+def main() -> None:
+    """Runs the benchmarks."""
+    bench("list", unbounded)
+    bench("LogBuffer", log_buffer)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Benchmark of hundreds of concurrent pings from AsyncClient, over HTTP/1.1 and over HTTP/2.
+
+The stand-in for hc-ping.com is a local asyncio server, in another process, that answers every ping with a 200 OK
+over https, in HTTP/2 on connections that negotiate it through ALPN and in HTTP/1.1 on the others. Its certificate
+is a throwaway self-signed one made with the openssl command, which the clients trust through SSL_CERT_FILE. The
+HTTP/2 cases use the client's own ``http2=True`` option, so they negotiate HTTP/2 the way they would with
+hc-ping.com. Each case starts from a new client, with no connection open. Reports pings per second, the
+connections the server saw and the pings that failed, which over HTTP/1.1 are mostly timeouts of pings queued
+behind the pool's 100 connections and their TLS handshakes. Needs h2, installed with the http2 extra.
+
+Run with ``python benchmarks/bench_http2.py``.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import ssl
+import subprocess
+import tempfile
+import time
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+from h2.config import H2Configuration
+from h2.connection import H2Connection
+from h2.events import DataReceived
+from h2.events import StreamEnded
+
+from healthchecks_io import AsyncClient
+
+PINGS = 500
+HTTP1_OK = b"HTTP/1.1 200 OK\r\ncontent-length: 2\r\n\r\nOK"
+
+
+class StandIn(asyncio.Protocol):
+    """Answers every request with a 200 OK, in the HTTP version the connection negotiated."""
+
+    def __init__(self, connections: Any) -> None:
+        """Counts its connections in a shared value."""
+        self.connections = connections
+        self.buffer = b""
+        self.h2: Optional[H2Connection] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Counts the connection, and starts HTTP/2 if the client picked it."""
+        self.transport: asyncio.Transport = transport  # type: ignore[assignment]
+        with self.connections.get_lock():
+            self.connections.value += 1
+        if transport.get_extra_info("ssl_object").selected_alpn_protocol() == "h2":
+            self.h2 = H2Connection(H2Configuration(client_side=False))
+            self.h2.initiate_connection()
+            self.transport.write(self.h2.data_to_send())
+
+    def data_received(self, data: bytes) -> None:
+        """Answers the requests data completes."""
+        if self.h2 is not None:
+            self.answer_h2(data)
+            return
+        self.buffer += data
+        while b"\r\n\r\n" in self.buffer:
+            head, _, rest = self.buffer.partition(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n")[1:]:
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            if len(rest) < length:
+                return
+            self.buffer = rest[length:]
+            self.transport.write(HTTP1_OK)
+
+    def answer_h2(self, data: bytes) -> None:
+        """Feeds data to the HTTP/2 connection and answers the streams it ends."""
+        assert self.h2 is not None
+        for event in self.h2.receive_data(data):
+            if isinstance(event, DataReceived):
+                self.h2.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+            elif isinstance(event, StreamEnded):
+                self.h2.send_headers(event.stream_id, [(":status", "200"), ("content-length", "2")])
+                self.h2.send_data(event.stream_id, b"OK", end_stream=True)
+        self.transport.write(self.h2.data_to_send())
+
+
+def make_certificate(directory: str) -> str:
+    """Makes a self-signed certificate for 127.0.0.1, returns the path of the file with it and its key."""
+    path = os.path.join(directory, "stand-in.pem")
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "ec",
+            "-pkeyopt",
+            "ec_paramgen_curve:prime256v1",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=127.0.0.1",
+            "-addext",
+            "subjectAltName=IP:127.0.0.1",
+            "-keyout",
+            path,
+            "-out",
+            path,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return path
+
+
+def serve(port: "multiprocessing.Queue[int]", connections: Any, certificate: str) -> None:
+    """Runs the stand-in until the process is terminated."""
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(certificate)
+    context.set_alpn_protocols(["h2", "http/1.1"])
+
+    async def run() -> None:
+        server = await asyncio.get_running_loop().create_server(
+            lambda: StandIn(connections), "127.0.0.1", 0, ssl=context, backlog=1024
+        )
+        port.put(server.sockets[0].getsockname()[1])
+        await server.serve_forever()
+
+    asyncio.run(run())
+
+
+async def bench(name: str, client: AsyncClient, connections: Any) -> None:
+    """Sends PINGS success pings at once from a client that has no connection open yet."""
+    with connections.get_lock():
+        connections.value = 0
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client.success_ping(uuid="test") for _ in range(PINGS)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for result in results if isinstance(result, BaseException))
+    print(f"{name:<30} {PINGS / elapsed:8.0f} pings/s {connections.value:5d} connections {failed:5d} failed")
+    await client._afinalizer_method()
+
+
+def main() -> None:
+    """Runs the benchmarks."""
+    with tempfile.TemporaryDirectory() as directory:
+        certificate = make_certificate(directory)
+        # httpx trusts the certificates in SSL_CERT_FILE, the clients are built with their default settings
+        os.environ["SSL_CERT_FILE"] = certificate
+        port: "multiprocessing.Queue[int]" = multiprocessing.Queue()
+        connections = multiprocessing.Value("i", 0)
+        server = multiprocessing.Process(target=serve, args=(port, connections, certificate), daemon=True)
+        server.start()
+        url = f"https://127.0.0.1:{port.get()}/"
+        cases: Dict[str, Dict[str, Any]] = {
+            "HTTP/1.1": dict(),
+            "HTTP/2": dict(http2=True),
+            "HTTP/2, ping_max_streams=100": dict(http2=True, ping_max_streams=100),
+        }
+        for name, kwargs in cases.items():
+            asyncio.run(bench(name, AsyncClient(ping_url=url, **kwargs), connections))
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Benchmark of the import time of a process that only pings, against one that uses the schemas.
+
+Each case runs in fresh interpreters with ``python -X importtime``, and reports the median wall time of the whole
+process and the import time of healthchecks_io, its lazy imports included. tests/test_imports.py checks that pinging keeps away
+from pydantic, croniter and pytz.
+
+Run with ``python benchmarks/bench_import_time.py``.
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+
+RUNS = 20
+CASES = {
+    "python only": "pass",
+    "ping only (Client)": "import healthchecks_io; healthchecks_io.Client",
+    "schemas (Check)": "import healthchecks_io; healthchecks_io.Client; healthchecks_io.Check",
+}
+
+
+def run(code: str) -> tuple:
+    """Runs code once, returns its wall time and the import time of healthchecks_io in seconds."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    package = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        # lazy imports show up as top level imports of their own, nested imports are indented
+        if name.startswith(" healthchecks_io") and cumulative.strip().isdigit():
+            package += int(cumulative) / 1e6
+    return elapsed, package
+
+
+def main() -> None:
+    """Runs the benchmarks."""
+    for name, code in CASES.items():
+        samples = [run(code) for _ in range(RUNS)]
+        wall = statistics.median(sample[0] for sample in samples)
+        package = statistics.median(sample[1] for sample in samples)
+        print(f"{name:<25} {wall * 1000:8.1f} ms process {package * 1000:8.1f} ms import healthchecks_io")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark of the cold start of a process that sends one ping, with Pinger against Client.
+
+Each case starts a fresh interpreter that imports the package and sends a success ping to a local server, which
+is what a cron job wrapper does. Reports the median wall time of the whole process.
+
+Run with ``python benchmarks/bench_ping_cold_start.py``.
+"""
+
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+RUNS = 20
+
+
+class OKHandler(BaseHTTPRequestHandler):
+    """Answers every ping with a 200 OK."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        """Answers a ping."""
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        self.send_response(200)
+        self.send_header("content-length", "2")
+        self.end_headers()
+        self.wfile.write(b"OK")
+
+    def log_message(self, format: str, *args: object) -> None:
+        """Keeps the benchmark output quiet."""
+
+
+def main() -> None:
+    """Runs the benchmarks."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OKHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    cases = {
+        "python only": "pass",
+        "Pinger": f"from healthchecks_io.ping import Pinger; Pinger(ping_url={url!r}).success_ping(uuid='test')",
+        "Client": f"from healthchecks_io import Client; Client(ping_url={url!r}).success_ping(uuid='test')",
+    }
+    for name, code in cases.items():
+        samples = []
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], check=True)
+            samples.append(time.perf_counter() - start)
+        print(f"{name:<15} {statistics.median(samples) * 1000:8.1f} ms per process")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Micro-benchmark of ping and api url construction.
+
+Compares the old urljoin based url building with the precomputed prefixes and url cache the clients use now.
+
+Run with ``python benchmarks/bench_ping_urls.py``.
+"""
+
+import timeit
+from urllib.parse import parse_qsl
+from urllib.parse import unquote
+from urllib.parse import urlencode
+from urllib.parse import urljoin
+from urllib.parse import urlparse
+
+from healthchecks_io.client._abstract import AbstractClient
+
+PING_URL = "https://hc-ping.com/"
+PING_KEY = "fakepingkey"
+UUID = "8f57a84b-86c2-4246-8923-02f83d17604a"
+NUMBER = 200_000
+
+
+def urljoin_ping_url(uuid: str, slug: str, endpoint: str) -> str:
+    """The ping url building the clients used before the url cache."""
+    if uuid != "":
+        return urljoin(PING_URL, f"{uuid}{endpoint}")
+    return urljoin(PING_URL, f"{PING_KEY}/{slug}{endpoint}")
+
+
+def urljoin_tags_url(api_url: str, tags: list) -> str:
+    """The get_checks tag url building the clients used before, one full url rebuild per tag."""
+    url = urljoin(api_url, "checks/")
+    for tag in tags:
+        parsed_url = urlparse(unquote(url))
+        url = parsed_url._replace(query=urlencode(parse_qsl(parsed_url.query) + [("tag", tag)])).geturl()
+    return url
+
+
+def report(name: str, seconds: float) -> None:
+    """Prints the per call cost of a benchmark."""
+    print(f"{name:<40} {seconds / NUMBER * 1e9:8.0f} ns/call")
+
+
+def main() -> None:
+    """Runs the benchmarks."""
+    AbstractClient.__abstractmethods__ = frozenset()
+    client = AbstractClient(ping_url=PING_URL, ping_key=PING_KEY)  # type: ignore
+    tags = ["prod", "db", "backups"]
+
+    assert urljoin_ping_url(UUID, "", "/start") == client._get_ping_url(UUID, "", "/start")
+    assert urljoin_tags_url(client._api_url, tags) == client._get_api_request_url(
+        "checks/", [("tag", tag) for tag in tags]
+    )
+
+    report("uuid ping url, urljoin", timeit.timeit(lambda: urljoin_ping_url(UUID, "", "/start"), number=NUMBER))
+    report("uuid ping url, cached", timeit.timeit(lambda: client._get_ping_url(UUID, "", "/start"), number=NUMBER))
+    report("slug ping url, urljoin", timeit.timeit(lambda: urljoin_ping_url("", "backups", ""), number=NUMBER))
+    report("slug ping url, cached", timeit.timeit(lambda: client._get_ping_url("", "backups", ""), number=NUMBER))
+    report(
+        "get_checks 3 tags url, per tag rebuild",
+        timeit.timeit(lambda: urljoin_tags_url(client._api_url, tags), number=NUMBER),
+    )
+    report(
+        "get_checks 3 tags url, one pass",
+        timeit.timeit(
+            lambda: client._get_api_request_url("checks/", [("tag", tag) for tag in tags]),
+            number=NUMBER,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
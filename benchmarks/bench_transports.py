@@ -0,0 +1,140 @@
+"""Benchmark of success pings over each transport, httpx's own against HTTPClientTransport and AsyncStreamTransport.
+
+Every case sends pings to the same local keep-alive server: the sync client one at a time, the async client one at
+a time and in batches of concurrent pings. Reports pings per second, and the memory a single ping allocates at
+its peak, measured with tracemalloc, as a proxy for its allocations. The async peaks are dominated by the
+256 KiB buffer asyncio reads sockets into, whichever transport is used. The server is a Python one in another
+process, so absolute numbers are low, compare the rows.
+
+Run with ``python benchmarks/bench_transports.py``.
+"""
+
+import asyncio
+import multiprocessing
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+
+from healthchecks_io import AsyncClient
+from healthchecks_io import AsyncStreamTransport
+from healthchecks_io import Client
+from healthchecks_io import HTTPClientTransport
+
+PINGS = 2000
+ALLOCATION_PINGS = 50
+CONCURRENCY = 16
+
+
+class OKHandler(BaseHTTPRequestHandler):
+    """Answers every ping with a 200 OK."""
+
+    protocol_version = "HTTP/1.1"
+    # the status line, headers and body are separate writes, Nagle's algorithm would hold the last ones back
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        """Answers a ping."""
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        self.send_response(200)
+        self.send_header("content-length", "2")
+        self.end_headers()
+        self.wfile.write(b"OK")
+
+    def log_message(self, format: str, *args: object) -> None:
+        """Keeps the benchmark output quiet."""
+
+
+def serve(port: "multiprocessing.Queue[int]") -> None:
+    """Runs the server, in its own process so it doesn't share the GIL or tracemalloc with the clients."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OKHandler)
+    server.daemon_threads = True
+    port.put(server.server_address[1])
+    server.serve_forever()
+
+
+def peak_kib_per_ping(ping: Callable[[], object]) -> float:
+    """The average of the peak memory each ping allocates, in KiB."""
+    tracemalloc.start()
+    total = 0
+    for _ in range(ALLOCATION_PINGS):
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        ping()
+        total += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return total / ALLOCATION_PINGS / 1024
+
+
+async def apeak_kib_per_ping(ping: Callable[[], Awaitable[object]]) -> float:
+    """The average of the peak memory each ping allocates, in KiB."""
+    tracemalloc.start()
+    total = 0
+    for _ in range(ALLOCATION_PINGS):
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        await ping()
+        total += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return total / ALLOCATION_PINGS / 1024
+
+
+def report(name: str, elapsed: float, peak: float) -> None:
+    """Prints a case's results."""
+    print(f"{name:<40} {PINGS / elapsed:10.0f} pings/s {peak:8.1f} KiB peak per ping")
+
+
+def bench_sync(name: str, client: Client) -> None:
+    """Sends PINGS success pings one at a time."""
+    client.success_ping(uuid="warmup")
+    start = time.perf_counter()
+    for _ in range(PINGS):
+        client.success_ping(uuid="test")
+    elapsed = time.perf_counter() - start
+    report(name, elapsed, peak_kib_per_ping(lambda: client.success_ping(uuid="test")))
+    client._finalizer_method()
+
+
+async def bench_async(name: str, client: AsyncClient) -> None:
+    """Sends PINGS success pings one at a time, then in concurrent batches."""
+    await client.success_ping(uuid="warmup")
+
+    async def sequential() -> None:
+        for _ in range(PINGS):
+            await client.success_ping(uuid="test")
+
+    async def concurrent() -> None:
+        for _ in range(PINGS // CONCURRENCY):
+            await asyncio.gather(*(client.success_ping(uuid="test") for _ in range(CONCURRENCY)))
+
+    cases: Dict[str, Callable[[], Awaitable[None]]] = {"": sequential, f", {CONCURRENCY} at once": concurrent}
+    for suffix, run in cases.items():
+        start = time.perf_counter()
+        await run()
+        elapsed = time.perf_counter() - start
+        report(f"{name}{suffix}", elapsed, await apeak_kib_per_ping(lambda: client.success_ping(uuid="test")))
+    await client._afinalizer_method()
+
+
+def main() -> None:
+    """Runs the benchmarks."""
+    port: "multiprocessing.Queue[int]" = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(port,), daemon=True)
+    server.start()
+    url = f"http://127.0.0.1:{port.get()}/"
+    bench_sync("Client, httpx", Client(ping_url=url))
+    bench_sync("Client, HTTPClientTransport", Client(ping_url=url, ping_transport=HTTPClientTransport()))
+    asyncio.run(bench_async("AsyncClient, httpx", AsyncClient(ping_url=url)))
+    asyncio.run(
+        bench_async(
+            "AsyncClient, AsyncStreamTransport", AsyncClient(ping_url=url, ping_transport=AsyncStreamTransport())
+        )
+    )
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
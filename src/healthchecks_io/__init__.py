@@ -3,26 +3,104 @@
 # set by poetry-dynamic-versioning
 __version__ = "0.4.4"  # noqa: E402
 
-from .client import AsyncClient  # noqa: F401, E402
-from .client import Client  # noqa: F401, E402
-from .client import CheckTrap  # noqa: F401, E402
+from typing import TYPE_CHECKING  # noqa: E402
+
+from ._lazy import lazy_exports  # noqa: E402
 from .client.exceptions import BadAPIRequestError  # noqa: F401, E402
 from .client.exceptions import CheckNotFoundError  # noqa: F401, E402
+from .client.exceptions import CircuitOpenError  # noqa: F401, E402
+from .client.exceptions import DeadlineExceededError  # noqa: F401, E402
 from .client.exceptions import HCAPIAuthError  # noqa: F401, E402
 from .client.exceptions import HCAPIError  # noqa: F401, E402
 from .client.exceptions import HCAPIRateLimitError  # noqa: F401, E402
 from .client.exceptions import NonUniqueSlugError  # noqa: F401, E402
 from .client.exceptions import WrongClientError  # noqa: F401, E402
 from .client.exceptions import PingFailedError  # noqa: F401, E402
-from .schemas import Check, CheckCreate, CheckPings, CheckStatuses  # noqa: F401, E402
-from .schemas import Integration, Badges, CheckUpdate  # noqa: F401, E402
+from .client.exceptions import PingQueueClosedError  # noqa: F401, E402
+from .client.exceptions import PingQueueFullError  # noqa: F401, E402
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .client import AsyncClient  # noqa: F401
+    from .client import Client  # noqa: F401
+    from .client import CheckTrap  # noqa: F401
+    from .client import AsyncPingDispatcher  # noqa: F401
+    from .client import PingDispatcher  # noqa: F401
+    from .client import RetryPolicy  # noqa: F401
+    from .client import TokenBucket  # noqa: F401
+    from .client import PingSpool  # noqa: F401
+    from .client import CircuitBreaker  # noqa: F401
+    from .client import RequestEvent  # noqa: F401
+    from .client import PingThrottle  # noqa: F401
+    from .client import SlugResolver  # noqa: F401
+    from .client import HTTPClientTransport  # noqa: F401
+    from .client import AsyncStreamTransport  # noqa: F401
+    from .client import LogBuffer  # noqa: F401
+    from .client import LogBufferHandler  # noqa: F401
+    from .metrics import ClientMetrics  # noqa: F401
+    from .ping import Pinger  # noqa: F401
+    from .schemas import Check  # noqa: F401
+    from .schemas import CheckCreate  # noqa: F401
+    from .schemas import CheckPings  # noqa: F401
+    from .schemas import CheckStatuses  # noqa: F401
+    from .schemas import Integration  # noqa: F401
+    from .schemas import Badges  # noqa: F401
+    from .schemas import CheckUpdate  # noqa: F401
+
+# clients and schemas are imported on first use, so a process that only pings doesn't import pydantic, croniter
+# and pytz, and one that doesn't use the async client doesn't import it
+_EXPORTS = {
+    "AsyncClient": ".client",
+    "Client": ".client",
+    "CheckTrap": ".client",
+    "AsyncPingDispatcher": ".client",
+    "PingDispatcher": ".client",
+    "RetryPolicy": ".client",
+    "TokenBucket": ".client",
+    "PingSpool": ".client",
+    "CircuitBreaker": ".client",
+    "RequestEvent": ".client",
+    "PingThrottle": ".client",
+    "SlugResolver": ".client",
+    "HTTPClientTransport": ".client",
+    "AsyncStreamTransport": ".client",
+    "LogBuffer": ".client",
+    "LogBufferHandler": ".client",
+    "ClientMetrics": ".metrics",
+    "Pinger": ".ping",
+    "Check": ".schemas",
+    "CheckCreate": ".schemas",
+    "CheckPings": ".schemas",
+    "CheckStatuses": ".schemas",
+    "Integration": ".schemas",
+    "Badges": ".schemas",
+    "CheckUpdate": ".schemas",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     "AsyncClient",
     "Client",
     "CheckTrap",
+    "AsyncPingDispatcher",
+    "PingDispatcher",
+    "RetryPolicy",
+    "TokenBucket",
+    "PingSpool",
+    "CircuitBreaker",
+    "RequestEvent",
+    "PingThrottle",
+    "SlugResolver",
+    "HTTPClientTransport",
+    "AsyncStreamTransport",
+    "LogBuffer",
+    "LogBufferHandler",
+    "ClientMetrics",
+    "Pinger",
     "BadAPIRequestError",
     "CheckNotFoundError",
+    "CircuitOpenError",
+    "DeadlineExceededError",
     "HCAPIAuthError",
     "HCAPIError",
     "CheckNotFoundError",
@@ -30,6 +108,8 @@ __all__ = [
     "NonUniqueSlugError",
     "WrongClientError",
     "PingFailedError",
+    "PingQueueClosedError",
+    "PingQueueFullError",
     "Check",
     "CheckCreate",
     "CheckUpdate",
@@ -0,0 +1,43 @@
+"""Lazy exports for the package's __init__ modules, see PEP 562."""
+
+import sys
+from importlib.util import resolve_name
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Builds a module's __getattr__ and __dir__, importing each exported name from its module on first use.
+
+    A short lived process that only pings doesn't have to import the schemas, and with them pydantic, croniter
+    and pytz. Names that aren't exported raise AttributeError, which lets ``from package import submodule``
+    import the submodule as usual.
+
+    Args:
+        package (str): the module's __name__
+        exports (Dict[str, str]): exported names and the module, relative to package, that defines each one
+
+    Returns:
+        Tuple[Callable[[str], Any], Callable[[], List[str]]]: the module's __getattr__ and __dir__
+    """
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module = resolve_name(module, package)
+        # __import__ goes through the interpreter's import, which -X importtime times. importlib.import_module
+        # loads the module through importlib's own bootstrap, so only the modules it imports get a line
+        __import__(module)
+        value = getattr(sys.modules[module], name)
+        # keep it in the module, later lookups don't come back here
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
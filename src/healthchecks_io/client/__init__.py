@@ -1,7 +1,64 @@
 """healthchecks_io clients."""
 
-from .async_client import AsyncClient  # noqa: F401
-from .check_trap import CheckTrap  # noqa: F401
-from .sync_client import Client  # noqa: F401
+from typing import TYPE_CHECKING
 
-__all__ = ["AsyncClient", "Client", "CheckTrap"]
+from healthchecks_io._lazy import lazy_exports
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .async_client import AsyncClient  # noqa: F401
+    from .check_trap import CheckTrap  # noqa: F401
+    from .circuit_breaker import CircuitBreaker  # noqa: F401
+    from .dispatcher import AsyncPingDispatcher  # noqa: F401
+    from .dispatcher import PingDispatcher  # noqa: F401
+    from .events import RequestEvent  # noqa: F401
+    from .log_buffer import LogBuffer  # noqa: F401
+    from .log_handler import LogBufferHandler  # noqa: F401
+    from .rate_limit import TokenBucket  # noqa: F401
+    from .resolver import SlugResolver  # noqa: F401
+    from .retry import RetryPolicy  # noqa: F401
+    from .spool import PingSpool  # noqa: F401
+    from .sync_client import Client  # noqa: F401
+    from .throttle import PingThrottle  # noqa: F401
+    from .transports import AsyncStreamTransport  # noqa: F401
+    from .transports import HTTPClientTransport  # noqa: F401
+
+# imported on first use, so importing one client doesn't import the other's dependencies
+_EXPORTS = {
+    "AsyncClient": ".async_client",
+    "Client": ".sync_client",
+    "CheckTrap": ".check_trap",
+    "AsyncPingDispatcher": ".dispatcher",
+    "PingDispatcher": ".dispatcher",
+    "RetryPolicy": ".retry",
+    "TokenBucket": ".rate_limit",
+    "PingSpool": ".spool",
+    "CircuitBreaker": ".circuit_breaker",
+    "RequestEvent": ".events",
+    "PingThrottle": ".throttle",
+    "SlugResolver": ".resolver",
+    "HTTPClientTransport": ".transports",
+    "AsyncStreamTransport": ".transports",
+    "LogBuffer": ".log_buffer",
+    "LogBufferHandler": ".log_handler",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = [
+    "AsyncClient",
+    "Client",
+    "CheckTrap",
+    "AsyncPingDispatcher",
+    "PingDispatcher",
+    "RetryPolicy",
+    "TokenBucket",
+    "PingSpool",
+    "CircuitBreaker",
+    "RequestEvent",
+    "PingThrottle",
+    "SlugResolver",
+    "HTTPClientTransport",
+    "AsyncStreamTransport",
+    "LogBuffer",
+    "LogBufferHandler",
+]
@@ -1,25 +1,58 @@
+import os
 from abc import ABC
 from abc import abstractmethod
-from typing import Any
-from typing import Dict
+from typing import ContextManager
+from typing import List
 from typing import Optional
-from typing import Union
-from urllib.parse import parse_qsl
-from urllib.parse import ParseResult
-from urllib.parse import unquote
-from urllib.parse import urlencode
+from typing import Sequence
+from typing import Set
+from typing import Tuple
 from urllib.parse import urljoin
-from urllib.parse import urlparse
 from weakref import finalize
 
+from httpx import Limits
 from httpx import Response
-
+from httpx import Timeout
+from httpx import TransportError
+
+from ._deadline import Deadline
+from ._status import check_ping_status
+from ._urls import api_url_with_params
+from ._urls import check_ping_target
+from ._urls import ping_url_with_rid
+from ._urls import PingUrlCache
+from ._urls import UrlParams
+from .circuit_breaker import CircuitBreaker
+from .events import EventRecorder
+from .events import Listener
+from .events import NO_RECORDER
+from .events import RequestEvent
 from .exceptions import BadAPIRequestError
 from .exceptions import CheckNotFoundError
+from .exceptions import CircuitOpenError
+from .exceptions import DeadlineExceededError
 from .exceptions import HCAPIAuthError
 from .exceptions import HCAPIError
 from .exceptions import HCAPIRateLimitError
-from .exceptions import NonUniqueSlugError
+from .rate_limit import TokenBucket
+from .resolver import SlugResolver
+from .retry import RetryPolicy
+from .spool import PingSpool
+from .spool import SPOOLED
+from .throttle import PingThrottle
+
+# match httpx's own defaults, so the api and ping clients start out configured like a plain httpx client
+DEFAULT_LIMITS = Limits(max_connections=100, max_keepalive_connections=20)
+DEFAULT_TIMEOUT = Timeout(5.0)
+
+# the http2 option needs h2, installed with the http2 extra
+H2_MISSING = "http2=True needs the h2 package, install it with pip install healthchecks-io[http2]"
+
+# response text of a ping that was not sent because the ping host's circuit breaker is open
+CIRCUIT_OPEN = "circuit open"
+
+# kinds of ping ping_many can send, and their endpoints. exit_code pings add the exit code instead
+PING_KINDS = {"success": "", "start": "/start", "fail": "/fail", "exit_code": ""}
 
 
 class AbstractClient(ABC):
@@ -32,6 +65,15 @@ class AbstractClient(ABC):
         api_url: str = "https://healthchecks.io/api/",
         ping_url: str = "https://hc-ping.com/",
         api_version: int = 1,
+        retry_policy: Optional[RetryPolicy] = None,
+        api_rate_limit: Optional[TokenBucket] = None,
+        ping_rate_limit: Optional[TokenBucket] = None,
+        spool: Optional[PingSpool] = None,
+        api_circuit_breaker: Optional[CircuitBreaker] = None,
+        ping_circuit_breaker: Optional[CircuitBreaker] = None,
+        default_timeout: Optional[float] = None,
+        ping_throttle: Optional[PingThrottle] = None,
+        slug_resolver: Optional[SlugResolver] = None,
     ) -> None:
         """An AbstractClient that other clients can implement.
 
@@ -41,6 +83,19 @@ class AbstractClient(ABC):
             api_url (str): API URL. Defaults to "https://healthchecks.io/api/".
             ping_url (str): Ping API url. Defaults to "https://hc-ping.com/".
             api_version (int): Versiopn of the api to use. Defaults to 1.
+            retry_policy (Optional[RetryPolicy]): retry policy for pings and api requests. Defaults to None,
+                no retries.
+            api_rate_limit (Optional[TokenBucket]): rate limiter for management api requests. Defaults to None.
+            ping_rate_limit (Optional[TokenBucket]): rate limiter for pings. Defaults to None.
+            spool (Optional[PingSpool]): spool pings to this file when they fail with a transport error or a
+                5xx. Defaults to None.
+            api_circuit_breaker (Optional[CircuitBreaker]): circuit breaker for the management api host.
+                Defaults to None.
+            ping_circuit_breaker (Optional[CircuitBreaker]): circuit breaker for the ping host. Defaults to None.
+            default_timeout (Optional[float]): seconds a call may take, retries included, when it isn't passed
+                a timeout. Defaults to None, no limit beyond the httpx timeouts of each attempt.
+            ping_throttle (Optional[PingThrottle]): throttle for success pings. Defaults to None.
+            slug_resolver (Optional[SlugResolver]): resolves slug pings to uuid pings. Defaults to None.
         """
         self._api_key = api_key
         self._ping_key = ping_key
@@ -50,27 +105,74 @@ class AbstractClient(ABC):
             ping_url = f"{ping_url}/"
         self._api_url = urljoin(api_url, f"v{api_version}/")
         self._ping_url = ping_url
+        self._ping_urls = PingUrlCache(ping_url, ping_key)
+        self._retry_policy = retry_policy
+        self._api_rate_limit = api_rate_limit
+        self._ping_rate_limit = ping_rate_limit
+        self._spool = spool
+        self._api_circuit_breaker = api_circuit_breaker
+        self._ping_circuit_breaker = ping_circuit_breaker
+        self._default_timeout = default_timeout
+        self._ping_throttle = ping_throttle
+        self._slug_resolver = slug_resolver
+        self._listeners: List[Listener] = list()
+        # number of retries spent by this client's requests
+        self.retries = 0
+        # process the httpx clients were created in, see _check_fork
+        self._pid = os.getpid()
         self._finalizer = finalize(self, self._finalizer_method)
 
+    def _check_fork(self) -> None:
+        """Rebuilds the client's connections when it is used in a process forked after they were created.
+
+        A forked child shares its parent's sockets, so both would read and write the same keep-alive connections.
+        """
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid = pid
+            self._after_fork()
+
+    def _prewarm_targets(self, ping: bool, api: Optional[bool]) -> List[Tuple[bool, str]]:
+        """Lists the hosts prewarm connects to.
+
+        Args:
+            ping (bool): connect to the ping host
+            api (Optional[bool]): connect to the api host, None to connect only if the client has an api key
+
+        Returns:
+            List[Tuple[bool, str]]: True for a ping host or False for an api host, and the url to send a HEAD to
+        """
+        targets = list()
+        if ping:
+            targets.append((True, self._ping_url))
+        if api or api is None and self._api_key != "":
+            targets.append((False, self._api_url))
+        return targets
+
+    def _after_fork(self) -> None:
+        """Drops state that belongs to the parent process. Clients extend it to replace their httpx clients."""
+        if self._slug_resolver is not None:
+            self._slug_resolver._after_fork()
+
     @abstractmethod
     def _finalizer_method(self) -> None:  # pragma: no cover
         """Finalizer method is called by weakref.finalize when the object is dereferenced to do cleanup of clients."""
         pass
 
-    def _get_api_request_url(self, path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    def _get_api_request_url(self, path: str, params: Optional[UrlParams] = None) -> str:
         """Get a full request url for the healthchecks api.
 
         Args:
             path (str): Path to request from
-            params (Optional[Dict[str, str]], optional): URL Parameters. Defaults to None.
+            params (Optional[UrlParams], optional): URL Parameters, as a dict or a sequence of (name, value)
+                pairs for parameters that repeat. Defaults to None.
 
         Returns:
             str: url
         """
-        url = urljoin(self._api_url, path)
-        return self._add_url_params(url, params) if params is not None else url
+        return api_url_with_params(f"{self._api_url}{path}", params)
 
-    def _get_ping_url(self, uuid: str, slug: str, endpoint: str) -> str:
+    def _get_ping_url(self, uuid: str, slug: str, endpoint: str, rid: str = "") -> str:
         """Get a url for sending a ping.
 
         Can take either a UUID or a Slug, but not both.
@@ -79,6 +181,7 @@ class AbstractClient(ABC):
             uuid (str): uuid of a check
             slug (str): slug of a check
             endpoint (str): Endpoint to request
+            rid (str): run id, added as the rid query parameter. Defaults to "", none.
 
         Raises:
             BadAPIRequestError: Raised if you pass a uuid and a slug, or if pinging by a slug and do not have a
@@ -87,15 +190,11 @@ class AbstractClient(ABC):
         Returns:
             str: url for this
         """
-        if uuid == "" and slug == "" or uuid != "" and slug != "":
-            raise BadAPIRequestError("Must pass a uuid or a slug")
-
-        if slug != "" and self._ping_key == "":
-            raise BadAPIRequestError("If pinging by slug, must have a ping key set")
+        check_ping_target(uuid, slug, self._ping_key)
 
         if uuid != "":
-            return self._get_ping_url_uuid(uuid, endpoint)
-        return self._get_ping_url_slug(slug, endpoint)
+            return ping_url_with_rid(self._get_ping_url_uuid(uuid, endpoint), rid)
+        return ping_url_with_rid(self._get_ping_url_slug(slug, endpoint), rid)
 
     def _get_ping_url_uuid(self, uuid: str, endpoint: str) -> str:
         """Get a ping url for a check with a uuid.
@@ -107,7 +206,7 @@ class AbstractClient(ABC):
         Returns:
             str: ping url
         """
-        return urljoin(self._ping_url, f"{uuid}{endpoint}")
+        return self._ping_urls.uuid_url(uuid, endpoint)
 
     def _get_ping_url_slug(self, slug: str, endpoint: str) -> str:
         """Get a ping url for a check with a slug.
@@ -119,7 +218,169 @@ class AbstractClient(ABC):
         Returns:
             str: ping url
         """
-        return urljoin(self._ping_url, f"{self._ping_key}/{slug}{endpoint}")
+        return self._ping_urls.slug_url(slug, endpoint)
+
+    def _spool_ping(self, uuid: str, slug: str, endpoint: str, data: str, rid: str = "") -> bool:
+        """Writes a ping to the spool, if there is one.
+
+        Args:
+            uuid (str): Check's UUID
+            slug (str): Check's Slug
+            endpoint (str): ping endpoint, like "/start"
+            data (str): Text data sent with the ping
+            rid (str): run id of the ping. Defaults to "".
+
+        Returns:
+            bool: True if the ping was spooled
+        """
+        return self._spool is not None and self._spool.append(uuid, slug, endpoint, data, rid)
+
+    def _new_deadline(self, timeout: Optional[float]) -> Optional[Deadline]:
+        """Starts the time budget of a call.
+
+        Args:
+            timeout (Optional[float]): seconds the call may take, or None for the client's default_timeout
+
+        Returns:
+            Optional[Deadline]: the call's deadline, or None if it has no time budget
+        """
+        if timeout is None:
+            timeout = self._default_timeout
+        return None if timeout is None else Deadline(timeout)
+
+    def add_listener(self, listener: Listener) -> None:
+        """Registers a listener that is called with a RequestEvent when each ping or api call finishes.
+
+        Listeners are called inline, from the thread or task that made the call, so they should be quick and
+        must not raise. Calls made while no listener is registered don't build an event at all.
+
+        Args:
+            listener (Listener): callable taking a RequestEvent
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Listener) -> None:
+        """Unregisters a listener added with add_listener.
+
+        Args:
+            listener (Listener): the listener to remove
+
+        Raises:
+            ValueError: Raised if the listener isn't registered
+        """
+        self._listeners.remove(listener)
+
+    def _record(self, operation: str, ping: bool, method: str, url: str) -> ContextManager[Optional[RequestEvent]]:
+        """Records a call for the listeners.
+
+        Args:
+            operation (str): name of the client method called
+            ping (bool): True for a ping, False for a management api request
+            method (str): http method
+            url (str): request url
+
+        Returns:
+            ContextManager[Optional[RequestEvent]]: context manager wrapping the call, giving the event to fill in,
+                or None when nothing is listening
+        """
+        if not self._listeners:
+            return NO_RECORDER
+        return EventRecorder(RequestEvent(operation, ping, method, url), self._listeners)
+
+    @staticmethod
+    def _ping_many_endpoint(kind: str, exit_code: Optional[int]) -> str:
+        """Get the ping endpoint for a ping_many kind.
+
+        Args:
+            kind (str): one of "success", "start", "fail" or "exit_code"
+            exit_code (Optional[int]): exit code to send with an exit_code ping
+
+        Raises:
+            ValueError: Raised if the kind is unknown, or an exit_code ping has no exit code
+
+        Returns:
+            str: ping endpoint
+        """
+        if kind not in PING_KINDS:
+            raise ValueError(f"kind must be one of {', '.join(PING_KINDS)}")
+        if kind != "exit_code":
+            return PING_KINDS[kind]
+        if exit_code is None:
+            raise ValueError("exit_code pings need an exit_code")
+        return f"/{exit_code}"
+
+    @staticmethod
+    def _ping_many_targets(uuids: Sequence[str], slugs: Sequence[str]) -> List[Tuple[str, str]]:
+        """Get the (uuid, slug) pairs ping_many pings.
+
+        Results are keyed by uuid or slug, so each of them may only be given once.
+
+        Args:
+            uuids (Sequence[str]): UUIDs of the checks to ping
+            slugs (Sequence[str]): Slugs of the checks to ping
+
+        Raises:
+            ValueError: Raised if a uuid or slug is given more than once, or is both a uuid and a slug
+
+        Returns:
+            List[Tuple[str, str]]: (uuid, slug) of each check to ping
+        """
+        targets = [(uuid, "") for uuid in uuids] + [("", slug) for slug in slugs]
+        seen: Set[str] = set()
+        for uuid, slug in targets:
+            key = uuid or slug
+            if key in seen:
+                raise ValueError(f"{key} is given more than once")
+            seen.add(key)
+        return targets
+
+    @staticmethod
+    def _spooled(event: Optional[RequestEvent]) -> Tuple[bool, str]:
+        """Result of a ping that went to the spool.
+
+        Args:
+            event (Optional[RequestEvent]): the ping's event, marked as spooled
+
+        Returns:
+            Tuple[bool, str]: (True, "spooled")
+        """
+        if event is not None:
+            event.spooled = True
+        return (True, SPOOLED)
+
+    def _check_circuit(self, ping: bool, url: str) -> Optional[CircuitBreaker]:
+        """Checks the host's circuit breaker lets a request through.
+
+        Args:
+            ping (bool): True for a ping, False for a management api request
+            url (str): request url
+
+        Raises:
+            CircuitOpenError: Raised when the host's circuit breaker is open
+
+        Returns:
+            Optional[CircuitBreaker]: the host's circuit breaker, to record the request's outcome on
+        """
+        breaker = self._ping_circuit_breaker if ping else self._api_circuit_breaker
+        if breaker is not None and not breaker.allow_request():
+            raise CircuitOpenError(f"Circuit breaker is open, not requesting {url}")
+        return breaker
+
+    @staticmethod
+    def _is_transient_error(exc: Exception) -> bool:
+        """Is this an error that could go away if the request is sent again later?
+
+        Args:
+            exc (Exception): error raised while sending a request or checking its response
+
+        Returns:
+            bool: True for transport errors, 5xx responses, rate limits, open circuit breakers and deadline overruns
+        """
+        # check_response and check_ping_response raise a plain HCAPIError for 5xx responses
+        return (
+            isinstance(exc, (TransportError, HCAPIRateLimitError, CircuitOpenError, DeadlineExceededError))
+            or type(exc) is HCAPIError
+        )
 
     @property
     def is_closed(self) -> bool:
@@ -128,7 +389,10 @@ class AbstractClient(ABC):
         Returns:
             bool: is the client closed
         """
-        return self._client.is_closed  # type: ignore
+        if self._closed:  # type: ignore
+            return True
+        created = [client for client in (self._api_httpx, self._ping_httpx) if client is not None]  # type: ignore
+        return bool(created) and all(client.is_closed for client in created)
 
     @staticmethod
     def check_response(response: Response) -> Response:
@@ -185,85 +449,5 @@ class AbstractClient(ABC):
         Returns:
             Response: the passed in response object
         """
-        if response.status_code == 401 or response.status_code == 403:
-            raise HCAPIAuthError("Auth failure when pinging")
-
-        if str(response.status_code).startswith("5"):
-            raise HCAPIError(
-                f"Error when reaching out to HC API at {response.request.url}. "
-                f"Status Code {response.status_code}. Response {response.text}"
-            )
-
-        # ping api docs say it can return a 200 with not found for a not found check.
-        # in my testing, its always a 404, but this will cover what the docs say
-        # https://healthchecks.io/docs/http_api/
-        if response.status_code == 404 or "not found" in response.text:
-            raise CheckNotFoundError(f"CHeck not found at {response.request.url}")
-
-        if "rate limited" in response.text or response.status_code == 429:
-            raise HCAPIRateLimitError(f"Rate limited on {response.request.url}")
-
-        if response.status_code == 400:
-            raise BadAPIRequestError(f"Bad request when requesting {response.request.url}. {response.text}")
-
-        if response.status_code == 409:
-            raise NonUniqueSlugError(f"Bad request, slug conflict {response.request.url}. {response.text}")
-
+        check_ping_status(response.status_code, response.text, str(response.request.url))
         return response
-
-    @staticmethod
-    def _add_url_params(url: str, params: Dict[str, Union[str, int, bool]], replace: bool = True) -> str:
-        """Add GET params to provided URL being aware of existing.
-
-        :param url: string of target URL
-        :param params: dict containing requested params to be added
-        :param replace: bool True If true, replace params if they exist with new values, otherwise append
-        :return: string with updated URL
-
-        >> url = 'http://stackoverflow.com/test?answers=true'
-        >> new_params = {'answers': False, 'data': ['some','values']}
-        >> add_url_params(url, new_params)
-        'http://stackoverflow.com/test?data=some&data=values&answers=false'
-        """
-        # Unquoting URL first so we don't loose existing args
-        url = unquote(url)
-        # Extracting url info
-        parsed_url = urlparse(url)
-        # Extracting URL arguments from parsed URL
-        get_args = parsed_url.query
-        # Converting URL arguments to dict
-        parsed_get_args = dict(parse_qsl(get_args))
-
-        # we want all string values
-        parsed_params = {k: str(val) for k, val in params.items()}
-
-        if replace:
-            # Merging URL arguments dict with new params
-            parsed_get_args.update(parsed_params)
-            extra_parameters = ""
-        else:
-            # get all the duplicated keys from params and urlencode them, we'll concat this to the params string later
-            duplicated_params = [x for x in params if x in parsed_get_args]
-            # get all the args that aren't duplicated and add them to parsed_get_args
-            parsed_get_args.update({key: parsed_params[key] for key in [x for x in params if x not in parsed_get_args]})
-            # if we have any duplicated parameters, urlencode them, we append them later
-            extra_parameters = (
-                f"&{urlencode({key: params[key] for key in duplicated_params}, doseq=True)}"
-                if len(duplicated_params) > 0
-                else ""
-            )
-
-        # Converting URL argument to proper query string
-        encoded_get_args = f"{urlencode(parsed_get_args, doseq=True)}{extra_parameters}"
-        # Creating new parsed result object based on provided with new
-        # URL arguments. Same thing happens inside of urlparse.
-        new_url = ParseResult(
-            parsed_url.scheme,
-            parsed_url.netloc,
-            parsed_url.path,
-            parsed_url.params,
-            encoded_get_args,
-            parsed_url.fragment,
-        ).geturl()
-
-        return new_url
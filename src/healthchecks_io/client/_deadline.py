@@ -0,0 +1,164 @@
+"""Time budgets that bound a whole call, retries included."""
+
+import time
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import Optional
+from typing import Set
+
+from httpx import ConnectTimeout
+from httpx import PoolTimeout
+from httpx import ReadTimeout
+from httpx import Response
+from httpx import SyncByteStream
+from httpx import Timeout
+from httpx import TimeoutException
+from httpx import WriteTimeout
+
+from .exceptions import DeadlineExceededError
+
+# httpcore treats a timeout of 0 as non blocking, so a phase started with no budget left still gets a moment
+MIN_PHASE_TIMEOUT = 0.001
+
+_TIMEOUT_PHASES = {
+    ConnectTimeout: "connect",
+    ReadTimeout: "read",
+    WriteTimeout: "write",
+    PoolTimeout: "pool",
+}
+
+
+class _DeadlineStream(SyncByteStream):
+    """A response body stream that gives up once the deadline passes between two reads."""
+
+    def __init__(self, stream: SyncByteStream, deadline: "Deadline", url: str) -> None:
+        self._stream = stream
+        self._deadline = deadline
+        self._url = url
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            yield chunk
+            self._deadline.check(self._url)
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+class Deadline:
+    """A time budget shared by every attempt, rate limit wait and retry delay of one call."""
+
+    __slots__ = ("budget", "expires", "_capped")
+
+    def __init__(self, budget: float) -> None:
+        """A time budget shared by every attempt, rate limit wait and retry delay of one call.
+
+        Args:
+            budget (float): seconds the call may take
+        """
+        self.budget = budget
+        self.expires = time.monotonic() + budget
+        # phases whose timeout was cut down to the remaining budget when they last started
+        self._capped: Set[str] = set()
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline.
+
+        Returns:
+            float: seconds left, negative once the deadline has passed
+        """
+        return self.expires - time.monotonic()
+
+    def check(self, url: str) -> float:
+        """Checks there is budget left to start something.
+
+        Args:
+            url (str): request url, for the error message
+
+        Raises:
+            DeadlineExceededError: Raised when the deadline has passed
+
+        Returns:
+            float: seconds left
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise self.exceeded(url)
+        return remaining
+
+    def exceeded(self, url: str) -> DeadlineExceededError:
+        """Builds the error raised when the deadline passes.
+
+        Args:
+            url (str): request url
+
+        Returns:
+            DeadlineExceededError: the error to raise
+        """
+        return DeadlineExceededError(f"Deadline of {self.budget}s exceeded when requesting {url}")
+
+    def caused(self, exc: TimeoutException) -> bool:
+        """Did an httpx timeout fire because the deadline cut the phase short?
+
+        Args:
+            exc (TimeoutException): timeout raised by httpx
+
+        Returns:
+            bool: True if the deadline, not the client's own timeout, limited the phase that timed out
+        """
+        return _TIMEOUT_PHASES.get(type(exc)) in self._capped
+
+    def extensions(self, timeout: Timeout) -> Dict[str, Any]:
+        """Request extensions that hold every phase of a sync httpx request to the remaining budget.
+
+        httpcore reads a phase's timeout from the request's timeout dict when the phase starts, so a trace
+        callback shrinks the dict in place as connect, TLS, write and read start. Each phase keeps the
+        client's own timeout when that is the shorter one.
+
+        Args:
+            timeout (Timeout): the httpx client's timeouts
+
+        Returns:
+            Dict[str, Any]: extensions to pass to the request
+        """
+        configured = timeout.as_dict()
+        timeouts: Dict[str, Optional[float]] = dict(configured)
+
+        def refresh() -> None:
+            remaining = max(self.remaining(), MIN_PHASE_TIMEOUT)
+            self._capped.clear()
+            for phase, value in configured.items():
+                if value is None or value > remaining:
+                    timeouts[phase] = remaining
+                    self._capped.add(phase)
+                else:
+                    timeouts[phase] = value
+
+        def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name.endswith(".started"):
+                refresh()
+
+        refresh()
+        return {"timeout": timeouts, "trace": trace}
+
+    def read(self, response: Response, url: str) -> None:
+        """Reads the body of a streamed sync response, holding it to the remaining budget.
+
+        httpcore hands every read of the body the read timeout the phase started with, so a server trickling
+        the body out a few bytes at a time could hold the call well past its deadline. The deadline is checked
+        again after each read instead.
+
+        Args:
+            response (Response): response sent with stream=True
+            url (str): request url, for the error message
+
+        Raises:
+            DeadlineExceededError: Raised when the deadline passes before the whole body is read
+        """
+        response.stream = _DeadlineStream(response.stream, self, url)  # type: ignore[arg-type]
+        try:
+            response.read()
+        except BaseException:
+            response.close()
+            raise
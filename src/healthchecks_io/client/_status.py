@@ -0,0 +1,49 @@
+"""Status checks of ping responses.
+
+Only depends on the standard library so it can be shared by clients that don't use httpx.
+"""
+
+from .exceptions import BadAPIRequestError
+from .exceptions import CheckNotFoundError
+from .exceptions import HCAPIAuthError
+from .exceptions import HCAPIError
+from .exceptions import HCAPIRateLimitError
+from .exceptions import NonUniqueSlugError
+
+
+def check_ping_status(status_code: int, text: str, url: str) -> None:
+    """Checks the status and text of a healthchecks.io ping response.
+
+    Args:
+        status_code (int): response status code
+        text (str): response text
+        url (str): url the ping was sent to
+
+    Raises:
+        HCAPIAuthError: Raised when status_code == 401 or 403
+        HCAPIError: Raised when status_code is 5xx
+        CheckNotFoundError: Raised when status_code is 404 or response text has "not found" in it
+        BadAPIRequestError: Raised when status_code is 400
+        HCAPIRateLimitError: Raised when status code is 429 or response text has "rate limited" in it
+        NonUniqueSlugError: Raused when status code is 409.
+    """
+    if status_code == 401 or status_code == 403:
+        raise HCAPIAuthError("Auth failure when pinging")
+
+    if str(status_code).startswith("5"):
+        raise HCAPIError(f"Error when reaching out to HC API at {url}. Status Code {status_code}. Response {text}")
+
+    # ping api docs say it can return a 200 with not found for a not found check.
+    # in my testing, its always a 404, but this will cover what the docs say
+    # https://healthchecks.io/docs/http_api/
+    if status_code == 404 or "not found" in text:
+        raise CheckNotFoundError(f"CHeck not found at {url}")
+
+    if "rate limited" in text or status_code == 429:
+        raise HCAPIRateLimitError(f"Rate limited on {url}")
+
+    if status_code == 400:
+        raise BadAPIRequestError(f"Bad request when requesting {url}. {text}")
+
+    if status_code == 409:
+        raise NonUniqueSlugError(f"Bad request, slug conflict {url}. {text}")
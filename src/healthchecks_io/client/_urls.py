@@ -0,0 +1,99 @@
+"""Url building for the ping and management apis.
+
+Only depends on the standard library so it can be shared by clients that don't use httpx.
+"""
+
+from functools import lru_cache
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+from urllib.parse import urlencode
+
+from .exceptions import BadAPIRequestError
+
+DEFAULT_CACHE_SIZE = 1024
+
+UrlParams = Union[Dict[str, Any], Sequence[Tuple[str, Any]]]
+
+
+def check_ping_target(uuid: str, slug: str, ping_key: str) -> None:
+    """Checks a ping is addressed to exactly one check.
+
+    Args:
+        uuid (str): uuid of a check
+        slug (str): slug of a check
+        ping_key (str): ping key, needed to ping by slug
+
+    Raises:
+        BadAPIRequestError: Raised if you pass a uuid and a slug, or if pinging by a slug and do not have a
+        ping key set
+    """
+    if uuid == "" and slug == "" or uuid != "" and slug != "":
+        raise BadAPIRequestError("Must pass a uuid or a slug")
+
+    if slug != "" and ping_key == "":
+        raise BadAPIRequestError("If pinging by slug, must have a ping key set")
+
+
+def api_url_with_params(url: str, params: Optional[UrlParams]) -> str:
+    """Adds a query string to an api url in one pass.
+
+    Args:
+        url (str): url without a query string
+        params (Optional[UrlParams]): dict of parameters, or a sequence of (name, value) pairs for
+            parameters that repeat, like tag
+
+    Returns:
+        str: url
+    """
+    if not params:
+        return url
+    return f"{url}?{urlencode(params)}"
+
+
+def ping_url_with_rid(url: str, rid: str) -> str:
+    """Adds a run id to a ping url.
+
+    The run id is added after the url cache, so the cache doesn't fill up with urls used by a single run.
+
+    Args:
+        url (str): ping url
+        rid (str): run id pairing a run's start ping with its finish ping, "" for none
+
+    Returns:
+        str: url
+    """
+    if not rid:
+        return url
+    return f"{url}?{urlencode({'rid': rid})}"
+
+
+class PingUrlCache:
+    """Builds ping urls from precomputed prefixes and remembers the most recently used ones."""
+
+    def __init__(self, ping_url: str, ping_key: str, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        """Builds ping urls from precomputed prefixes and remembers the most recently used ones.
+
+        Args:
+            ping_url (str): Ping API url, ending in a /
+            ping_key (str): Ping key used for slug urls
+            maxsize (int): how many urls to remember. Defaults to 1024.
+        """
+        uuid_prefix = ping_url
+        slug_prefix = f"{ping_url}{ping_key}/"
+
+        # the cached functions close over the prefixes instead of self so the cache holds no reference cycle
+        @lru_cache(maxsize=maxsize)
+        def uuid_url(uuid: str, endpoint: str) -> str:
+            return f"{uuid_prefix}{uuid}{endpoint}"
+
+        @lru_cache(maxsize=maxsize)
+        def slug_url(slug: str, endpoint: str) -> str:
+            return f"{slug_prefix}{slug}{endpoint}"
+
+        self.uuid_url: Callable[[str, str], str] = uuid_url
+        self.slug_url: Callable[[str, str], str] = slug_url
@@ -1,26 +1,126 @@
 """CheckTrap is a context manager to wrap around python code to communicate results to a Healthchecks check."""
 
+import asyncio
+import logging
+from contextvars import Token
+from functools import wraps
+from inspect import iscoroutinefunction
+from traceback import format_exception
 from types import TracebackType
-from typing import List
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
 from typing import Optional
+from typing import Sequence
+from typing import Tuple
 from typing import Type
 from typing import Union
+from uuid import uuid4
 
 from .async_client import AsyncClient
 from .exceptions import PingFailedError
 from .exceptions import WrongClientError
+from .log_buffer import DEFAULT_MAX_LOG_BYTES
+from .log_buffer import LogBuffer
+from .log_handler import LogBufferHandler
 from .sync_client import Client
 
+ExitCodes = Dict[Type[BaseException], int]
+
+
+class _LogLines(Sequence[str]):
+    """The lines of a CheckTrap's log, as a list that writes through to its LogBuffer."""
+
+    def __init__(self, log: LogBuffer) -> None:
+        """The lines of a CheckTrap's log, as a list that writes through to its LogBuffer.
+
+        Reading it reads the buffer's lines, appending to it or extending it adds lines to the buffer. Changing
+        the lines it has isn't supported, the buffer only adds lines.
+
+        Args:
+            log (LogBuffer): the trap's log
+        """
+        self._log = log
+
+    def __getitem__(self, index: Any) -> Any:
+        return self._log.lines()[index]
+
+    def __len__(self) -> int:
+        return len(self._log.lines())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, _LogLines)):
+            return self._log.lines() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self._log.lines())
+
+    def __iadd__(self, lines: Iterable[str]) -> "_LogLines":
+        self.extend(lines)
+        return self
+
+    def append(self, line: str) -> None:
+        """Adds a line to the log.
+
+        Args:
+            line (str): the line
+        """
+        self._log.append(line)
+
+    def extend(self, lines: Iterable[str]) -> None:
+        """Adds lines to the log.
+
+        Args:
+            lines (Iterable[str]): the lines
+        """
+        for line in lines:
+            self._log.append(line)
+
+    def clear(self) -> None:
+        """Drops every line of the log."""
+        self._log.clear()
+
+
+def _exit_code(exc: BaseException, exit_codes: Optional[ExitCodes]) -> Optional[int]:
+    """The exit code to report for an exception, if it has one.
+
+    Args:
+        exc (BaseException): the exception the function raised
+        exit_codes (Optional[ExitCodes]): exit codes of exception classes, the closest base class wins
+
+    Returns:
+        Optional[int]: the exit code, or None to send a fail ping
+    """
+    if exit_codes:
+        for cls in type(exc).__mro__:
+            if cls in exit_codes:
+                return exit_codes[cls]
+    if isinstance(exc, SystemExit) and (exc.code is None or isinstance(exc.code, int)):
+        return exc.code or 0
+    return None
+
 
 class CheckTrap:
     """CheckTrap is a context manager to wrap around python code to communicate results to a Healthchecks check."""
 
+    # set to True, in tests or development, to skip every CheckTrap's pings
+    disabled: bool = False
+
     def __init__(
         self,
         client: Union[Client, AsyncClient],
         uuid: str = "",
         slug: str = "",
         suppress_exceptions: bool = False,
+        timeout: Optional[float] = None,
+        max_log_bytes: int = DEFAULT_MAX_LOG_BYTES,
+        log_level: Optional[int] = None,
+        logger: Union[str, logging.Logger] = "",
+        log_formatter: Optional[logging.Formatter] = None,
+        background_start: bool = False,
+        rid: Union[bool, str] = False,
     ) -> None:
         """A context manager to wrap around python code to communicate results to a Healthchecks check.
 
@@ -29,17 +129,65 @@ class CheckTrap:
             uuid (str): uuid of the check. Defaults to "".
             slug (str): slug of the check, exclusion wiht uuid. Defaults to "".
             suppress_exceptions (bool): If true, do not raise any exceptions. Defaults to False.
+            timeout (Optional[float]): seconds each ping may take, retries included, so a slow Healthchecks.io
+                can't hold up the wrapped code. Defaults to None, the client's default_timeout.
+            max_log_bytes (int): most bytes of log sent with the ping. Past it, the first and last lines are kept
+                around a marker counting the ones dropped. Defaults to 100,000, what Healthchecks.io keeps.
+            log_level (Optional[int]): while in the with block, adds the records of logger at this level and
+                above to the log. Records the logger's own level drops aren't captured. Defaults to None, no
+                logging records.
+            logger (Union[str, logging.Logger]): the logger, or its name, whose records are captured. Defaults
+                to "", the root logger.
+            log_formatter (Optional[logging.Formatter]): formats the captured records. Defaults to None, the
+                time, level, logger name and message.
+            background_start (bool): with an AsyncClient, send the start ping in a background task so the block
+                starts right away. The finish ping waits for it, so Healthchecks.io still sees them in order, and a
+                failed start ping is added to the log instead of raised. Defaults to False.
+            rid (Union[bool, str]): run id sent with the pings, so overlapping runs of the check each get their
+                own duration. True generates a new one each time the block is entered, a str is used as is.
+                Defaults to False, no run id.
 
         Raises:
             Exception: Raised if a slug and a uuid is passed
+            ValueError: Raised when max_log_bytes is below 160
         """
         if uuid == "" and slug == "":
             raise Exception("Must pass a slug or an uuid")
         self.client: Union[Client, AsyncClient] = client
         self.uuid: str = uuid
         self.slug: str = slug
-        self.log_lines: List[str] = list()
+        self.log = LogBuffer(max_log_bytes)
         self.suppress_exceptions: bool = suppress_exceptions
+        self.timeout: Optional[float] = timeout
+        self.log_level: Optional[int] = log_level
+        self.logger: logging.Logger = logger if isinstance(logger, logging.Logger) else logging.getLogger(logger)
+        self.log_formatter: Optional[logging.Formatter] = log_formatter
+        self._handler: Optional[LogBufferHandler] = None
+        self._handler_token: "Optional[Token[Tuple[LogBufferHandler, ...]]]" = None
+        self.background_start: bool = background_start
+        self._rid = rid
+        # the current run's id, "" without one
+        self.rid: str = ""
+        self._start_task: "Optional[asyncio.Future[Tuple[bool, str]]]" = None
+        self._skipped = False
+
+    @property
+    def log_lines(self) -> _LogLines:
+        """The log lines that are sent with the check, with a marker where lines were dropped.
+
+        Lines appended to it, or assigned to it, go to the trap's log. Changing a line raises a TypeError.
+        """
+        return _LogLines(self.log)
+
+    @log_lines.setter
+    def log_lines(self, lines: Iterable[str]) -> None:
+        if isinstance(lines, _LogLines) and lines._log is self.log:
+            # trap.log_lines += [...] extended the log already
+            return
+        lines = list(lines)
+        self.log.clear()
+        for line in lines:
+            self.log.append(line)
 
     def add_log(self, line: str) -> None:
         """Add a line to the context manager's log that is sent with the check.
@@ -47,7 +195,40 @@ class CheckTrap:
         Args:
             line (str): String to add to the logs
         """
-        self.log_lines.append(line)
+        self.log.append(line)
+
+    def _new_rid(self) -> str:
+        """The run id of a run that's starting.
+
+        Returns:
+            str: the run id, "" for none
+        """
+        if isinstance(self._rid, str):
+            return self._rid
+        return str(uuid4()) if self._rid else ""
+
+    def _install_handler(self, bind: bool) -> None:
+        """Starts capturing logging records, when log_level is set.
+
+        Args:
+            bind (bool): only capture the records of the current context, the task in asyncio code
+        """
+        if self.log_level is None:
+            return
+        self._handler = LogBufferHandler(self.log, self.log_level, self.log_formatter)
+        if bind:
+            self._handler_token = self._handler.bind()
+        self.logger.addHandler(self._handler)
+
+    def _remove_handler(self) -> None:
+        """Stops capturing logging records."""
+        if self._handler is None:
+            return
+        self.logger.removeHandler(self._handler)
+        if self._handler_token is not None:
+            self._handler.unbind(self._handler_token)
+            self._handler_token = None
+        self._handler = None
 
     def __enter__(self) -> "CheckTrap":
         """Enter the context manager.
@@ -64,15 +245,21 @@ class CheckTrap:
                 pinging by a slug and do not have a ping key set
             HCAPIRateLimitError: Raised when status code is 429 or response text has "rate limited" in it
             NonUniqueSlugError: Raused when status code is 409.
+            DeadlineExceededError: Raised when the start ping runs out of its timeout
 
         Returns:
             CheckTrap: self
         """
         if isinstance(self.client, AsyncClient):
             raise WrongClientError("You passed an AsyncClient, use this as an async context manager")
-        result = self.client.start_ping(uuid=self.uuid, slug=self.slug)
+        self._skipped = CheckTrap.disabled
+        if self._skipped:
+            return self
+        self.rid = self._new_rid()
+        result = self.client.start_ping(uuid=self.uuid, slug=self.slug, timeout=self.timeout, rid=self.rid)
         if not result[0]:
             raise PingFailedError(result[1])
+        self._install_handler(bind=False)
         return self
 
     def __exit__(
@@ -94,18 +281,22 @@ class CheckTrap:
         Returns:
             Optional[bool]: self.suppress_exceptions, if true will not raise any exceptions
         """
+        if self._skipped:
+            return self.suppress_exceptions
+        self._remove_handler()
         if exc_type is None:
-            self.client.success_ping(self.uuid, self.slug, data="\n".join(self.log_lines))
+            self.client.success_ping(self.uuid, self.slug, data=self.log.getvalue(), timeout=self.timeout, rid=self.rid)
         else:
             self.add_log(str(exc))
             self.add_log(str(traceback))
-            self.client.fail_ping(self.uuid, self.slug, data="\n".join(self.log_lines))
+            self.client.fail_ping(self.uuid, self.slug, data=self.log.getvalue(), timeout=self.timeout, rid=self.rid)
         return self.suppress_exceptions
 
     async def __aenter__(self) -> "CheckTrap":
         """Enter the context manager.
 
-        Sends a start ping to the check represented by self.uuid or self.slug.
+        Sends a start ping to the check represented by self.uuid or self.slug. With background_start, the ping
+        is sent in a background task and its errors go to the log, only WrongClientError is raised.
 
         Raises:
             WrongClientError: Raised when using an AsyncClient with this as a sync client manager
@@ -117,17 +308,42 @@ class CheckTrap:
                 pinging by a slug and do not have a ping key set
             HCAPIRateLimitError: Raised when status code is 429 or response text has "rate limited" in it
             NonUniqueSlugError: Raused when status code is 409.
+            DeadlineExceededError: Raised when the start ping runs out of its timeout
 
         Returns:
             CheckTrap: self
         """
         if isinstance(self.client, Client):
             raise WrongClientError("You passed a sync Client, use this as a regular context manager")
-        result = await self.client.start_ping(self.uuid, self.slug)
-        if not result[0]:
-            raise PingFailedError(result[1])
+        self._skipped = CheckTrap.disabled
+        if self._skipped:
+            return self
+        self.rid = self._new_rid()
+        if self.background_start:
+            self._start_task = asyncio.ensure_future(
+                self.client.start_ping(self.uuid, self.slug, timeout=self.timeout, rid=self.rid)
+            )
+        else:
+            result = await self.client.start_ping(self.uuid, self.slug, timeout=self.timeout, rid=self.rid)
+            if not result[0]:
+                raise PingFailedError(result[1])
+        self._install_handler(bind=True)
         return self
 
+    async def _wait_for_start(self) -> None:
+        """Waits for a background start ping to finish, adding its failure to the log."""
+        if self._start_task is None:
+            return
+        task, self._start_task = self._start_task, None
+        try:
+            # shielded, so cancelling the exit doesn't cancel a start ping that's already on its way
+            result = await asyncio.shield(task)
+        except Exception as exc:
+            self.add_log(f"start ping failed: {exc!r}")
+            return
+        if not result[0]:
+            self.add_log(f"start ping failed: {result[1]}")
+
     async def __aexit__(
         self,
         exc_type: Optional[Type[BaseException]],
@@ -147,15 +363,165 @@ class CheckTrap:
         Returns:
             Optional[bool]: self.suppress_exceptions, if true will not raise any exceptions
         """
+        if self._skipped:
+            return self.suppress_exceptions
+        self._remove_handler()
+        await self._wait_for_start()
         if exc_type is None:
             # ignore typing, if we've gotten here we know its an async client
             await self.client.success_ping(  # type: ignore
-                self.uuid, self.slug, data="\n".join(self.log_lines)
+                self.uuid, self.slug, data=self.log.getvalue(), timeout=self.timeout, rid=self.rid
             )
         else:
             self.add_log(str(exc))
             self.add_log(str(traceback))
             await self.client.fail_ping(  # type: ignore
-                self.uuid, self.slug, data="\n".join(self.log_lines)
+                self.uuid, self.slug, data=self.log.getvalue(), timeout=self.timeout, rid=self.rid
             )
         return self.suppress_exceptions
+
+    @staticmethod
+    def decorate(
+        client: Union[Client, AsyncClient],
+        uuid: str = "",
+        slug: str = "",
+        suppress_exceptions: bool = False,
+        timeout: Optional[float] = None,
+        exit_codes: Optional[ExitCodes] = None,
+        rid: bool = False,
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """A decorator that sends a start ping before each call of a function and a result ping after it.
+
+        Works on functions with a Client and on coroutine functions with an AsyncClient. The check is validated
+        and its ping urls are built once, when the function is decorated, and no CheckTrap is created per call.
+        While CheckTrap.disabled is set, the wrapper just calls the function.
+
+        A function that raises sends an exit code ping when the exception has an exit code, from exit_codes or a
+        SystemExit's code, and a fail ping with the traceback otherwise. A cancelled coroutine sends no ping, the
+        run didn't finish. Only subclasses of Exception are suppressed, KeyboardInterrupt, SystemExit and
+        cancellation always propagate.
+
+        Args:
+            client (Union[Client, AsyncClient]): healthchecks_io client, async for coroutine functions
+            uuid (str): uuid of the check. Defaults to "".
+            slug (str): slug of the check, exclusion wiht uuid. Defaults to "".
+            suppress_exceptions (bool): If true, the wrapper returns None instead of raising the function's
+                Exceptions. Defaults to False.
+            timeout (Optional[float]): seconds each ping may take, retries included. Defaults to None, the
+                client's default_timeout.
+            exit_codes (Optional[ExitCodes]): exit codes to report for exception classes, the closest base
+                class wins. Defaults to None.
+            rid (bool): send a new run id with each call's pings, so overlapping calls each get their own
+                duration. Defaults to False.
+
+        Raises:
+            Exception: Raised if neither a slug nor a uuid is passed
+            BadAPIRequestError: Raised if you pass a uuid and a slug, or a slug without a ping key set or a
+                slug resolver
+
+        Returns:
+            Callable[[Callable[..., Any]], Callable[..., Any]]: the decorator
+        """
+        if uuid == "" and slug == "":
+            raise Exception("Must pass a slug or an uuid")
+        # a slug the client resolves to a uuid may not have a slug url, its pings check their own url
+        if not (slug and client._slug_resolver is not None):
+            for endpoint in ("/start", "", "/fail"):
+                client._get_ping_url(uuid, slug, endpoint)
+
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            if iscoroutinefunction(func):
+                if isinstance(client, Client):
+                    raise WrongClientError("You passed a sync Client, decorate regular functions with it")
+                return _decorate_async(client, func, uuid, slug, suppress_exceptions, timeout, exit_codes, rid)
+            if isinstance(client, AsyncClient):
+                raise WrongClientError("You passed an AsyncClient, decorate coroutine functions with it")
+            return _decorate_sync(client, func, uuid, slug, suppress_exceptions, timeout, exit_codes, rid)
+
+        return decorator
+
+
+def _decorate_sync(
+    client: Client,
+    func: Callable[..., Any],
+    uuid: str,
+    slug: str,
+    suppress_exceptions: bool,
+    timeout: Optional[float],
+    exit_codes: Optional[ExitCodes],
+    rid: bool,
+) -> Callable[..., Any]:
+    """Wraps a function in a start ping and a result ping, see CheckTrap.decorate."""
+    start_ping = client.start_ping
+    success_ping = client.success_ping
+    fail_ping = client.fail_ping
+    exit_code_ping = client.exit_code_ping
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if CheckTrap.disabled:
+            return func(*args, **kwargs)
+        run = str(uuid4()) if rid else ""
+        result = start_ping(uuid, slug, timeout=timeout, rid=run)
+        if not result[0]:
+            raise PingFailedError(result[1])
+        try:
+            value = func(*args, **kwargs)
+        except BaseException as exc:
+            code = _exit_code(exc, exit_codes)
+            if code is None:
+                data = "".join(format_exception(type(exc), exc, exc.__traceback__))
+                fail_ping(uuid, slug, data=data, timeout=timeout, rid=run)
+            else:
+                exit_code_ping(code, uuid, slug, data=str(exc), timeout=timeout, rid=run)
+            if suppress_exceptions and isinstance(exc, Exception):
+                return None
+            raise
+        success_ping(uuid, slug, timeout=timeout, rid=run)
+        return value
+
+    return wrapper
+
+
+def _decorate_async(
+    client: AsyncClient,
+    func: Callable[..., Any],
+    uuid: str,
+    slug: str,
+    suppress_exceptions: bool,
+    timeout: Optional[float],
+    exit_codes: Optional[ExitCodes],
+    rid: bool,
+) -> Callable[..., Any]:
+    """Wraps a coroutine function in a start ping and a result ping, see CheckTrap.decorate."""
+    start_ping = client.start_ping
+    success_ping = client.success_ping
+    fail_ping = client.fail_ping
+    exit_code_ping = client.exit_code_ping
+
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if CheckTrap.disabled:
+            return await func(*args, **kwargs)
+        run = str(uuid4()) if rid else ""
+        result = await start_ping(uuid, slug, timeout=timeout, rid=run)
+        if not result[0]:
+            raise PingFailedError(result[1])
+        try:
+            value = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as exc:
+            code = _exit_code(exc, exit_codes)
+            if code is None:
+                data = "".join(format_exception(type(exc), exc, exc.__traceback__))
+                await fail_ping(uuid, slug, data=data, timeout=timeout, rid=run)
+            else:
+                await exit_code_ping(code, uuid, slug, data=str(exc), timeout=timeout, rid=run)
+            if suppress_exceptions and isinstance(exc, Exception):
+                return None
+            raise
+        await success_ping(uuid, slug, timeout=timeout, rid=run)
+        return value
+
+    return wrapper
@@ -0,0 +1,149 @@
+"""Circuit breaker that stops requests to a host that keeps failing."""
+
+import threading
+import time
+from collections import deque
+from typing import Callable
+from typing import Deque
+from typing import Optional
+from typing import Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+StateChangeCallback = Callable[[str, str], None]
+
+
+class CircuitBreaker:
+    """Stops sending requests to a host while too many of them fail."""
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        window: float = 30.0,
+        min_calls: int = 5,
+        probe_interval: float = 10.0,
+        on_state_change: Optional[StateChangeCallback] = None,
+    ) -> None:
+        """Stops sending requests to a host while too many of them fail.
+
+        The breaker starts closed and lets every request through. When at least min_calls requests finished in
+        the last window seconds and failure_rate of them failed, it opens and rejects requests. After
+        probe_interval seconds it goes half-open and lets a single probe request through. A successful probe
+        closes the breaker, a failed one opens it again.
+
+        Args:
+            failure_rate (float): fraction of failed requests that opens the breaker. Defaults to 0.5.
+            window (float): seconds of request outcomes the failure rate is measured over. Defaults to 30.0.
+            min_calls (int): outcomes needed in the window before the breaker can open. Defaults to 5.
+            probe_interval (float): seconds to stay open before letting a probe through. Defaults to 10.0.
+            on_state_change (Optional[StateChangeCallback]): called with the old and new state on every
+                transition. Defaults to None.
+
+        Raises:
+            ValueError: Raised if failure_rate is not between 0 and 1, or min_calls is less than 1
+        """
+        if not 0 < failure_rate <= 1:
+            raise ValueError("failure_rate must be above 0 and at most 1")
+        if min_calls < 1:
+            raise ValueError("min_calls must be at least 1")
+        self.failure_rate = failure_rate
+        self.window = window
+        self.min_calls = min_calls
+        self.probe_interval = probe_interval
+        self.on_state_change = on_state_change
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """The breaker's state, one of "closed", "open" or "half-open".
+
+        Returns:
+            str: state
+        """
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Should a request be sent now?
+
+        Returns:
+            bool: True if the request can be sent
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if time.monotonic() - self._opened_at < self.probe_interval:
+                    return False
+                transition = self._set_state(HALF_OPEN)
+            else:
+                transition = None
+                if self._probing:
+                    return False
+            self._probing = True
+        self._notify(transition)
+        return True
+
+    def release_probe(self) -> None:
+        """Gives back the half-open probe slot of a request that was let through but never sent.
+
+        Without it, a probe that gives up before it is sent, on a deadline or a cancellation, would keep the
+        breaker half-open and rejecting every request for good.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probing = False
+
+    def record_success(self) -> None:
+        """Records a request that succeeded."""
+        with self._lock:
+            if self._state == CLOSED:
+                self._record(True)
+                return
+            transition = self._set_state(CLOSED)
+        self._notify(transition)
+
+    def record_failure(self) -> None:
+        """Records a request that failed."""
+        with self._lock:
+            if self._state == CLOSED:
+                self._record(False)
+                failures = sum(1 for _, succeeded in self._outcomes if not succeeded)
+                if len(self._outcomes) < self.min_calls or failures / len(self._outcomes) < self.failure_rate:
+                    return
+            transition = self._set_state(OPEN)
+        self._notify(transition)
+
+    def _record(self, succeeded: bool) -> None:
+        """Adds an outcome to the window and forgets outcomes that fell out of it."""
+        now = time.monotonic()
+        self._outcomes.append((now, succeeded))
+        while self._outcomes[0][0] < now - self.window:
+            self._outcomes.popleft()
+
+    def _set_state(self, state: str) -> Optional[Tuple[str, str]]:
+        """Moves to a new state. Must be called with the lock held.
+
+        Args:
+            state (str): new state
+
+        Returns:
+            Optional[Tuple[str, str]]: the old and new state, or None if the state didn't change
+        """
+        old_state = self._state
+        self._state = state
+        self._probing = False
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        return None if old_state == state else (old_state, state)
+
+    def _notify(self, transition: Optional[Tuple[str, str]]) -> None:
+        """Calls on_state_change outside the lock, so the callback can look at the breaker."""
+        if transition is not None and self.on_state_change is not None:
+            self.on_state_change(*transition)
@@ -0,0 +1,620 @@
+"""Ping dispatchers that send pings in the background instead of on the caller's hot path."""
+
+import asyncio
+import atexit
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from types import TracebackType
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Type
+
+from .async_client import AsyncClient
+from .exceptions import PingQueueClosedError
+from .exceptions import PingQueueFullError
+from .sync_client import Client
+
+OVERFLOW_POLICIES = ("block", "drop", "coalesce")
+
+
+class _QueuedPing:
+    """A ping waiting in a dispatcher queue."""
+
+    __slots__ = ("method", "kwargs", "future")
+
+    def __init__(self, method: str, kwargs: Dict[str, Any], future: Any) -> None:
+        """A ping waiting in a dispatcher queue.
+
+        Args:
+            method (str): name of the client ping method to call
+            kwargs (Dict[str, Any]): keyword arguments for the ping method
+            future (Any): future that receives the ping result
+        """
+        self.method = method
+        self.kwargs = kwargs
+        self.future = future
+
+
+def _consume_exception(future: "asyncio.Future[Tuple[bool, str]]") -> None:
+    """Marks a future's exception as retrieved so fire-and-forget pings don't log warnings."""
+    if not future.cancelled():
+        future.exception()
+
+
+class AsyncPingDispatcher:
+    """Sends pings for an AsyncClient from a pool of background worker tasks."""
+
+    def __init__(self, client: AsyncClient, workers: int = 4, max_queue_size: int = 1000) -> None:
+        """An AsyncPingDispatcher queues pings and sends them from background tasks.
+
+        Ping methods return as soon as the ping is queued. Each returns an asyncio.Future that
+        resolves to the same (bool, str) tuple the client's ping method would have returned, or
+        raises the same exception.
+
+        Workers share the client's httpx connection pool and are started on the first queued ping.
+
+        Args:
+            client (AsyncClient): client used to send the pings
+            workers (int): number of worker tasks sending pings. Defaults to 4.
+            max_queue_size (int): maximum number of queued pings. Queuing a ping waits for a free slot when
+                the queue is full. Defaults to 1000.
+
+        Raises:
+            ValueError: Raised if workers is less than 1
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self._client = client
+        self._workers = workers
+        self._max_queue_size = max_queue_size
+        self._queue: Optional["asyncio.Queue[_QueuedPing]"] = None
+        self._tasks: List["asyncio.Task[None]"] = list()
+        self._pid = os.getpid()
+        self._closed = False
+        self.sent = 0
+        self.failed = 0
+
+    async def __aenter__(self) -> "AsyncPingDispatcher":
+        """Context manager entrance.
+
+        Returns:
+            AsyncPingDispatcher: returns this dispatcher as a context manager
+        """
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Context manager exit, drains the queue and stops the workers."""
+        await self.aclose()
+
+    @property
+    def qsize(self) -> int:
+        """Number of pings waiting in the queue.
+
+        Returns:
+            int: queued pings
+        """
+        return 0 if self._queue is None else self._queue.qsize()
+
+    def _ensure_started(self) -> "asyncio.Queue[_QueuedPing]":
+        """Creates the queue and worker tasks inside the running event loop.
+
+        Returns:
+            asyncio.Queue[_QueuedPing]: the ping queue
+        """
+        if self._pid != os.getpid():
+            # forked, the parent's queued pings and worker tasks are its own to send
+            self._pid = os.getpid()
+            self._queue = None
+            self._tasks = list()
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+            self._tasks = [asyncio.ensure_future(self._worker(self._queue)) for _ in range(self._workers)]
+        return self._queue
+
+    async def _worker(self, queue: "asyncio.Queue[_QueuedPing]") -> None:
+        """Sends queued pings until cancelled."""
+        while True:
+            item = await queue.get()
+            try:
+                if not item.future.done():
+                    result = await getattr(self._client, item.method)(**item.kwargs)
+                    self.sent += 1
+                    if not item.future.done():
+                        item.future.set_result(result)
+            except asyncio.CancelledError:
+                item.future.cancel()
+                raise
+            except Exception as exc:
+                self.failed += 1
+                if not item.future.done():
+                    item.future.set_exception(exc)
+            finally:
+                queue.task_done()
+
+    async def _enqueue(self, method: str, **kwargs: Any) -> "asyncio.Future[Tuple[bool, str]]":
+        """Queues a call to one of the client's ping methods.
+
+        Args:
+            method (str): name of the client ping method
+            **kwargs (Any): arguments for the ping method
+
+        Raises:
+            PingQueueClosedError: Raised when the dispatcher has been closed
+
+        Returns:
+            asyncio.Future[Tuple[bool, str]]: future for the ping result
+        """
+        if self._closed:
+            raise PingQueueClosedError("Dispatcher is closed, cannot queue more pings")
+        queue = self._ensure_started()
+        future: "asyncio.Future[Tuple[bool, str]]" = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume_exception)
+        await queue.put(_QueuedPing(method, kwargs, future))
+        return future
+
+    async def success_ping(
+        self, uuid: str = "", slug: str = "", data: str = "", rid: str = "", timeout: Optional[float] = None
+    ) -> "asyncio.Future[Tuple[bool, str]]":
+        """Queues a success ping. See AsyncClient.success_ping.
+
+        Args:
+            uuid (str): Check's UUID. Defaults to "".
+            slug (str):  Check's Slug. Defaults to "".
+            data (str): Text data to append to this check. Defaults to "".
+            rid (str): run id, pairing the start and finish pings of one run. Defaults to "", none.
+            timeout (Optional[float]): seconds the ping may take, retries included. Defaults to None, the
+                client's default_timeout.
+
+        Returns:
+            asyncio.Future[Tuple[bool, str]]: future for the ping result
+        """
+        return await self._enqueue("success_ping", uuid=uuid, slug=slug, data=data, rid=rid, timeout=timeout)
+
+    async def start_ping(
+        self, uuid: str = "", slug: str = "", data: str = "", rid: str = "", timeout: Optional[float] = None
+    ) -> "asyncio.Future[Tuple[bool, str]]":
+        """Queues a start ping. See AsyncClient.start_ping.
+
+        Args:
+            uuid (str): Check's UUID. Defaults to "".
+            slug (str):  Check's Slug. Defaults to "".
+            data (str): Text data to append to this check. Defaults to "".
+            rid (str): run id, pairing the start and finish pings of one run. Defaults to "", none.
+            timeout (Optional[float]): seconds the ping may take, retries included. Defaults to None, the
+                client's default_timeout.
+
+        Returns:
+            asyncio.Future[Tuple[bool, str]]: future for the ping result
+        """
+        return await self._enqueue("start_ping", uuid=uuid, slug=slug, data=data, rid=rid, timeout=timeout)
+
+    async def fail_ping(
+        self, uuid: str = "", slug: str = "", data: str = "", rid: str = "", timeout: Optional[float] = None
+    ) -> "asyncio.Future[Tuple[bool, str]]":
+        """Queues a fail ping. See AsyncClient.fail_ping.
+
+        Args:
+            uuid (str): Check's UUID. Defaults to "".
+            slug (str):  Check's Slug. Defaults to "".
+            data (str): Text data to append to this check. Defaults to "".
+            rid (str): run id, pairing the start and finish pings of one run. Defaults to "", none.
+            timeout (Optional[float]): seconds the ping may take, retries included. Defaults to None, the
+                client's default_timeout.
+
+        Returns:
+            asyncio.Future[Tuple[bool, str]]: future for the ping result
+        """
+        return await self._enqueue("fail_ping", uuid=uuid, slug=slug, data=data, rid=rid, timeout=timeout)
+
+    async def exit_code_ping(
+        self,
+        exit_code: int,
+        uuid: str = "",
+        slug: str = "",
+        data: str = "",
+        rid: str = "",
+        timeout: Optional[float] = None,
+    ) -> "asyncio.Future[Tuple[bool, str]]":
+        """Queues an exit code ping. See AsyncClient.exit_code_ping.
+
+        Args:
+            exit_code (int): Exit code to sent, int from 0 to 255
+            uuid (str): Check's UUID. Defaults to "".
+            slug (str):  Check's Slug. Defaults to "".
+            data (str): Text data to append to this check. Defaults to "".
+            rid (str): run id, pairing the start and finish pings of one run. Defaults to "", none.
+            timeout (Optional[float]): seconds the ping may take, retries included. Defaults to None, the
+                client's default_timeout.
+
+        Returns:
+            asyncio.Future[Tuple[bool, str]]: future for the ping result
+        """
+        return await self._enqueue(
+            "exit_code_ping", exit_code=exit_code, uuid=uuid, slug=slug, data=data, rid=rid, timeout=timeout
+        )
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits for every queued ping to be sent.
+
+        Args:
+            timeout (Optional[float]): seconds to wait before giving up. Defaults to None, wait forever.
+
+        Returns:
+            bool: True if the queue was drained, False if the timeout was hit first
+        """
+        if self._queue is None:
+            return True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def aclose(self, timeout: Optional[float] = None) -> bool:
+        """Stops accepting pings, drains the queue and stops the workers.
+
+        Pings still queued or in flight when the timeout is hit are cancelled.
+
+        Args:
+            timeout (Optional[float]): seconds to wait for the queue to drain. Defaults to None, wait forever.
+
+        Returns:
+            bool: True if the queue was drained, False if pings had to be cancelled
+        """
+        self._closed = True
+        drained = await self.flush(timeout)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = list()
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._queue.get_nowait().future.cancel()
+                self._queue.task_done()
+        return drained
+
+
+class PingDispatcher:
+    """Sends pings for a Client from a pool of background threads."""
+
+    def __init__(
+        self,
+        client: Client,
+        workers: int = 2,
+        max_queue_size: int = 1000,
+        overflow: str = "block",
+        block_timeout: Optional[float] = None,
+        flush_timeout: Optional[float] = 5.0,
+    ) -> None:
+        """A PingDispatcher queues pings and sends them from background threads.
+
+        Ping methods return as soon as the ping is queued. Each returns a concurrent.futures.Future that
+        resolves to the same (bool, str) tuple the client's ping method would have returned, or raises
+        the same exception.
+
+        What happens when the queue is full depends on overflow:
+        * block: wait up to block_timeout for a free slot, then drop the ping
+        * drop: drop the ping
+        * coalesce: if the same ping for the same check is already queued, replace its data with the new
+          data and return its future. Otherwise drop the ping.
+
+        A dropped ping's future raises PingQueueFullError.
+
+        Worker threads are started on the first queued ping. An atexit handler flushes the queue for up to
+        flush_timeout seconds so queued pings are not lost when the process exits.
+
+        Args:
+            client (Client): client used to send the pings
+            workers (int): number of threads sending pings. Defaults to 2.
+            max_queue_size (int): maximum number of queued pings. Defaults to 1000.
+            overflow (str): one of "block", "drop" or "coalesce". Defaults to "block".
+            block_timeout (Optional[float]): seconds to wait for a free slot with the block policy.
+                Defaults to None, wait forever.
+            flush_timeout (Optional[float]): seconds to wait for the queue to drain at exit. Defaults to 5.0.
+
+        Raises:
+            ValueError: Raised if workers is less than 1 or overflow is not a known policy
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}")
+        self._client = client
+        self._workers = workers
+        self._overflow = overflow
+        self._block_timeout = block_timeout
+        self._flush_timeout = flush_timeout
+        self._queue: "queue.Queue[Optional[_QueuedPing]]" = queue.Queue(maxsize=max_queue_size)
+        self._pending: Dict[Tuple[Any, ...], _QueuedPing] = dict()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = list()
+        self._pid = os.getpid()
+        self._closed = False
+        self._stopping = False
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def __enter__(self) -> "PingDispatcher":
+        """Context manager entrance.
+
+        Returns:
+            PingDispatcher: returns this dispatcher as a context manager
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Context manager exit, drains the queue and stops the workers."""
+        self.close(self._flush_timeout)
+
+    @property
+    def qsize(self) -> int:
+        """Number of pings waiting in the queue.
+
+        Returns:
+            int: queued pings
+        """
+        return self._queue.qsize()
+
+    def _ensure_started(self) -> None:
+        """Starts the worker threads and registers the atexit flush."""
+        self._check_fork()
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            self._threads = [
+                threading.Thread(target=self._worker, name=f"healthchecks-io-ping-{index}", daemon=True)
+                for index in range(self._workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+            atexit.register(self.close, self._flush_timeout)
+
+    def _check_fork(self) -> None:
+        """Drops the queue, lock and threads inherited from the parent process, in a forked child.
+
+        The child has no worker threads, and the pings queued before the fork are the parent's to send. Without
+        this, the child's atexit flush would wait on them.
+        """
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._pending = dict()
+        self._lock = threading.Lock()
+        self._threads = list()
+
+    def _worker(self) -> None:
+        """Sends queued pings until it gets a stop sentinel."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._overflow == "coalesce":
+                    with self._lock:
+                        key = _coalesce_key(item)
+                        if self._pending.get(key) is item:
+                            del self._pending[key]
+                if item.future.set_running_or_notify_cancel():
+                    try:
+                        result = getattr(self._client, item.method)(**item.kwargs)
+                    except Exception as exc:
+                        with self._lock:
+                            self.failed += 1
+                        item.future.set_exception(exc)
+                    else:
+                        with self._lock:
+                            self.sent += 1
+                        item.future.set_result(result)
+            finally:
+                self._queue.task_done()
+            if self._stopping:
+                return
+
+    def _enqueue(self, method: str, **kwargs: Any) -> "Future[Tuple[bool, str]]":
+        """Queues a call to one of the client's ping methods.
+
+        Args:
+            method (str): name of the client ping method
+            **kwargs (Any): arguments for the ping method
+
+        Raises:
+            PingQueueClosedError: Raised when the dispatcher has been closed
+
+        Returns:
+            Future[Tuple[bool, str]]: future for the ping result
+        """
+        if self._closed:
+            raise PingQueueClosedError("Dispatcher is closed, cannot queue more pings")
+        self._ensure_started()
+        item = _QueuedPing(method, kwargs, Future())
+        if self._overflow == "block":
+            try:
+                self._queue.put(item, timeout=self._block_timeout)
+                return item.future  # type: ignore
+            except queue.Full:
+                pass
+        else:
+            coalesce = self._overflow == "coalesce"
+            key = _coalesce_key(item) if coalesce else ()
+            with self._lock:
+                try:
+                    self._queue.put_nowait(item)
+                except queue.Full:
+                    pending = self._pending.get(key) if coalesce else None
+                    if pending is not None:
+                        pending.kwargs["data"] = kwargs["data"]
+                        self.coalesced += 1
+                        return pending.future  # type: ignore
+                else:
+                    if coalesce:
+                        self._pending[key] = item
+                    return item.future  # type: ignore
+
+        with self._lock:
+            self.dropped += 1
+        item.future.set_exception(PingQueueFullError("Ping queue is full, ping dropped"))
+        return item.future  # type: ignore
+
+    def success_ping(
+        self, uuid: str = "", slug: str = "", data: str = "", rid: str = "", timeout: Optional[float] = None
+    ) -> "Future[Tuple[bool, str]]":
+        """Queues a success ping. See Client.success_ping.
+
+        Args:
+            uuid (str): Check's UUID. Defaults to "".
+            slug (str):  Check's Slug. Defaults to "".
+            data (str): Text data to append to this check. Defaults to "".
+            rid (str): run id, pairing the start and finish pings of one run. Defaults to "", none.
+            timeout (Optional[float]): seconds the ping may take, retries included. Defaults to None, the
+                client's default_timeout.
+
+        Returns:
+            Future[Tuple[bool, str]]: future for the ping result
+        """
+        return self._enqueue("success_ping", uuid=uuid, slug=slug, data=data, rid=rid, timeout=timeout)
+
+    def start_ping(
+        self, uuid: str = "", slug: str = "", data: str = "", rid: str = "", timeout: Optional[float] = None
+    ) -> "Future[Tuple[bool, str]]":
+        """Queues a start ping. See Client.start_ping.
+
+        Args:
+            uuid (str): Check's UUID. Defaults to "".
+            slug (str):  Check's Slug. Defaults to "".
+            data (str): Text data to append to this check. Defaults to "".
+            rid (str): run id, pairing the start and finish pings of one run. Defaults to "", none.
+            timeout (Optional[float]): seconds the ping may take, retries included. Defaults to None, the
+                client's default_timeout.
+
+        Returns:
+            Future[Tuple[bool, str]]: future for the ping result
+        """
+        return self._enqueue("start_ping", uuid=uuid, slug=slug, data=data, rid=rid, timeout=timeout)
+
+    def fail_ping(
+        self, uuid: str = "", slug: str = "", data: str = "", rid: str = "", timeout: Optional[float] = None
+    ) -> "Future[Tuple[bool, str]]":
+        """Queues a fail ping. See Client.fail_ping.
+
+        Args:
+            uuid (str): Check's UUID. Defaults to "".
+            slug (str):  Check's Slug. Defaults to "".
+            data (str): Text data to append to this check. Defaults to "".
+            rid (str): run id, pairing the start and finish pings of one run. Defaults to "", none.
+            timeout (Optional[float]): seconds the ping may take, retries included. Defaults to None, the
+                client's default_timeout.
+
+        Returns:
+            Future[Tuple[bool, str]]: future for the ping result
+        """
+        return self._enqueue("fail_ping", uuid=uuid, slug=slug, data=data, rid=rid, timeout=timeout)
+
+    def exit_code_ping(
+        self,
+        exit_code: int,
+        uuid: str = "",
+        slug: str = "",
+        data: str = "",
+        rid: str = "",
+        timeout: Optional[float] = None,
+    ) -> "Future[Tuple[bool, str]]":
+        """Queues an exit code ping. See Client.exit_code_ping.
+
+        Args:
+            exit_code (int): Exit code to sent, int from 0 to 255
+            uuid (str): Check's UUID. Defaults to "".
+            slug (str):  Check's Slug. Defaults to "".
+            data (str): Text data to append to this check. Defaults to "".
+            rid (str): run id, pairing the start and finish pings of one run. Defaults to "", none.
+            timeout (Optional[float]): seconds the ping may take, retries included. Defaults to None, the
+                client's default_timeout.
+
+        Returns:
+            Future[Tuple[bool, str]]: future for the ping result
+        """
+        return self._enqueue(
+            "exit_code_ping", exit_code=exit_code, uuid=uuid, slug=slug, data=data, rid=rid, timeout=timeout
+        )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits for every queued ping to be sent.
+
+        Args:
+            timeout (Optional[float]): seconds to wait before giving up. Defaults to None, wait forever.
+
+        Returns:
+            bool: True if the queue was drained, False if the timeout was hit first
+        """
+        self._check_fork()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Stops accepting pings, drains the queue and stops the workers.
+
+        Pings still queued when the timeout is hit are cancelled. Pings already being sent are left to finish
+        on their daemon threads.
+
+        Args:
+            timeout (Optional[float]): seconds to wait for the queue to drain. Defaults to None, wait forever.
+
+        Returns:
+            bool: True if the queue was drained, False if pings had to be cancelled
+        """
+        self._closed = True
+        atexit.unregister(self.close)
+        drained = self.flush(timeout)
+        self._stopping = True
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item.future.cancel()
+            self._queue.task_done()
+        for _ in self._threads:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:  # pragma: no cover
+                break
+        return drained
+
+
+def _coalesce_key(item: _QueuedPing) -> Tuple[Any, ...]:
+    """Key identifying the same ping to the same check, ignoring its data.
+
+    Args:
+        item (_QueuedPing): a queued ping
+
+    Returns:
+        Tuple[Any, ...]: the key
+    """
+    return (item.method,) + tuple(value for name, value in item.kwargs.items() if name != "data")
@@ -0,0 +1,179 @@
+"""Events describing every request a client makes, for listeners doing logging or metrics."""
+
+import time
+from contextlib import nullcontext
+from types import TracebackType
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import ContextManager
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Type
+from urllib.parse import urlsplit
+
+from httpx import Response
+
+TraceCallback = Callable[[str, Dict[str, Any]], None]
+AsyncTraceCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class RequestEvent:
+    """What happened to one ping or api call: its outcome, size and where its time went."""
+
+    __slots__ = (
+        "operation",
+        "ping",
+        "method",
+        "url",
+        "status",
+        "exception",
+        "spooled",
+        "attempts",
+        "bytes_sent",
+        "bytes_received",
+        "started",
+        "elapsed",
+        "timings",
+        "_start",
+        "_phase_starts",
+    )
+
+    def __init__(self, operation: str, ping: bool, method: str, url: str) -> None:
+        """What happened to one ping or api call: its outcome, size and where its time went.
+
+        A call covers every attempt the retry policy made. status, bytes_sent, bytes_received and timings
+        describe the last attempt.
+
+        Args:
+            operation (str): name of the client method called, like "success_ping" or "get_checks"
+            ping (bool): True for a ping, False for a management api request
+            method (str): http method
+            url (str): request url
+        """
+        self.operation = operation
+        self.ping = ping
+        self.method = method
+        self.url = url
+        # status code of the last response, None if no response was received
+        self.status: Optional[int] = None
+        # class of the exception the call raised, or that a spooled ping failed with
+        self.exception: Optional[Type[BaseException]] = None
+        self.spooled = False
+        self.attempts = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.started = time.time()
+        self.elapsed = 0.0
+        # seconds spent in each httpcore phase, like "connect_tcp", "start_tls" or "receive_response_headers"
+        self.timings: Dict[str, float] = dict()
+        self._start = time.monotonic()
+        self._phase_starts: Dict[str, float] = dict()
+
+    @property
+    def host(self) -> str:
+        """Host the request was sent to.
+
+        Returns:
+            str: host name
+        """
+        return urlsplit(self.url).hostname or ""
+
+    def start_attempt(self) -> None:
+        """Resets the per attempt fields as a new attempt starts."""
+        self.attempts += 1
+        self.status = None
+        self.exception = None
+        self.timings = dict()
+
+    def record_response(self, response: Response) -> None:
+        """Records the response to an attempt.
+
+        Args:
+            response (Response): the response
+        """
+        self.status = response.status_code
+        self.bytes_sent = len(response.request.content)
+        self.bytes_received = response.num_bytes_downloaded
+
+    def _record_phase(self, event_name: str) -> None:
+        """Times an httpcore phase from its started and complete or failed trace events."""
+        phase, _, stage = event_name.rpartition(".")
+        if stage == "started":
+            self._phase_starts[phase] = time.monotonic()
+        elif phase in self._phase_starts:
+            self.timings[phase.partition(".")[2]] = time.monotonic() - self._phase_starts.pop(phase)
+
+    def trace(self, inner: Optional[TraceCallback] = None) -> TraceCallback:
+        """An httpcore trace callback that times the phases of a sync request.
+
+        Args:
+            inner (Optional[TraceCallback]): trace callback to call as well. Defaults to None.
+
+        Returns:
+            TraceCallback: the trace callback
+        """
+
+        def trace(event_name: str, info: Dict[str, Any]) -> None:
+            self._record_phase(event_name)
+            if inner is not None:
+                inner(event_name, info)
+
+        return trace
+
+    def atrace(self) -> AsyncTraceCallback:
+        """An httpcore trace callback that times the phases of an async request.
+
+        Returns:
+            AsyncTraceCallback: the trace callback
+        """
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            self._record_phase(event_name)
+
+        return trace
+
+
+Listener = Callable[[RequestEvent], None]
+
+
+class EventRecorder:
+    """Context manager that finishes a RequestEvent and hands it to the listeners."""
+
+    __slots__ = ("event", "listeners")
+
+    def __init__(self, event: RequestEvent, listeners: List[Listener]) -> None:
+        """Context manager that finishes a RequestEvent and hands it to the listeners.
+
+        Args:
+            event (RequestEvent): event of the call being made
+            listeners (List[Listener]): listeners to call when the call is done
+        """
+        self.event = event
+        self.listeners = listeners
+
+    def __enter__(self) -> RequestEvent:
+        """Starts recording.
+
+        Returns:
+            RequestEvent: the event to fill in
+        """
+        return self.event
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Finishes the event and calls the listeners."""
+        self.event.elapsed = time.monotonic() - self.event._start
+        if exc_type is not None:
+            self.event.exception = exc_type
+        for listener in list(self.listeners):
+            listener(self.event)
+
+
+# returned instead of an EventRecorder when nothing is listening, so unobserved calls build no event
+NO_RECORDER: ContextManager[Optional[RequestEvent]] = nullcontext()
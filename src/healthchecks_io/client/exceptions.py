@@ -47,3 +47,27 @@ class PingFailedError(HCAPIError):
     """Thrown when a ping fails."""
 
     ...
+
+
+class PingQueueClosedError(HCAPIError):
+    """Thrown when queuing a ping on a dispatcher that has been closed."""
+
+    ...
+
+
+class PingQueueFullError(HCAPIError):
+    """Thrown when a ping is dropped because a dispatcher's queue is full."""
+
+    ...
+
+
+class CircuitOpenError(HCAPIError):
+    """Thrown when a request is not sent because the host's circuit breaker is open."""
+
+    ...
+
+
+class DeadlineExceededError(HCAPIError):
+    """Thrown when a call runs out of its time budget before it gets a response."""
+
+    ...
@@ -0,0 +1,132 @@
+"""A byte capped log for CheckTrap, keeping the start and the end of a job's output."""
+
+import threading
+from collections import deque
+from typing import Deque
+from typing import List
+from typing import Optional
+
+# Healthchecks.io keeps the first 100 KB of a ping's body
+DEFAULT_MAX_LOG_BYTES = 100_000
+
+# room kept for the elision marker, the longest one fits with 20 digit counts
+_MARKER_BYTES = 80
+
+_MARKER = "[... {lines} lines, {nbytes} bytes elided ...]\n"
+
+
+class LogBuffer:
+    """Log lines capped at a number of bytes, keeping a head and a tail segment around an elision marker."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_LOG_BYTES, head_bytes: Optional[int] = None) -> None:
+        """Log lines capped at a number of bytes, keeping a head and a tail segment around an elision marker.
+
+        Lines are encoded to utf-8 once, as they are added. The first lines fill the head segment, the ones after
+        it go to the tail segment, which drops its oldest lines to stay under its size. The body joins the head,
+        a marker counting the dropped lines and the tail, and is never longer than max_bytes. A single line
+        longer than the tail segment keeps its end. It can be shared by threads.
+
+        Args:
+            max_bytes (int): most bytes of the body, marker included. Defaults to 100,000, what Healthchecks.io
+                keeps of a ping's body.
+            head_bytes (Optional[int]): bytes of the head segment. Defaults to None, a quarter of max_bytes.
+
+        Raises:
+            ValueError: Raised when max_bytes is too small to hold the marker and some of the log, or head_bytes
+                is negative
+        """
+        if max_bytes < 2 * _MARKER_BYTES:
+            raise ValueError(f"max_bytes must be at least {2 * _MARKER_BYTES}")
+        if head_bytes is not None and head_bytes < 0:
+            raise ValueError("head_bytes must not be negative")
+        budget = max_bytes - _MARKER_BYTES
+        self.max_bytes = max_bytes
+        self._head_cap = budget // 4 if head_bytes is None else min(head_bytes, budget)
+        self._tail_cap = budget - self._head_cap
+        self._head: List[bytes] = list()
+        self._head_size = 0
+        self._head_full = self._head_cap == 0
+        self._tail: Deque[bytes] = deque()
+        self._tail_size = 0
+        self.elided_lines = 0
+        self.elided_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of the kept lines, without the marker."""
+        return self._head_size + self._tail_size
+
+    def append(self, line: str) -> None:
+        """Adds a line to the log.
+
+        Args:
+            line (str): the line, without a trailing newline
+        """
+        data = line.encode("utf-8", "replace") + b"\n"
+        with self._lock:
+            self._append(data)
+
+    def _append(self, data: bytes) -> None:
+        """Adds an encoded line, under the lock."""
+        size = len(data)
+        if not self._head_full:
+            if self._head_size + size <= self._head_cap:
+                self._head.append(data)
+                self._head_size += size
+                return
+            # later lines go to the tail, even short ones, so the head stays the log's first lines
+            self._head_full = True
+        if size > self._tail_cap:
+            cut = size - self._tail_cap
+            # don't start the line in the middle of a utf-8 character
+            while cut < size and data[cut] & 0xC0 == 0x80:
+                cut += 1
+            self.elided_bytes += cut
+            data = data[cut:]
+            size -= cut
+            if not data:
+                self.elided_lines += 1
+                return
+        self._tail.append(data)
+        self._tail_size += size
+        while self._tail_size > self._tail_cap:
+            dropped = self._tail.popleft()
+            self._tail_size -= len(dropped)
+            self.elided_lines += 1
+            self.elided_bytes += len(dropped)
+
+    def clear(self) -> None:
+        """Drops every line, and the counts of elided ones."""
+        with self._lock:
+            self._head = list()
+            self._head_size = 0
+            self._head_full = self._head_cap == 0
+            self._tail = deque()
+            self._tail_size = 0
+            self.elided_lines = 0
+            self.elided_bytes = 0
+
+    def getvalue(self) -> str:
+        """The log's body: the head, the elision marker when lines were dropped, and the tail.
+
+        Returns:
+            str: the log, its lines joined by newlines
+        """
+        with self._lock:
+            parts = list(self._head)
+            if self.elided_bytes:
+                parts.append(_MARKER.format(lines=self.elided_lines, nbytes=self.elided_bytes).encode("ascii"))
+            parts.extend(self._tail)
+        body = b"".join(parts)
+        return body[:-1].decode("utf-8", "replace")
+
+    def lines(self) -> List[str]:
+        """The kept lines, with the elision marker between the head and the tail when lines were dropped.
+
+        Returns:
+            List[str]: the lines
+        """
+        if not (self._head or self._tail or self.elided_bytes):
+            return list()
+        return self.getvalue().split("\n")
@@ -0,0 +1,84 @@
+"""A logging handler that writes records into a LogBuffer, so a job's logging output goes with its ping."""
+
+import logging
+from contextvars import ContextVar
+from contextvars import Token
+from typing import Optional
+from typing import Tuple
+
+from .log_buffer import LogBuffer
+
+DEFAULT_LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+# handlers that only take records logged from the context they were bound to, see LogBufferHandler.bind
+_bound_handlers: "ContextVar[Tuple[LogBufferHandler, ...]]" = ContextVar("healthchecks_io_log_handlers", default=())
+
+
+class LogBufferHandler(logging.Handler):
+    """Writes formatted log records into a LogBuffer."""
+
+    def __init__(
+        self, buffer: LogBuffer, level: int = logging.NOTSET, formatter: Optional[logging.Formatter] = None
+    ) -> None:
+        """Writes formatted log records into a LogBuffer.
+
+        Records below level are dropped by the logger before the handler sees them, so they are never formatted.
+        The logger's own level still applies, records it doesn't create can't be captured. The buffer is thread
+        safe, the handler takes records from every thread until it is bound to a context.
+
+        Args:
+            buffer (LogBuffer): the buffer the records are written to
+            level (int): the lowest level of the records it takes. Defaults to logging.NOTSET, every record.
+            formatter (Optional[logging.Formatter]): formats the records. Defaults to None, a formatter with the
+                time, level, logger name and message.
+        """
+        super().__init__(level)
+        self.buffer = buffer
+        self.setFormatter(formatter or logging.Formatter(DEFAULT_LOG_FORMAT))
+        self._bound = False
+
+    def bind(self) -> "Token[Tuple[LogBufferHandler, ...]]":
+        """Only takes records logged from the current context from now on.
+
+        In asyncio code, that's the current task and the tasks it starts, so the records of concurrent tasks
+        don't end up in each other's buffers. Threads started with asyncio.to_thread or a copied context count
+        too.
+
+        Returns:
+            Token[Tuple[LogBufferHandler, ...]]: pass it to unbind
+        """
+        self._bound = True
+        return _bound_handlers.set(_bound_handlers.get() + (self,))
+
+    @staticmethod
+    def unbind(token: "Token[Tuple[LogBufferHandler, ...]]") -> None:
+        """Undoes a bind, in the context it was made in.
+
+        Args:
+            token (Token[Tuple[LogBufferHandler, ...]]): the token bind returned
+        """
+        _bound_handlers.reset(token)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Drops the records logged outside of the bound context, then applies the handler's filters.
+
+        Args:
+            record (logging.LogRecord): the record
+
+        Returns:
+            bool: whether the record is kept
+        """
+        if self._bound and self not in _bound_handlers.get():
+            return False
+        return bool(super().filter(record))
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Formats a record and writes it into the buffer.
+
+        Args:
+            record (logging.LogRecord): the record
+        """
+        try:
+            self.buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
@@ -0,0 +1,58 @@
+"""Client side rate limiting."""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """A token bucket rate limiter that can be shared by threads, coroutines and clients."""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """A token bucket rate limiter that can be shared by threads, coroutines and clients.
+
+        The bucket refills at rate tokens per second and holds at most burst tokens. Every request takes
+        one token. When the bucket is empty, a request reserves the next token and waits until it has been
+        refilled, so concurrent callers are spaced out in the order they asked.
+
+        Args:
+            rate (float): requests per second
+            burst (int): requests that can be sent back to back before rate applies. Defaults to 1.
+
+        Raises:
+            ValueError: Raised if rate is not positive or burst is less than 1
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        # only held while doing arithmetic, never while waiting, so it is safe to take from a coroutine
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token from the bucket.
+
+        Returns:
+            float: seconds the caller must wait before sending its request
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def refund(self) -> None:
+        """Gives back the token reserve took for a request that is never sent, like one out of time to wait."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(float(self.burst), self._tokens + 1)
+
+    def _refill(self) -> None:
+        """Adds the tokens refilled since the last update, under the lock."""
+        now = time.monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
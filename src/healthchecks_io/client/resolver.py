@@ -0,0 +1,210 @@
+"""Resolves check slugs to uuids, so slug pings can be sent as uuid pings."""
+
+import asyncio
+import threading
+import time
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import TYPE_CHECKING
+
+from .exceptions import NonUniqueSlugError
+
+if TYPE_CHECKING:  # pragma: no cover
+    from healthchecks_io.schemas import Check
+    from .async_client import AsyncClient
+    from .sync_client import Client
+
+# what a resolver should do before a lookup
+_LOAD = "load"
+_REFRESH = "refresh"
+
+
+class SlugResolver:
+    """A slug to uuid index of the project's checks, loaded with get_checks and refreshed in the background."""
+
+    def __init__(self, ttl: float = 300.0) -> None:
+        """A slug to uuid index of the project's checks, loaded with get_checks and refreshed in the background.
+
+        A client with a resolver sends slug pings to the check's uuid url, so they don't need a ping key and
+        can't get a 409 from Healthchecks.io. The index is loaded by the first slug ping, and then refreshed in
+        the background once it is older than ttl, while pings keep using the old index. Slug pings sent while
+        the first load is running wait for it. Slugs shared by more
+        than one check raise NonUniqueSlugError without sending anything. Slugs that aren't in the index, like
+        a check created since the last refresh, or every slug when loading failed, are pinged by slug.
+
+        Args:
+            ttl (float): seconds before the index is refreshed. Defaults to 300.0.
+        """
+        self.ttl = ttl
+        self._index: Dict[str, str] = dict()
+        self._duplicates: Set[str] = set()
+        self._loaded_at: Optional[float] = None
+        self._refreshing = False
+        self._task: "Optional[asyncio.Future[None]]" = None
+        # the async client's first load, that slug pings sent meanwhile wait for
+        self._loading: "Optional[asyncio.Future[None]]" = None
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+
+    @property
+    def duplicates(self) -> Set[str]:
+        """Slugs used by more than one check.
+
+        Returns:
+            Set[str]: duplicated slugs
+        """
+        return set(self._duplicates)
+
+    def update(self, checks: "List[Check]") -> None:
+        """Rebuilds the index from a list of checks.
+
+        Checks without a uuid, as returned to a read only api key, are left out.
+
+        Args:
+            checks (List[Check]): the project's checks
+        """
+        index: Dict[str, str] = dict()
+        duplicates: Set[str] = set()
+        for check in checks:
+            if not check.slug or check.uuid is None:
+                continue
+            if index.get(check.slug, check.uuid) != check.uuid:
+                duplicates.add(check.slug)
+            index[check.slug] = check.uuid
+        for slug in duplicates:
+            del index[slug]
+        with self._lock:
+            self._index = index
+            self._duplicates = duplicates
+            self._loaded_at = time.monotonic()
+
+    def lookup(self, slug: str) -> str:
+        """Looks a slug up in the index, without loading or refreshing it.
+
+        Args:
+            slug (str): Check's Slug
+
+        Raises:
+            NonUniqueSlugError: Raised if more than one check has this slug
+
+        Returns:
+            str: the check's uuid, or "" if the slug isn't in the index
+        """
+        if slug in self._duplicates:
+            raise NonUniqueSlugError(f"More than one check has the slug {slug}")
+        return self._index.get(slug, "")
+
+    def _due(self, wait: bool) -> Optional[str]:
+        """Claims the index's next load or refresh, if one is due and nobody else is doing it.
+
+        Args:
+            wait (bool): wait for a first load another thread is running, instead of returning None
+
+        Returns:
+            Optional[str]: "load" if the index was never loaded, "refresh" if it is too old, or None
+        """
+        with self._lock:
+            while wait and self._refreshing and self._loaded_at is None:
+                self._finished.wait()
+            if self._refreshing:
+                return None
+            if self._loaded_at is None:
+                self._refreshing = True
+                return _LOAD
+            if time.monotonic() - self._loaded_at >= self.ttl:
+                self._refreshing = True
+                return _REFRESH
+            return None
+
+    def _finish(self, error: Optional[Exception]) -> None:
+        """Ends a load or refresh. A failed one is retried once ttl has passed, an interrupted one right away."""
+        with self._lock:
+            if error is not None:
+                self._loaded_at = time.monotonic()
+            self._refreshing = False
+            self._finished.notify_all()
+
+    def _after_fork(self) -> None:
+        """Forgets a refresh the parent process was running when it forked, the child doesn't have its thread."""
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+        self._refreshing = False
+        self._task = None
+        self._loading = None
+
+    def _refresh(self, client: "Client") -> None:
+        """Reloads the index with a sync client."""
+        error: Optional[Exception] = None
+        try:
+            self.update(client.get_checks())
+        except Exception as exc:
+            error = exc
+        finally:
+            # a cancelled or interrupted load is over too, the next lookup tries again
+            self._finish(error)
+
+    async def _arefresh(self, client: "AsyncClient") -> None:
+        """Reloads the index with an async client."""
+        error: Optional[Exception] = None
+        try:
+            self.update(await client.get_checks())
+        except Exception as exc:
+            error = exc
+        finally:
+            # a cancelled or interrupted load is over too, the next lookup tries again
+            self._finish(error)
+
+    def resolve(self, client: "Client", slug: str) -> str:
+        """Looks a slug up, loading the index first if it never was and refreshing it in a thread if it's old.
+
+        While another thread loads the index for the first time, it waits for that load.
+
+        Args:
+            client (Client): client to load the checks with
+            slug (str): Check's Slug
+
+        Raises:
+            NonUniqueSlugError: Raised if more than one check has this slug
+
+        Returns:
+            str: the check's uuid, or "" if the slug isn't in the index
+        """
+        due = self._due(wait=True)
+        if due == _LOAD:
+            self._refresh(client)
+        elif due == _REFRESH:
+            threading.Thread(target=self._refresh, args=(client,), daemon=True).start()
+        return self.lookup(slug)
+
+    async def aresolve(self, client: "AsyncClient", slug: str) -> str:
+        """Looks a slug up, loading the index first if it never was and refreshing it in a task if it's old.
+
+        While another task loads the index for the first time, it waits for that load.
+
+        Args:
+            client (AsyncClient): client to load the checks with
+            slug (str): Check's Slug
+
+        Raises:
+            NonUniqueSlugError: Raised if more than one check has this slug
+
+        Returns:
+            str: the check's uuid, or "" if the slug isn't in the index
+        """
+        while True:
+            loading = self._loading
+            due = self._due(wait=False)
+            if due == _LOAD:
+                # a task of its own, so the tasks waiting for it keep waiting if this one is cancelled
+                self._loading = asyncio.ensure_future(self._arefresh(client))
+                await asyncio.shield(self._loading)
+            elif due == _REFRESH:
+                # keep a reference, the event loop only holds tasks weakly
+                self._task = asyncio.ensure_future(self._arefresh(client))
+            elif loading is not None and not loading.done():
+                # wait without taking on the load's outcome, an interrupted load is claimed again by a waiter
+                await asyncio.wait([loading])
+                continue
+            return self.lookup(slug)
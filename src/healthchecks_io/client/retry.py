@@ -0,0 +1,134 @@
+"""Retry policy for requests that fail with a rate limit, a server error or a transport error."""
+
+import random
+from email.utils import parsedate_to_datetime
+from time import time
+from typing import Optional
+from typing import Sequence
+
+from httpx import ConnectError
+from httpx import ConnectTimeout
+from httpx import Response
+from httpx import TransportError
+
+DEFAULT_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """Decides if and when a failed request should be retried."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        deadline: Optional[float] = 30.0,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        retry_statuses: Sequence[int] = DEFAULT_RETRY_STATUSES,
+        retry_transport_errors: bool = True,
+        respect_retry_after: bool = True,
+    ) -> None:
+        """Decides if and when a failed request should be retried.
+
+        Delays use decorrelated jitter, each delay is picked at random between base_delay and three times the
+        previous delay, so clients that failed at the same moment don't retry in lockstep. A Retry-After header
+        on the response sets the minimum delay.
+
+        Requests that are not idempotent, like create_check without unique, are only retried when the server
+        can't have acted on them: a 429 response or a failure to connect.
+
+        Args:
+            max_attempts (int): total attempts, including the first one. Defaults to 3.
+            deadline (Optional[float]): seconds from the first attempt after which no retry is started.
+                Defaults to 30.0. None for no deadline.
+            base_delay (float): shortest delay between attempts in seconds. Defaults to 0.5.
+            max_delay (float): longest jittered delay between attempts in seconds. Defaults to 30.0.
+            retry_statuses (Sequence[int]): status codes to retry. Defaults to 429, 500, 502, 503 and 504.
+            retry_transport_errors (bool): retry on httpx transport errors. Defaults to True.
+            respect_retry_after (bool): wait at least as long as a response's Retry-After header. Defaults to True.
+
+        Raises:
+            ValueError: Raised if max_attempts is less than 1
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.deadline = deadline
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_transport_errors = retry_transport_errors
+        self.respect_retry_after = respect_retry_after
+
+    def should_retry_response(self, response: Response, idempotent: bool) -> bool:
+        """Should this response be retried?
+
+        Args:
+            response (Response): response to the last attempt
+            idempotent (bool): is it safe to send the request more than once
+
+        Returns:
+            bool: True if the request should be retried
+        """
+        if response.status_code not in self.retry_statuses:
+            return False
+        return idempotent or response.status_code == 429
+
+    def should_retry_error(self, error: TransportError, idempotent: bool) -> bool:
+        """Should this transport error be retried?
+
+        Args:
+            error (TransportError): error raised by the last attempt
+            idempotent (bool): is it safe to send the request more than once
+
+        Returns:
+            bool: True if the request should be retried
+        """
+        if not self.retry_transport_errors:
+            return False
+        return idempotent or isinstance(error, (ConnectError, ConnectTimeout))
+
+    def next_delay(
+        self, attempt: int, previous_delay: float, elapsed: float, response: Optional[Response] = None
+    ) -> Optional[float]:
+        """Seconds to wait before the next attempt.
+
+        Args:
+            attempt (int): number of attempts made so far
+            previous_delay (float): delay before the last attempt, 0 after the first attempt
+            elapsed (float): seconds since the first attempt started
+            response (Optional[Response]): response to the last attempt, if there was one
+
+        Returns:
+            Optional[float]: seconds to wait, or None if there should be no more attempts
+        """
+        if attempt >= self.max_attempts:
+            return None
+        delay = min(self.max_delay, random.uniform(self.base_delay, max(self.base_delay, previous_delay * 3)))  # noqa: S311
+        if response is not None and self.respect_retry_after:
+            retry_after = parse_retry_after(response.headers.get("retry-after"))
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+        if self.deadline is not None and elapsed + delay > self.deadline:
+            return None
+        return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header.
+
+    Args:
+        value (Optional[str]): header value, either seconds or an HTTP date
+
+    Returns:
+        Optional[float]: seconds to wait, or None if the header is missing or invalid
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,193 @@
+"""A durable on-disk spool for pings that could not be delivered."""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+SPOOLED = "spooled"
+
+SpoolEntry = Dict[str, Any]
+
+
+class PingSpool:
+    """An append-only file of pings to replay once Healthchecks.io is reachable again."""
+
+    def __init__(
+        self,
+        path: str,
+        fsync: str = "always",
+        fsync_interval: float = 1.0,
+        max_bytes: int = 10 * 1024 * 1024,
+    ) -> None:
+        """An append-only file of pings to replay once Healthchecks.io is reachable again.
+
+        Each ping is written as one json line. While a replay is running, the pings being replayed are moved
+        to path + ".replay" so a crash mid replay doesn't lose them.
+
+        Args:
+            path (str): path of the spool file
+            fsync (str): when to fsync the spool file, one of "always", "interval" or "never". Defaults to
+                "always".
+            fsync_interval (float): seconds between fsyncs with the "interval" policy. Defaults to 1.0.
+            max_bytes (int): largest the spool file may grow, pings that don't fit are not spooled.
+                Defaults to 10 MiB.
+
+        Raises:
+            ValueError: Raised if fsync is not a known policy
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_POLICIES)}")
+        self.path = path
+        self.replay_path = f"{path}.replay"
+        self._fsync = fsync
+        self._fsync_interval = fsync_interval
+        self._last_fsync = 0.0
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # set from take to finish_replay, so two replays never send the same pings
+        self._replaying = False
+
+    def append(self, uuid: str, slug: str, endpoint: str, data: str, rid: str = "") -> bool:
+        """Writes a ping to the spool.
+
+        Args:
+            uuid (str): Check's UUID
+            slug (str): Check's Slug
+            endpoint (str): ping endpoint, like "/start"
+            data (str): Text data sent with the ping
+            rid (str): run id of the ping. Defaults to "".
+
+        Returns:
+            bool: True if the ping was spooled, False if the spool is full
+        """
+        entry = {"uuid": uuid, "slug": slug, "endpoint": endpoint, "data": data, "rid": rid, "ts": time.time()}
+        line = json.dumps(entry)
+        encoded = f"{line}\n".encode()
+        with self._lock:
+            try:
+                size = os.path.getsize(self.path)
+            except FileNotFoundError:
+                size = 0
+            if size + len(encoded) > self._max_bytes:
+                return False
+            with open(self.path, "ab") as spool_file:
+                spool_file.write(encoded)
+                spool_file.flush()
+                self._maybe_fsync(spool_file.fileno())
+        return True
+
+    def _maybe_fsync(self, fileno: int) -> None:
+        """Fsyncs a file descriptor if the fsync policy says so."""
+        if self._fsync == "never":
+            return
+        now = time.monotonic()
+        if self._fsync == "always" or now - self._last_fsync >= self._fsync_interval:
+            os.fsync(fileno)
+            self._last_fsync = now
+
+    def __len__(self) -> int:
+        """Number of pings waiting in the spool, including any in an unfinished replay.
+
+        Returns:
+            int: spooled pings
+        """
+        with self._lock:
+            return len(_read_entries(self.replay_path)) + len(_read_entries(self.path))
+
+    def take(self) -> List[SpoolEntry]:
+        """Moves every spooled ping into the replay file and returns them, oldest first.
+
+        Pings left in the replay file by an earlier replay that never finished come first. Call finish_replay
+        with the pings that could not be delivered once the replay is done. Nothing is returned while another
+        replay is running, its pings are already being sent.
+
+        Returns:
+            List[SpoolEntry]: pings to replay, empty if there are none or another replay is running
+        """
+        with self._lock:
+            if self._replaying:
+                return list()
+            entries = _read_entries(self.replay_path) + _read_entries(self.path)
+            if entries:
+                _write_entries(self.replay_path, entries)
+                self._replaying = True
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            return entries
+
+    def finish_replay(self, remaining: List[SpoolEntry]) -> None:
+        """Puts pings that could not be replayed back in front of anything spooled during the replay.
+
+        Args:
+            remaining (List[SpoolEntry]): pings that still need to be delivered
+        """
+        with self._lock:
+            entries = remaining + _read_entries(self.path)
+            if entries:
+                _write_entries(self.path, entries)
+            elif os.path.exists(self.path):
+                os.unlink(self.path)
+            if os.path.exists(self.replay_path):
+                os.unlink(self.replay_path)
+            self._replaying = False
+
+
+def group_by_check(entries: List[SpoolEntry]) -> List[List[SpoolEntry]]:
+    """Groups spooled pings by check, keeping each check's pings in the order they were spooled.
+
+    Args:
+        entries (List[SpoolEntry]): spooled pings
+
+    Returns:
+        List[List[SpoolEntry]]: one list of pings per check
+    """
+    groups: "OrderedDict[Tuple[str, str], List[SpoolEntry]]" = OrderedDict()
+    for entry in entries:
+        groups.setdefault((entry["uuid"], entry["slug"]), list()).append(entry)
+    return list(groups.values())
+
+
+def _read_entries(path: str) -> List[SpoolEntry]:
+    """Reads spooled pings from a file, skipping a line torn by a crash.
+
+    Args:
+        path (str): spool file path
+
+    Returns:
+        List[SpoolEntry]: spooled pings
+    """
+    try:
+        with open(path, "rb") as spool_file:
+            lines = spool_file.read().splitlines()
+    except FileNotFoundError:
+        return list()
+    entries = list()
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue
+    return entries
+
+
+def _write_entries(path: str, entries: List[SpoolEntry]) -> None:
+    """Atomically replaces a spool file with the given pings.
+
+    Args:
+        path (str): spool file path
+        entries (List[SpoolEntry]): spooled pings
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as spool_file:
+        spool_file.write(b"".join(f"{json.dumps(entry)}\n".encode() for entry in entries))
+        spool_file.flush()
+        os.fsync(spool_file.fileno())
+    os.replace(temp_path, path)
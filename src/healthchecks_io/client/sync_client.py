@@ -1,21 +1,59 @@
 """An async healthchecks.io client."""
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from importlib.util import find_spec
+from itertools import repeat
 from types import TracebackType
+from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Sequence
 from typing import Tuple
 from typing import Type
+from typing import TYPE_CHECKING
+from typing import Union
 
+from httpx import BaseTransport
 from httpx import Client as HTTPXClient
+from httpx import Limits
+from httpx import Response
+from httpx import Timeout
+from httpx import TimeoutException
+from httpx import TransportError
 
 from ._abstract import AbstractClient
+from ._abstract import CIRCUIT_OPEN
+from ._abstract import DEFAULT_LIMITS
+from ._abstract import DEFAULT_TIMEOUT
+from ._abstract import H2_MISSING
+from ._deadline import Deadline
+from .circuit_breaker import CircuitBreaker
+from .events import RequestEvent
+from .exceptions import CircuitOpenError
+from .exceptions import DeadlineExceededError
+from .exceptions import HCAPIError
+from .rate_limit import TokenBucket
+from .resolver import SlugResolver
+from .retry import RetryPolicy
+from .spool import group_by_check
+from .spool import PingSpool
+from .spool import SpoolEntry
+from .throttle import PingThrottle
+from .throttle import THROTTLED
 from healthchecks_io import __version__ as client_version
-from healthchecks_io.schemas import badges
-from healthchecks_io.schemas import Check
-from healthchecks_io.schemas import CheckCreate
-from healthchecks_io.schemas import checks
-from healthchecks_io.schemas import integrations
+from healthchecks_io import schemas
+
+if TYPE_CHECKING:  # pragma: no cover
+    # the schemas import pydantic, croniter and pytz, api methods load them on first use
+    from healthchecks_io.schemas import badges
+    from healthchecks_io.schemas import Check
+    from healthchecks_io.schemas import CheckCreate
+    from healthchecks_io.schemas import checks
+    from healthchecks_io.schemas import integrations
 
 
 class Client(AbstractClient):
@@ -29,6 +67,25 @@ class Client(AbstractClient):
         ping_url: str = "https://hc-ping.com/",
         api_version: int = 1,
         client: Optional[HTTPXClient] = None,
+        ping_client: Optional[HTTPXClient] = None,
+        api_limits: Limits = DEFAULT_LIMITS,
+        ping_limits: Limits = DEFAULT_LIMITS,
+        api_timeout: Union[float, Timeout] = DEFAULT_TIMEOUT,
+        ping_timeout: Union[float, Timeout] = DEFAULT_TIMEOUT,
+        retry_policy: Optional[RetryPolicy] = None,
+        api_rate_limit: Optional[TokenBucket] = None,
+        ping_rate_limit: Optional[TokenBucket] = None,
+        spool: Optional[PingSpool] = None,
+        api_circuit_breaker: Optional[CircuitBreaker] = None,
+        ping_circuit_breaker: Optional[CircuitBreaker] = None,
+        default_timeout: Optional[float] = None,
+        ping_throttle: Optional[PingThrottle] = None,
+        slug_resolver: Optional[SlugResolver] = None,
+        api_transport: Optional[BaseTransport] = None,
+        ping_transport: Optional[BaseTransport] = None,
+        http2: bool = False,
+        api_max_streams: Optional[int] = None,
+        ping_max_streams: Optional[int] = None,
     ) -> None:
         """An AsyncClient can be used in code using asyncio to work with the Healthchecks.io api.
 
@@ -39,19 +96,565 @@ class Client(AbstractClient):
             ping_url (str): Ping API url. Defaults to "https://hc-ping.com/"
             api_version (int): Versiopn of the api to use. Defaults to 1.
             client (Optional[HTTPXClient], optional): A httpx.Client. If not
-                passed in, one will be created for this object. Defaults to None.
+                passed in, one is created by the first request. Defaults to None.
+            ping_client (Optional[HTTPXClient], optional): A httpx.Client used for pings. If not
+                passed in, pings share client when one is passed, otherwise a separate client that only
+                sends a user-agent header is created for them. Defaults to None.
+            api_limits (Limits): connection pool limits for the api client. Defaults to httpx's default limits.
+            ping_limits (Limits): connection pool limits for the ping client. Defaults to httpx's default limits.
+            api_timeout (Union[float, Timeout]): timeouts for the api client. Defaults to 5 seconds.
+            ping_timeout (Union[float, Timeout]): timeouts for the ping client. Defaults to 5 seconds.
+            retry_policy (Optional[RetryPolicy]): retry policy for pings and api requests. Defaults to None,
+                no retries.
+            api_rate_limit (Optional[TokenBucket]): rate limiter for management api requests. Defaults to None.
+            ping_rate_limit (Optional[TokenBucket]): rate limiter for pings. Defaults to None.
+            spool (Optional[PingSpool]): spool pings to this file when they fail with a transport error or a
+                5xx. Defaults to None.
+            api_circuit_breaker (Optional[CircuitBreaker]): circuit breaker for the management api host. While
+                it is open, api requests raise CircuitOpenError. Defaults to None.
+            ping_circuit_breaker (Optional[CircuitBreaker]): circuit breaker for the ping host. While it is
+                open, pings go to the spool, or return (False, "circuit open") without being sent. Defaults
+                to None.
+            default_timeout (Optional[float]): seconds a call may take, retries included, when it isn't passed
+                a timeout. Bounds connect, TLS, write and read of every attempt together, along with rate limit
+                waits and retry delays. Defaults to None, no limit beyond api_timeout and ping_timeout.
+            ping_throttle (Optional[PingThrottle]): coalesces success pings to about one per check per interval.
+                Success pings it holds back return (True, "throttled"), the newest one is sent when the interval
+                ends, or when the client is closed. Defaults to None.
+            slug_resolver (Optional[SlugResolver]): sends slug pings to the uuid of the check with that slug,
+                found in an index of get_checks, so they need no ping key and slugs shared by several checks
+                raise NonUniqueSlugError without a request. Needs an api key. Defaults to None.
+            api_transport (Optional[BaseTransport]): httpx transport for the api client it creates, like
+                HTTPClientTransport. api_limits don't apply to it. Defaults to None, httpx's own transport.
+            ping_transport (Optional[BaseTransport]): httpx transport for the ping client it creates, like
+                HTTPClientTransport. ping_limits don't apply to it. Defaults to None, httpx's own transport.
+            http2 (bool): use HTTP/2 with hosts that support it, so concurrent requests share a connection per
+                host as streams. Needs h2, installed with the http2 extra. Doesn't apply to passed in
+                clients and transports. Defaults to False.
+            api_max_streams (Optional[int]): most api requests in flight at once, the rest wait for a slot
+                within their call's deadline. Defaults to None, no limit beyond api_limits.
+            ping_max_streams (Optional[int]): most pings in flight at once, the rest wait for a slot within
+                their call's deadline. Defaults to None, no limit beyond ping_limits.
+
+        Raises:
+            ImportError: Raised when http2 is True and h2 isn't installed
         """
-        self._client: HTTPXClient = HTTPXClient() if client is None else client
+        if http2 and find_spec("h2") is None:
+            raise ImportError(H2_MISSING)
+        self._api_limits = api_limits
+        self._ping_limits = ping_limits
+        self._api_transport = api_transport
+        self._ping_transport = ping_transport
+        self._http2 = http2
+        self._api_max_streams = api_max_streams
+        self._ping_max_streams = ping_max_streams
+        self._api_timeout = api_timeout
+        self._ping_timeout = ping_timeout
+        # only clients created here are rebuilt after a fork, passed in ones are left to their owner
+        self._owns_client = client is None
+        self._owns_ping_client = ping_client is None and client is None
+        # the httpx clients are created on first use, a process that never sends a request doesn't build them
+        self._api_httpx: Optional[HTTPXClient] = client
+        self._ping_httpx: Optional[HTTPXClient] = client if ping_client is None else ping_client
+        self._closed = False
+        self._httpx_lock = threading.Lock()
+        # timers sending the success pings the throttle held back, by check
+        self._throttle_timers: Dict[Tuple[str, str], threading.Timer] = dict()
+        self._throttle_lock = threading.Lock()
+        self._new_streams()
         super().__init__(
             api_key=api_key,
             ping_key=ping_key,
             api_url=api_url,
             ping_url=ping_url,
             api_version=api_version,
+            retry_policy=retry_policy,
+            api_rate_limit=api_rate_limit,
+            ping_rate_limit=ping_rate_limit,
+            spool=spool,
+            api_circuit_breaker=api_circuit_breaker,
+            ping_circuit_breaker=ping_circuit_breaker,
+            default_timeout=default_timeout,
+            ping_throttle=ping_throttle,
+            slug_resolver=slug_resolver,
+        )
+        if client is not None:
+            self._set_api_headers(client)
+
+    @property
+    def _client(self) -> HTTPXClient:
+        """The httpx client for management api requests, created on first use.
+
+        Returns:
+            HTTPXClient: the httpx client
+        """
+        if self._api_httpx is None:
+            self._check_open()
+            with self._httpx_lock:
+                if self._api_httpx is None:
+                    self._api_httpx = self._new_api_client()
+        return self._api_httpx
+
+    @property
+    def _ping_client(self) -> HTTPXClient:
+        """The httpx client for pings, created on first use.
+
+        Returns:
+            HTTPXClient: the httpx client
+        """
+        if self._ping_httpx is None:
+            self._check_open()
+            with self._httpx_lock:
+                if self._ping_httpx is None:
+                    self._ping_httpx = self._new_ping_client()
+        return self._ping_httpx
+
+    def _check_open(self) -> None:
+        """Refuses to create httpx clients once the client is closed.
+
+        Raises:
+            RuntimeError: Raised when the client has been closed
+        """
+        if self._closed:
+            raise RuntimeError("Cannot send a request, as the client has been closed.")
+
+    def _set_api_headers(self, client: HTTPXClient) -> None:
+        """Sets the api key, user agent and content type headers of management api requests.
+
+        Args:
+            client (HTTPXClient): httpx client used for management api requests
+        """
+        client.headers["X-Api-Key"] = self._api_key
+        client.headers["user-agent"] = f"py-healthchecks.io/{client_version}"
+        client.headers["Content-type"] = "application/json"
+
+    def _new_api_client(self) -> HTTPXClient:
+        """Creates the httpx client used for management api requests.
+
+        Returns:
+            HTTPXClient: a new httpx client
+        """
+        api_client = HTTPXClient(
+            limits=self._api_limits, timeout=self._api_timeout, transport=self._api_transport, http2=self._http2
         )
-        self._client.headers["X-Api-Key"] = self._api_key
-        self._client.headers["user-agent"] = f"py-healthchecks.io/{client_version}"
-        self._client.headers["Content-type"] = "application/json"
+        self._set_api_headers(api_client)
+        return api_client
+
+    def _new_ping_client(self) -> HTTPXClient:
+        """Creates the httpx client used for pings.
+
+        Pings only send a user-agent header, they have no use for the api key or a content type.
+
+        Returns:
+            HTTPXClient: a new httpx client
+        """
+        ping_client = HTTPXClient(
+            limits=self._ping_limits, timeout=self._ping_timeout, transport=self._ping_transport, http2=self._http2
+        )
+        del ping_client.headers["accept"]
+        del ping_client.headers["accept-encoding"]
+        ping_client.headers["user-agent"] = f"py-healthchecks.io/{client_version}"
+        return ping_client
+
+    def _new_streams(self) -> None:
+        """Creates the semaphores that limit the api requests and pings in flight."""
+        self._api_streams: Optional[threading.BoundedSemaphore] = None
+        self._ping_streams: Optional[threading.BoundedSemaphore] = None
+        if self._api_max_streams is not None:
+            self._api_streams = threading.BoundedSemaphore(self._api_max_streams)
+        if self._ping_max_streams is not None:
+            self._ping_streams = threading.BoundedSemaphore(self._ping_max_streams)
+
+    @staticmethod
+    def _acquire_stream(streams: threading.BoundedSemaphore, deadline: Optional[Deadline], url: str) -> None:
+        """Waits for a slot for a request in flight.
+
+        Raises:
+            DeadlineExceededError: Raised when no slot frees up within the call's time budget
+        """
+        timeout = None if deadline is None else max(deadline.remaining(), 0.0)
+        if not streams.acquire(timeout=timeout) and deadline is not None:
+            raise deadline.exceeded(url)
+
+    def _after_fork(self) -> None:
+        """Drops the httpx clients created by this client, new ones are created on first use.
+
+        The inherited ones are dropped without being closed, their connections are still the parent's.
+        """
+        super()._after_fork()
+        self._httpx_lock = threading.Lock()
+        # the timers' threads are the parent's, the next held back ping starts one here
+        self._throttle_timers = dict()
+        self._throttle_lock = threading.Lock()
+        # slots held by the parent's requests in flight are never released here
+        self._new_streams()
+        if self._owns_client:
+            self._api_httpx = None
+        if self._owns_ping_client:
+            self._ping_httpx = None
+
+    def _api_request(
+        self,
+        operation: str,
+        method: str,
+        url: str,
+        idempotent: bool = True,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Response:
+        """Sends a management api request and checks its response.
+
+        Args:
+            operation (str): name of the client method making the request, for the listeners
+            method (str): http method
+            url (str): request url
+            idempotent (bool): is it safe to send the request more than once. Defaults to True.
+            timeout (Optional[float]): seconds the request may take, retries included. Defaults to None, the
+                client's default_timeout.
+            **kwargs (Any): passed on to httpx
+
+        Returns:
+            Response: the checked response
+        """
+        deadline = self._new_deadline(timeout)
+        with self._record(operation, False, method, url) as event:
+            return self.check_response(self._send(False, method, url, idempotent, deadline, event, **kwargs))
+
+    def _ping(
+        self,
+        operation: str,
+        uuid: str,
+        slug: str,
+        endpoint: str,
+        data: str,
+        timeout: Optional[float] = None,
+        rid: str = "",
+    ) -> Tuple[bool, str]:
+        """Sends a ping unless the ping throttle suppresses it, resolving a slug to a uuid first.
+
+        Pings with a run id are never throttled, each run's pings pair up on the server.
+
+        Args:
+            operation (str): name of the client method sending the ping, for the listeners
+            uuid (str): Check's UUID
+            slug (str): Check's Slug
+            endpoint (str): ping endpoint, like "/start"
+            data (str): Text data to append to this check
+            timeout (Optional[float]): seconds the ping may take, retries included. Defaults to None, the
+                client's default_timeout.
+            rid (str): run id, pairing a run's start ping with its finish ping. Defaults to "", none.
+
+        Raises:
+            NonUniqueSlugError: Raised if the slug resolver knows of more than one check with the slug
+
+        Returns:
+            Tuple[bool, str]: success (true or false) and the response text
+        """
+        if slug and not uuid and self._slug_resolver is not None:
+            uuid = self._slug_resolver.resolve(self, slug)
+            if uuid:
+                slug = ""
+        throttle = self._ping_throttle
+        if throttle is None or rid:
+            return self._deliver_ping(operation, uuid, slug, endpoint, data, timeout, rid)
+        if endpoint != "":
+            # a state change goes after the success held back before it
+            self._send_held_back(uuid, slug)
+        if throttle.suppress(uuid, slug, endpoint, data):
+            self._hold_back(uuid, slug)
+            return (True, THROTTLED)
+        try:
+            result = self._deliver_ping(operation, uuid, slug, endpoint, data, timeout)
+        except BaseException:
+            throttle.release(uuid, slug, endpoint)
+            raise
+        if not result[0]:
+            throttle.release(uuid, slug, endpoint)
+        return result
+
+    def _hold_back(self, uuid: str, slug: str) -> None:
+        """Starts a timer sending the success ping the throttle held back for a check when its interval ends.
+
+        Args:
+            uuid (str): Check's UUID
+            slug (str): Check's Slug
+        """
+        if self._ping_throttle is None:  # pragma: no cover
+            return
+        key = (uuid, slug)
+        with self._throttle_lock:
+            if key in self._throttle_timers or self._closed:
+                return
+            timer = threading.Timer(self._ping_throttle.pending_delay(uuid, slug), self._send_held_back_later, key)
+            timer.daemon = True
+            self._throttle_timers[key] = timer
+        timer.start()
+
+    def _send_held_back_later(self, uuid: str, slug: str) -> None:
+        """Sends a check's held back success ping from its timer.
+
+        Args:
+            uuid (str): Check's UUID
+            slug (str): Check's Slug
+        """
+        with self._throttle_lock:
+            self._throttle_timers.pop((uuid, slug), None)
+        self._send_held_back(uuid, slug)
+
+    def _send_held_back(self, uuid: str, slug: str) -> None:
+        """Sends the success ping the throttle held back for a check, if there is one.
+
+        Errors are ignored, nobody is waiting for the ping. If it fails, the check's next success is sent.
+
+        Args:
+            uuid (str): Check's UUID
+            slug (str): Check's Slug
+        """
+        throttle = self._ping_throttle
+        data = None if throttle is None else throttle.take_pending(uuid, slug)
+        if throttle is None or data is None:
+            return
+        try:
+            sent = self._deliver_ping("success_ping", uuid, slug, "", data, None)[0]
+        except Exception:
+            sent = False
+        if not sent:
+            throttle.release(uuid, slug, "")
+
+    def _deliver_ping(
+        self, operation: str, uuid: str, slug: str, endpoint: str, data: str, timeout: Optional[float], rid: str = ""
+    ) -> Tuple[bool, str]:
+        """Sends a ping and checks its response.
+
+        A ping that runs out of its timeout is not spooled, the server may have received it already.
+
+        Args:
+            operation (str): name of the client method sending the ping, for the listeners
+            uuid (str): Check's UUID
+            slug (str): Check's Slug
+            endpoint (str): ping endpoint, like "/start"
+            data (str): Text data to append to this check
+            timeout (Optional[float]): seconds the ping may take, retries included, or None for the client's
+                default_timeout
+            rid (str): run id, or "" for none. Defaults to "".
+
+        Returns:
+            Tuple[bool, str]: success (true or false) and the response text
+        """
+        ping_url = self._get_ping_url(uuid, slug, endpoint, rid)
+        deadline = self._new_deadline(timeout)
+        with self._record(operation, True, "POST", ping_url) as event:
+            try:
+                response = self._send(True, "POST", ping_url, True, deadline, event, content=data)
+            except (TransportError, CircuitOpenError) as exc:
+                if event is not None:
+                    event.exception = type(exc)
+                if self._spool_ping(uuid, slug, endpoint, data, rid):
+                    return self._spooled(event)
+                if isinstance(exc, CircuitOpenError):
+                    return (False, CIRCUIT_OPEN)
+                raise
+            if response.status_code >= 500 and self._spool_ping(uuid, slug, endpoint, data, rid):
+                return self._spooled(event)
+            response = self.check_ping_response(response)
+            return (True if response.status_code == 200 else False, response.text)
+
+    def _replay_check(self, entries: List[SpoolEntry], timeout: Optional[float]) -> Tuple[int, List[SpoolEntry]]:
+        """Replays one check's spooled pings in order, stopping at the first one that can't be delivered yet.
+
+        Args:
+            entries (List[SpoolEntry]): one check's spooled pings, oldest first
+            timeout (Optional[float]): seconds each ping may take, or None for the client's default_timeout
+
+        Returns:
+            Tuple[int, List[SpoolEntry]]: number of pings sent and the pings still to be delivered
+        """
+        sent = 0
+        for index, entry in enumerate(entries):
+            try:
+                # spools written before run ids have no rid. A slug ping spooled before the client lost its ping
+                # key can't be sent anymore, its BadAPIRequestError drops it below like a rejected ping.
+                ping_url = self._get_ping_url(entry["uuid"], entry["slug"], entry["endpoint"], entry.get("rid", ""))
+                with self._record("replay_spool", True, "POST", ping_url) as event:
+                    deadline = self._new_deadline(timeout)
+                    response = self._send(True, "POST", ping_url, True, deadline, event, content=entry["data"])
+                    self.check_ping_response(response)
+            except (TransportError, HCAPIError) as exc:
+                if self._is_transient_error(exc):
+                    return sent, entries[index:]
+                # the ping is rejected, retrying it won't help
+                continue
+            sent += 1
+        return sent, list()
+
+    def _request(
+        self,
+        client: HTTPXClient,
+        method: str,
+        url: str,
+        deadline: Optional[Deadline],
+        event: Optional[RequestEvent],
+        **kwargs: Any,
+    ) -> Response:
+        """Sends a request with httpx, holding it to the call's deadline and timing it for the call's event.
+
+        Args:
+            client (HTTPXClient): httpx client to send the request with
+            method (str): http method
+            url (str): request url
+            deadline (Optional[Deadline]): the call's deadline
+            event (Optional[RequestEvent]): the call's event, when listeners are registered
+            **kwargs (Any): passed on to httpx
+
+        Raises:
+            DeadlineExceededError: Raised when the request runs out of the call's time budget
+
+        Returns:
+            Response: the response
+        """
+        if deadline is None and event is None:
+            return client.request(method, url, **kwargs)
+        extensions: Dict[str, Any] = dict()
+        if deadline is not None:
+            deadline.check(url)
+            extensions = deadline.extensions(client.timeout)
+        if event is not None:
+            event.start_attempt()
+            extensions["trace"] = event.trace(extensions.get("trace"))
+        try:
+            if deadline is None:
+                response = client.request(method, url, extensions=extensions, **kwargs)
+            else:
+                request = client.build_request(method, url, extensions=extensions, **kwargs)
+                response = client.send(request, stream=True)
+                deadline.read(response, url)
+        except TimeoutException as exc:
+            if deadline is not None and deadline.caused(exc):
+                raise deadline.exceeded(url) from exc
+            raise
+        if event is not None:
+            event.record_response(response)
+        return response
+
+    def _attempt(
+        self,
+        ping: bool,
+        method: str,
+        url: str,
+        deadline: Optional[Deadline],
+        event: Optional[RequestEvent],
+        **kwargs: Any,
+    ) -> Response:
+        """Sends a single attempt of a request once the host's circuit breaker and rate limiter allow it.
+
+        Args:
+            ping (bool): True for a ping, False for a management api request
+            method (str): http method
+            url (str): request url
+            deadline (Optional[Deadline]): the call's deadline
+            event (Optional[RequestEvent]): the call's event, when listeners are registered
+            **kwargs (Any): passed on to httpx
+
+        Raises:
+            CircuitOpenError: Raised when the host's circuit breaker is open
+            DeadlineExceededError: Raised when the attempt can't finish within the call's time budget
+
+        Returns:
+            Response: the response
+        """
+        self._check_fork()
+        breaker = self._check_circuit(ping, url)
+        bucket = self._ping_rate_limit if ping else self._api_rate_limit
+        reserved = False
+        try:
+            if bucket is not None:
+                wait = bucket.reserve()
+                reserved = True
+                if wait > 0:
+                    if deadline is not None and wait >= deadline.remaining():
+                        raise deadline.exceeded(url)
+                    time.sleep(wait)
+            client = self._ping_client if ping else self._client
+            streams = self._ping_streams if ping else self._api_streams
+            if streams is not None:
+                self._acquire_stream(streams, deadline, url)
+        except BaseException:
+            # the request is never sent, so it can't record an outcome that would end a half-open probe, and
+            # its token goes back to the bucket instead of delaying the requests after it
+            if breaker is not None:
+                breaker.release_probe()
+            if reserved and bucket is not None:
+                bucket.refund()
+            raise
+        try:
+            if breaker is None:
+                return self._request(client, method, url, deadline, event, **kwargs)
+            try:
+                response = self._request(client, method, url, deadline, event, **kwargs)
+            except BaseException:
+                breaker.record_failure()
+                raise
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            return response
+        finally:
+            if streams is not None:
+                streams.release()
+
+    def _send(
+        self,
+        ping: bool,
+        method: str,
+        url: str,
+        idempotent: bool,
+        deadline: Optional[Deadline],
+        event: Optional[RequestEvent],
+        **kwargs: Any,
+    ) -> Response:
+        """Sends a request, retrying it as far as the retry policy and the call's deadline allow.
+
+        Args:
+            ping (bool): True for a ping, False for a management api request
+            method (str): http method
+            url (str): request url
+            idempotent (bool): is it safe to send the request more than once
+            deadline (Optional[Deadline]): the call's deadline
+            event (Optional[RequestEvent]): the call's event, when listeners are registered
+            **kwargs (Any): passed on to httpx
+
+        Raises:
+            TransportError: Raised when the last attempt failed with a transport error
+
+        Returns:
+            Response: response to the last attempt
+        """
+        policy = self._retry_policy
+        if policy is None:
+            return self._attempt(ping, method, url, deadline, event, **kwargs)
+
+        start = time.monotonic()
+        attempt = 1
+        delay: Optional[float] = 0.0
+        while True:
+            try:
+                response = self._attempt(ping, method, url, deadline, event, **kwargs)
+            except TransportError as exc:
+                if not policy.should_retry_error(exc, idempotent):
+                    raise
+                delay = policy.next_delay(attempt, delay or 0.0, time.monotonic() - start)
+                if delay is None or (deadline is not None and delay >= deadline.remaining()):
+                    raise
+            else:
+                if not policy.should_retry_response(response, idempotent):
+                    return response
+                delay = policy.next_delay(attempt, delay or 0.0, time.monotonic() - start, response)
+                if delay is None or (deadline is not None and delay >= deadline.remaining()):
+                    return response
+            self.retries += 1
+            time.sleep(delay)
+            attempt += 1
 
     def __enter__(self) -> "Client":
         """Context manager entrance.
@@ -71,33 +674,84 @@ class Client(AbstractClient):
         self._finalizer_method()
 
     def _finalizer_method(self) -> None:
-        """Closes the httpx client."""
-        self._client.close()
+        """Sends the success pings the throttle held back and closes the httpx clients that were created."""
+        with self._throttle_lock:
+            timers, self._throttle_timers = self._throttle_timers, dict()
+        for (uuid, slug), timer in timers.items():
+            timer.cancel()
+            self._send_held_back(uuid, slug)
+        self._closed = True
+        if self._api_httpx is not None:
+            self._api_httpx.close()
+        if self._ping_httpx is not None:
+            self._ping_httpx.close()
+
+    def prewarm(
+        self, ping: bool = True, api: Optional[bool] = None, timeout: Optional[float] = None
+    ) -> threading.Thread:
+        """Connects to the ping and api hosts from a background thread, ahead of the first request.
+
+        Resolves each host and opens a keep-alive connection to it, TLS handshake included, by sending a HEAD
+        request to the ping url and the api url. The first ping after startup then takes a single round trip.
+        Prewarming is best effort, errors are ignored and requests sent meanwhile open their own connections.
+        Closing the client stops it.
+
+        Args:
+            ping (bool): connect to the ping host. Defaults to True.
+            api (Optional[bool]): connect to the api host. Defaults to None, only if the client has an api key.
+            timeout (Optional[float]): seconds the prewarm may take. Defaults to None, the client's default_timeout.
+
+        Returns:
+            threading.Thread: the started thread, join it to wait for the connections
+        """
+        thread = threading.Thread(
+            target=self._prewarm,
+            args=(self._prewarm_targets(ping, api), self._new_deadline(timeout)),
+            name="healthchecks-io-prewarm",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def _prewarm(self, targets: List[Tuple[bool, str]], deadline: Optional[Deadline]) -> None:
+        """Sends the prewarm requests.
 
-    def get_checks(self, tags: Optional[List[str]] = None) -> List[checks.Check]:
+        Args:
+            targets (List[Tuple[bool, str]]): True for the ping client or False for the api one, and the url
+            deadline (Optional[Deadline]): the prewarm's deadline
+        """
+        self._check_fork()
+        for ping, url in targets:
+            if self._closed:
+                return
+            # a RuntimeError means the client was closed while the request was being sent
+            with suppress(TransportError, DeadlineExceededError, RuntimeError):
+                self._request(self._ping_client if ping else self._client, "HEAD", url, deadline, None)
+
+    def get_checks(self, tags: Optional[List[str]] = None, timeout: Optional[float] = None) -> "List[checks.Check]":
         """Get a list of checks from the healthchecks api.
 
         Args:
             tags (Optional[List[str]], optional): Filters the checks and returns only
                 the checks that are tagged with the specified value. Defaults to None.
+            timeout (Optional[float]): seconds the whole call may take, retries included. Defaults to None, the
+                client's default_timeout.
 
         Raises:
             HCAPIAuthError: When the API returns a 401, indicates an api key issue
             HCAPIError: When the API returns anything other than a 200 or 401
+            DeadlineExceededError: Raised when the call runs out of its timeout
 
         Returns:
             List[checks.Check]: [description]
         """
-        request_url = self._get_api_request_url("checks/")
-        if tags is not None:
-            for tag in tags:
-                request_url = self._add_url_params(request_url, {"tag": tag}, replace=False)
+        request_url = self._get_api_request_url("checks/", None if tags is None else [("tag", tag) for tag in tags])
 
-        response = self.check_response(self._client.get(request_url))
+        response = self._api_request("get_checks", "GET", request_url, timeout=timeout)
 
-        return [checks.Check.from_api_result(check_data) for check_data in response.json()["checks"]]
+        return [schemas.Check.from_api_result(check_data) for check_data in response.json()["checks"]]
 
-    def get_check(self, check_id: str) -> checks.Check:
+    def get_check(self, check_id: str, timeout: Optional[float] = None) -> "checks.Check":
         """Get a single check by id.
 
         check_id can either be a check uuid if using a read/write api key
@@ -105,6 +759,8 @@ class Client(AbstractClient):
 
         Args:
             check_id (str): check's uuid or unique id
+            timeout (Optional[float]): seconds the whole call may take, retries included. Defaults to None, the
+                client's default_timeout.
 
         Returns:
             checks.Check: the check
@@ -113,13 +769,14 @@ class Client(AbstractClient):
             HCAPIAuthError: Raised when status_code == 401 or 403
             HCAPIError: Raised when status_code is 5xx
             CheckNotFoundError: Raised when status_code is 404
+            DeadlineExceededError: Raised when the call runs out of its timeout
 
         """
         request_url = self._get_api_request_url(f"checks/{check_id}")
-        response = self.check_response(self._client.get(request_url))
-        return checks.Check.from_api_result(response.json())
+        response = self._api_request("get_check", "GET", request_url, timeout=timeout)
+        return schemas.Check.from_api_result(response.json())
 
-    def create_check(self, new_check: CheckCreate) -> Check:
+    def create_check(self, new_check: "CheckCreate", timeout: Optional[float] = None) -> "Check":
         """Creates a new check and returns it.
 
         With this API call, you can create both Simple and Cron checks:
@@ -128,15 +785,27 @@ class Client(AbstractClient):
 
         Args:
             new_check (CheckCreate): New check you are wanting to create
+            timeout (Optional[float]): seconds the whole call may take, retries included. Defaults to None, the
+                client's default_timeout.
+
+        Raises:
+            DeadlineExceededError: Raised when the call runs out of its timeout
 
         Returns:
             Check: check that was just created
         """
         request_url = self._get_api_request_url("checks/")
-        response = self.check_response(self._client.post(request_url, json=new_check.dict(exclude_none=True)))
-        return Check.from_api_result(response.json())
+        response = self._api_request(
+            "create_check",
+            "POST",
+            request_url,
+            idempotent=bool(new_check.unique),
+            json=new_check.dict(exclude_none=True),
+            timeout=timeout,
+        )
+        return schemas.Check.from_api_result(response.json())
 
-    def update_check(self, uuid: str, update_check: CheckCreate) -> Check:
+    def update_check(self, uuid: str, update_check: "CheckCreate", timeout: Optional[float] = None) -> "Check":
         """Updates an existing check.
 
         If you omit any parameter in update_check, Healthchecks.io will leave
@@ -151,20 +820,26 @@ class Client(AbstractClient):
         Args:
             uuid (str): UUID for the check to update
             update_check (CheckCreate): Check values you want to update
+            timeout (Optional[float]): seconds the whole call may take, retries included. Defaults to None, the
+                client's default_timeout.
+
+        Raises:
+            DeadlineExceededError: Raised when the call runs out of its timeout
 
         Returns:
             Check: check that was just updated
         """
         request_url = self._get_api_request_url(f"checks/{uuid}")
-        response = self.check_response(
-            self._client.post(
-                request_url,
-                json=update_check.dict(exclude_unset=True, exclude_none=True),
-            )
+        response = self._api_request(
+            "update_check",
+            "POST",
+            request_url,
+            json=update_check.dict(exclude_unset=True, exclude_none=True),
+            timeout=timeout,
         )
-        return Check.from_api_result(response.json())
+        return schemas.Check.from_api_result(response.json())
 
-    def pause_check(self, check_id: str) -> checks.Check:
+    def pause_check(self, check_id: str, timeout: Optional[float] = None) -> "checks.Check":
         """Disables monitoring for a check without removing it.
 
         The check goes into a "paused" state.
@@ -174,6 +849,8 @@ class Client(AbstractClient):
 
         Args:
             check_id (str): check's uuid
+            timeout (Optional[float]): seconds the whole call may take, retries included. Defaults to None, the
+                client's default_timeout.
 
         Returns:
             checks.Check: the check just paused
@@ -182,19 +859,22 @@ class Client(AbstractClient):
             HCAPIAuthError: Raised when status_code == 401 or 403
             HCAPIError: Raised when status_code is 5xx
             CheckNotFoundError: Raised when status_code is 404
+            DeadlineExceededError: Raised when the call runs out of its timeout
 
         """
         request_url = self._get_api_request_url(f"checks/{check_id}/pause")
-        response = self.check_response(self._client.post(request_url, data={}))
-        return checks.Check.from_api_result(response.json())
+        response = self._api_request("pause_check", "POST", request_url, data={}, timeout=timeout)
+        return schemas.Check.from_api_result(response.json())
 
-    def delete_check(self, check_id: str) -> checks.Check:
+    def delete_check(self, check_id: str, timeout: Optional[float] = None) -> "checks.Check":
         """Permanently deletes the check from the user's account.
 
         check_id must be a uuid, not a unique id
 
         Args:
             check_id (str): check's uuid
+            timeout (Optional[float]): seconds the whole call may take, retries included. Defaults to None, the
+                client's default_timeout.
 
         Returns:
             checks.Check: the check just deleted
@@ -203,13 +883,14 @@ class Client(AbstractClient):
             HCAPIAuthError: Raised when status_code == 401 or 403
             HCAPIError: Raised when status_code is 5xx
             CheckNotFoundError: Raised when status_code is 404
+            DeadlineExceededError: Raised when the call runs out of its timeout
 
         """
         request_url = self._get_api_request_url(f"checks/{check_id}")
-        response = self.check_response(self._client.delete(request_url))
-        return checks.Check.from_api_result(response.json())
+        response = self._api_request("delete_check", "DELETE", request_url, timeout=timeout)
+        return schemas.Check.from_api_result(response.json())
 
-    def get_check_pings(self, check_id: str) -> List[checks.CheckPings]:
+    def get_check_pings(self, check_id: str, timeout: Optional[float] = None) -> "List[checks.CheckPings]":
         """Returns a list of pings this check has received.
 
         This endpoint returns pings in reverse order (most recent first),
@@ -218,6 +899,8 @@ class Client(AbstractClient):
 
         Args:
             check_id (str): check's uuid
+            timeout (Optional[float]): seconds the whole call may take, retries included. Defaults to None, the
+                client's default_timeout.
 
         Returns:
             List[checks.CheckPings]: list of pings this check has received
@@ -226,11 +909,12 @@ class Client(AbstractClient):
             HCAPIAuthError: Raised when status_code == 401 or 403
             HCAPIError: Raised when status_code is 5xx
             CheckNotFoundError: Raised when status_code is 404
+            DeadlineExceededError: Raised when the call runs out of its timeout
 
         """
         request_url = self._get_api_request_url(f"checks/{check_id}/pings/")
-        response = self.check_response(self._client.get(request_url))
-        return [checks.CheckPings.from_api_result(check_data) for check_data in response.json()["pings"]]
+        response = self._api_request("get_check_pings", "GET", request_url, timeout=timeout)
+        return [schemas.CheckPings.from_api_result(check_data) for check_data in response.json()["pings"]]
 
     def get_check_flips(
         self,
@@ -238,7 +922,8 @@ class Client(AbstractClient):
         seconds: Optional[int] = None,
         start: Optional[int] = None,
         end: Optional[int] = None,
-    ) -> List[checks.CheckStatuses]:
+        timeout: Optional[float] = None,
+    ) -> "List[checks.CheckStatuses]":
         """Returns a list of "flips" this check has experienced.
 
         A flip is a change of status (from "down" to "up," or from "up" to "down").
@@ -248,6 +933,7 @@ class Client(AbstractClient):
             HCAPIError: Raised when status_code is 5xx
             CheckNotFoundError: Raised when status_code is 404
             BadAPIRequestError: Raised when status_code is 400
+            DeadlineExceededError: Raised when the call runs out of its timeout
 
         Args:
             check_id (str): check uuid
@@ -256,6 +942,8 @@ class Client(AbstractClient):
                 Defaults to None.
             end (Optional[int], optional): Returns flips that are older than the specified UNIX timestamp.
                 Defaults to None.
+            timeout (Optional[float]): seconds the whole call may take, retries included. Defaults to None, the
+                client's default_timeout.
 
         Returns:
             List[checks.CheckStatuses]: List of status flips for this check
@@ -270,28 +958,32 @@ class Client(AbstractClient):
             params["end"] = end
 
         request_url = self._get_api_request_url(f"checks/{check_id}/flips/", params)
-        response = self.check_response(self._client.get(request_url))
-        return [checks.CheckStatuses(**status_data) for status_data in response.json()]
+        response = self._api_request("get_check_flips", "GET", request_url, timeout=timeout)
+        return [schemas.CheckStatuses(**status_data) for status_data in response.json()]
 
-    def get_integrations(self) -> List[Optional[integrations.Integration]]:
+    def get_integrations(self, timeout: Optional[float] = None) -> "List[Optional[integrations.Integration]]":
         """Returns a list of integrations belonging to the project.
 
+        Args:
+            timeout (Optional[float]): seconds the whole call may take, retries included. Defaults to None, the
+                client's default_timeout.
+
         Raises:
             HCAPIAuthError: Raised when status_code == 401 or 403
             HCAPIError: Raised when status_code is 5xx
+            DeadlineExceededError: Raised when the call runs out of its timeout
 
         Returns:
             List[Optional[integrations.Integration]]: List of integrations for the project
 
         """
         request_url = self._get_api_request_url("channels/")
-        response = self.check_response(self._client.get(request_url))
+        response = self._api_request("get_integrations", "GET", request_url, timeout=timeout)
         return [
-            integrations.Integration.from_api_result(integration_dict)
-            for integration_dict in response.json()["channels"]
+            schemas.Integration.from_api_result(integration_dict) for integration_dict in response.json()["channels"]
         ]
 
-    def get_badges(self) -> Dict[str, badges.Badges]:
+    def get_badges(self, timeout: Optional[float] = None) -> "Dict[str, badges.Badges]":
         """Returns a dict of all tags in the project, with badge URLs for each tag.
 
         Healthchecks.io provides badges in a few different formats:
@@ -308,18 +1000,25 @@ class Client(AbstractClient):
         The response includes a special * entry: this pseudo-tag reports the overal status
         of all checks in the project.
 
+        Args:
+            timeout (Optional[float]): seconds the whole call may take, retries included. Defaults to None, the
+                client's default_timeout.
+
         Raises:
             HCAPIAuthError: Raised when status_code == 401 or 403
             HCAPIError: Raised when status_code is 5xx
+            DeadlineExceededError: Raised when the call runs out of its timeout
 
         Returns:
             Dict[str, badges.Badges]: Dictionary of all tags in the project with badges
         """
         request_url = self._get_api_request_url("badges/")
-        response = self.check_response(self._client.get(request_url))
-        return {key: badges.Badges.from_api_result(item) for key, item in response.json()["badges"].items()}
+        response = self._api_request("get_badges", "GET", request_url, timeout=timeout)
+        return {key: schemas.Badges.from_api_result(item) for key, item in response.json()["badges"].items()}
 
-    def success_ping(self, uuid: str = "", slug: str = "", data: str = "") -> Tuple[bool, str]:
+    def success_ping(
+        self, uuid: str = "", slug: str = "", data: str = "", timeout: Optional[float] = None, rid: str = ""
+    ) -> Tuple[bool, str]:
         """Signals to Healthchecks.io that a job has completed successfully.
 
         Can also be used to indicate a continuously running process is still running and healthy.
@@ -336,6 +1035,10 @@ class Client(AbstractClient):
             uuid (str): Check's UUID. Defaults to "".
             slug (str): Check's Slug. Defaults to "".
             data (str): Text data to append to this check. Defaults to ""
+            timeout (Optional[float]): seconds the whole call may take, retries included. Defaults to None, the
+                client's default_timeout.
+            rid (str): run id, pairing the start and finish pings of one run when runs of the check overlap.
+                Healthchecks.io expects a uuid. Defaults to "", none.
 
         Raises:
             HCAPIAuthError: Raised when status_code == 401 or 403
@@ -345,15 +1048,16 @@ class Client(AbstractClient):
                 pinging by a slug and do not have a ping key set
             HCAPIRateLimitError: Raised when status code is 429 or response text has "rate limited" in it
             NonUniqueSlugError: Raused when status code is 409.
+            DeadlineExceededError: Raised when the call runs out of its timeout
 
         Returns:
             Tuple[bool, str]: success (true or false) and the response text
         """
-        ping_url = self._get_ping_url(uuid, slug, "")
-        response = self.check_ping_response(self._client.post(ping_url, content=data))
-        return (True if response.status_code == 200 else False, response.text)
+        return self._ping("success_ping", uuid, slug, "", data, timeout, rid)
 
-    def start_ping(self, uuid: str = "", slug: str = "", data: str = "") -> Tuple[bool, str]:
+    def start_ping(
+        self, uuid: str = "", slug: str = "", data: str = "", timeout: Optional[float] = None, rid: str = ""
+    ) -> Tuple[bool, str]:
         """Sends a "job has started!" message to Healthchecks.io.
 
         Sending a "start" signal is optional, but it enables a few extra features:
@@ -372,6 +1076,10 @@ class Client(AbstractClient):
             uuid (str): Check's UUID. Defaults to "".
             slug (str): Check's Slug. Defaults to "".
             data (str): Text data to append to this check. Defaults to ""
+            timeout (Optional[float]): seconds the whole call may take, retries included. Defaults to None, the
+                client's default_timeout.
+            rid (str): run id, pairing the start and finish pings of one run when runs of the check overlap.
+                Healthchecks.io expects a uuid. Defaults to "", none.
 
         Raises:
             HCAPIAuthError: Raised when status_code == 401 or 403
@@ -381,15 +1089,16 @@ class Client(AbstractClient):
                 pinging by a slug and do not have a ping key set
             HCAPIRateLimitError: Raised when status code is 429 or response text has "rate limited" in it
             NonUniqueSlugError: Raused when status code is 409.
+            DeadlineExceededError: Raised when the call runs out of its timeout
 
         Returns:
             Tuple[bool, str]: success (true or false) and the response text
         """
-        ping_url = self._get_ping_url(uuid, slug, "/start")
-        response = self.check_ping_response(self._client.post(ping_url, content=data))
-        return (True if response.status_code == 200 else False, response.text)
+        return self._ping("start_ping", uuid, slug, "/start", data, timeout, rid)
 
-    def fail_ping(self, uuid: str = "", slug: str = "", data: str = "") -> Tuple[bool, str]:
+    def fail_ping(
+        self, uuid: str = "", slug: str = "", data: str = "", timeout: Optional[float] = None, rid: str = ""
+    ) -> Tuple[bool, str]:
         """Signals to Healthchecks.io that the job has failed.
 
         Actively signaling a failure minimizes the delay from your monitored service failing to you receiving an alert.
@@ -406,6 +1115,10 @@ class Client(AbstractClient):
             uuid (str): Check's UUID. Defaults to "".
             slug (str): Check's Slug. Defaults to "".
             data (str): Text data to append to this check. Defaults to ""
+            timeout (Optional[float]): seconds the whole call may take, retries included. Defaults to None, the
+                client's default_timeout.
+            rid (str): run id, pairing the start and finish pings of one run when runs of the check overlap.
+                Healthchecks.io expects a uuid. Defaults to "", none.
 
         Raises:
             HCAPIAuthError: Raised when status_code == 401 or 403
@@ -415,15 +1128,22 @@ class Client(AbstractClient):
                 pinging by a slug and do not have a ping key set
             HCAPIRateLimitError: Raised when status code is 429 or response text has "rate limited" in it
             NonUniqueSlugError: Raused when status code is 409.
+            DeadlineExceededError: Raised when the call runs out of its timeout
 
         Returns:
             Tuple[bool, str]: success (true or false) and the response text
         """
-        ping_url = self._get_ping_url(uuid, slug, "/fail")
-        response = self.check_ping_response(self._client.post(ping_url, content=data))
-        return (True if response.status_code == 200 else False, response.text)
+        return self._ping("fail_ping", uuid, slug, "/fail", data, timeout, rid)
 
-    def exit_code_ping(self, exit_code: int, uuid: str = "", slug: str = "", data: str = "") -> Tuple[bool, str]:
+    def exit_code_ping(
+        self,
+        exit_code: int,
+        uuid: str = "",
+        slug: str = "",
+        data: str = "",
+        timeout: Optional[float] = None,
+        rid: str = "",
+    ) -> Tuple[bool, str]:
         """Signals to Healthchecks.io that the job has failed.
 
         Actively signaling a failure minimizes the delay from your monitored service failing to you receiving an alert.
@@ -441,6 +1161,10 @@ class Client(AbstractClient):
             uuid (str): Check's UUID. Defaults to "".
             slug (str): Check's Slug. Defaults to "".
             data (str): Text data to append to this check. Defaults to ""
+            timeout (Optional[float]): seconds the whole call may take, retries included. Defaults to None, the
+                client's default_timeout.
+            rid (str): run id, pairing the start and finish pings of one run when runs of the check overlap.
+                Healthchecks.io expects a uuid. Defaults to "", none.
 
         Raises:
             HCAPIAuthError: Raised when status_code == 401 or 403
@@ -450,10 +1174,92 @@ class Client(AbstractClient):
                 pinging by a slug and do not have a ping key set
             HCAPIRateLimitError: Raised when status code is 429 or response text has "rate limited" in it
             NonUniqueSlugError: Raused when status code is 409.
+            DeadlineExceededError: Raised when the call runs out of its timeout
 
         Returns:
             Tuple[bool, str]: success (true or false) and the response text
         """
-        ping_url = self._get_ping_url(uuid, slug, f"/{exit_code}")
-        response = self.check_ping_response(self._client.post(ping_url, content=data))
-        return (True if response.status_code == 200 else False, response.text)
+        return self._ping("exit_code_ping", uuid, slug, f"/{exit_code}", data, timeout, rid)
+
+    def ping_many(
+        self,
+        uuids: Sequence[str] = (),
+        slugs: Sequence[str] = (),
+        kind: str = "success",
+        exit_code: Optional[int] = None,
+        data: str = "",
+        concurrency: int = 8,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Union[Tuple[bool, str], Exception]]:
+        """Sends the same ping to many checks at once.
+
+        One check's ping failing doesn't stop the others, its result is the exception it raised instead.
+
+        Args:
+            uuids (Sequence[str]): UUIDs of the checks to ping. Defaults to ().
+            slugs (Sequence[str]): Slugs of the checks to ping. Defaults to ().
+            kind (str): kind of ping, one of "success", "start", "fail" or "exit_code". Defaults to "success".
+            exit_code (Optional[int]): exit code to send with an exit_code ping. Defaults to None.
+            data (str): Text data to append to every check. Defaults to "".
+            concurrency (int): number of pings sent at once. Defaults to 8.
+            timeout (Optional[float]): seconds each ping may take, retries included. Defaults to None, the
+                client's default_timeout.
+
+        Raises:
+            ValueError: Raised if the kind is unknown, an exit_code ping has no exit code, or a check's uuid or slug
+                is given more than once
+
+        Returns:
+            Dict[str, Union[Tuple[bool, str], Exception]]: each check's uuid or slug, mapped to its ping's success
+                and response text, or to the exception it raised
+        """
+        endpoint = self._ping_many_endpoint(kind, exit_code)
+        targets = self._ping_many_targets(uuids, slugs)
+
+        def ping(target: Tuple[str, str]) -> Union[Tuple[bool, str], Exception]:
+            try:
+                return self._ping(f"{kind}_ping", target[0], target[1], endpoint, data, timeout)
+            except Exception as exc:
+                return exc
+
+        if not targets:
+            return dict()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(ping, targets))
+        return {uuid or slug: result for (uuid, slug), result in zip(targets, results)}
+
+    def replay_spool(self, concurrency: int = 4, timeout: Optional[float] = None) -> Tuple[int, int]:
+        """Sends the pings waiting in the spool.
+
+        Each check's pings are sent in the order they were spooled, with up to concurrency checks replayed at
+        once. A check's replay stops at the first ping that fails with a transport error, 5xx or rate limit;
+        that ping and the ones after it stay in the spool. Pings the server rejects, like pings for a check
+        that no longer exists, are dropped.
+
+        Args:
+            concurrency (int): number of checks replayed at once. Defaults to 4.
+            timeout (Optional[float]): seconds each ping may take, retries included. A ping that runs out of it
+                stays in the spool. Defaults to None, the client's default_timeout.
+
+        Returns:
+            Tuple[int, int]: number of pings sent and number of pings still in the spool
+        """
+        if self._spool is None:
+            return (0, 0)
+        entries = self._spool.take()
+        if not entries:
+            # the spool is empty, or another replay is sending its pings
+            return (0, len(self._spool))
+        sent = 0
+        remaining: List[SpoolEntry] = list()
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                checks = executor.map(self._replay_check, group_by_check(entries), repeat(timeout))
+                for check_sent, check_remaining in checks:
+                    sent += check_sent
+                    remaining.extend(check_remaining)
+        except BaseException:
+            self._spool.finish_replay(entries)
+            raise
+        self._spool.finish_replay(remaining)
+        return (sent, len(remaining))
@@ -0,0 +1,141 @@
+"""Throttling of success pings from high frequency heartbeat loops."""
+
+import threading
+import time
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+# response text of a success ping that was not sent because one was sent for the check within the interval
+THROTTLED = "throttled"
+
+
+class PingThrottle:
+    """Coalesces a check's success pings to about one per interval, passing every other ping straight through."""
+
+    def __init__(self, interval: float) -> None:
+        """Coalesces a check's success pings to about one per interval, passing every other ping straight through.
+
+        A success ping is only held back when the last ping sent for the check was a success, less than interval
+        seconds ago, and the ping method returns (True, "throttled"). The newest success held back, with its
+        data, is sent when the interval ends, so the server's last ping is never more than an interval behind.
+        Any ping that changes the check's state is sent: start, fail and exit code pings always are, after the
+        success held back for the check if there is one, and so is the first success after one of them. If a
+        ping fails, the next one is sent too. A client sends the successes it holds back when it's closed.
+
+        Args:
+            interval (float): seconds between success pings sent for a check
+
+        Raises:
+            ValueError: Raised if interval is not positive
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.interval = interval
+        # endpoint and time of the last ping sent for each check
+        self._last_sent: Dict[Tuple[str, str], Tuple[str, float]] = dict()
+        self._suppressed: Dict[Tuple[str, str], int] = dict()
+        # data of the newest success held back for each check
+        self._pending: Dict[Tuple[str, str], str] = dict()
+        self._lock = threading.Lock()
+
+    @property
+    def suppressed(self) -> int:
+        """Number of success pings not sent, for every check.
+
+        Returns:
+            int: suppressed pings
+        """
+        with self._lock:
+            return sum(self._suppressed.values())
+
+    def suppressed_for(self, uuid: str = "", slug: str = "") -> int:
+        """Number of success pings not sent for a check.
+
+        Args:
+            uuid (str): Check's UUID. Defaults to "".
+            slug (str): Check's Slug. Defaults to "".
+
+        Returns:
+            int: suppressed pings
+        """
+        with self._lock:
+            return self._suppressed.get((uuid, slug), 0)
+
+    def suppress(self, uuid: str, slug: str, endpoint: str, data: str = "") -> bool:
+        """Decides if a ping should be held back.
+
+        Only a success ping following a success ping sent within the interval is, and it replaces the success
+        held back for the check before it. Every other ping is sent and becomes the check's last one, a success
+        sent drops the one held back, it's newer.
+
+        Args:
+            uuid (str): Check's UUID
+            slug (str): Check's Slug
+            endpoint (str): ping endpoint, "" for a success ping
+            data (str): Text data sent with the ping. Defaults to "".
+
+        Returns:
+            bool: True if the ping should not be sent now
+        """
+        key = (uuid, slug)
+        now = time.monotonic()
+        with self._lock:
+            last_sent = self._last_sent.get(key)
+            if endpoint == "" and last_sent is not None and last_sent[0] == "" and now - last_sent[1] < self.interval:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                self._pending[key] = data
+                return True
+            if endpoint == "":
+                self._pending.pop(key, None)
+            self._last_sent[key] = (endpoint, now)
+            return False
+
+    def take_pending(self, uuid: str, slug: str) -> Optional[str]:
+        """Takes the success held back for a check, to send it. It becomes the check's last ping.
+
+        Args:
+            uuid (str): Check's UUID
+            slug (str): Check's Slug
+
+        Returns:
+            Optional[str]: the held back ping's data, or None if there's none
+        """
+        key = (uuid, slug)
+        with self._lock:
+            data = self._pending.pop(key, None)
+            if data is not None:
+                self._last_sent[key] = ("", time.monotonic())
+            return data
+
+    def pending_delay(self, uuid: str, slug: str) -> float:
+        """Seconds until the interval of the success a check last sent ends, when its held back one is due.
+
+        Args:
+            uuid (str): Check's UUID
+            slug (str): Check's Slug
+
+        Returns:
+            float: seconds, 0 if the interval has ended
+        """
+        with self._lock:
+            last_sent = self._last_sent.get((uuid, slug))
+            if last_sent is None:
+                return 0.0
+            return max(0.0, self.interval - (time.monotonic() - last_sent[1]))
+
+    def release(self, uuid: str, slug: str, endpoint: str) -> None:
+        """Forgets a ping that failed, so the next ping for the check is sent.
+
+        A ping of another kind sent since is kept, it is the check's last state.
+
+        Args:
+            uuid (str): Check's UUID
+            slug (str): Check's Slug
+            endpoint (str): ping endpoint, "" for a success ping
+        """
+        key = (uuid, slug)
+        with self._lock:
+            last_sent = self._last_sent.get(key)
+            if last_sent is not None and last_sent[0] == endpoint:
+                del self._last_sent[key]
@@ -0,0 +1,376 @@
+"""httpx transports that send requests without httpcore, for clients that send many small pings.
+
+httpx's default transport is the general purpose one, with HTTP/2, proxies and streaming. The transports here only
+speak HTTP/1.1 with keep-alive and read whole responses, which is all a ping needs:
+
+* HTTPClientTransport sends requests with http.client from the standard library, for Client
+* AsyncStreamTransport writes requests to asyncio streams, for AsyncClient
+
+Both raise httpx's own exceptions, so retries, spooling and circuit breakers work the same with them. They read the
+connect and read timeouts of each request as it starts, and don't call trace callbacks, so request events have no
+phase timings. Requests with streaming bodies are not supported.
+"""
+
+import asyncio
+import http.client
+import os
+import socket
+import ssl
+import threading
+from contextlib import suppress
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from httpx import AsyncBaseTransport
+from httpx import BaseTransport
+from httpx import ConnectError
+from httpx import ConnectTimeout
+from httpx import ReadError
+from httpx import ReadTimeout
+from httpx import Request
+from httpx import Response
+
+# idle keep-alive connections kept per host
+DEFAULT_MAX_IDLE_CONNECTIONS = 10
+
+# errors of a request sent on a keep-alive connection the server closed while it was idle
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# scheme, host and port of a connection
+_PoolKey = Tuple[str, str, int]
+_Stream = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+def _pool_key(request: Request) -> _PoolKey:
+    """The scheme, host and port a request is sent to."""
+    url = request.url
+    return url.scheme, url.host, url.port or _DEFAULT_PORTS[url.scheme]
+
+
+def _timeouts(request: Request) -> Tuple[Optional[float], Optional[float]]:
+    """The connect and read timeouts of a request, None for no timeout."""
+    timeout = request.extensions.get("timeout", {})
+    return timeout.get("connect"), timeout.get("read")
+
+
+def _response(status: int, reason: str, headers: List[Tuple[str, str]], content: bytes) -> Response:
+    """Builds an httpx response from a response read in full."""
+    return Response(
+        status,
+        headers=headers,
+        content=content,
+        extensions={"http_version": b"HTTP/1.1", "reason_phrase": reason.encode("ascii", "replace")},
+    )
+
+
+class HTTPClientTransport(BaseTransport):
+    """An httpx transport that sends requests with http.client, over keep-alive connections."""
+
+    def __init__(
+        self, max_idle_connections: int = DEFAULT_MAX_IDLE_CONNECTIONS, ssl_context: Optional[ssl.SSLContext] = None
+    ) -> None:
+        """An httpx transport that sends requests with http.client, over keep-alive connections.
+
+        Pass it to Client as ping_transport or api_transport. Connections are opened as requests need them and
+        up to max_idle_connections per host are kept for the next requests. A request that finds its connection
+        closed by the server is sent again on a new one. It can be shared by threads. In a forked child, the
+        connections of the parent are dropped.
+
+        Args:
+            max_idle_connections (int): idle connections kept per host. Defaults to 10.
+            ssl_context (Optional[ssl.SSLContext]): context for https connections. Defaults to None, the
+                system's default context.
+        """
+        self._max_idle_connections = max_idle_connections
+        self._ssl_context = ssl_context
+        self._idle: Dict[_PoolKey, List[http.client.HTTPConnection]] = dict()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _checkout(self, key: _PoolKey) -> Optional[http.client.HTTPConnection]:
+        """Takes an idle connection to a host, if there is one."""
+        if self._pid != os.getpid():
+            # forked, the idle connections' sockets are the parent's
+            self._pid = os.getpid()
+            self._idle = dict()
+            self._lock = threading.Lock()
+        with self._lock:
+            idle = self._idle.get(key)
+            return idle.pop() if idle else None
+
+    def _checkin(self, key: _PoolKey, connection: http.client.HTTPConnection) -> None:
+        """Keeps a connection for the next request, or closes it if enough are kept already."""
+        with self._lock:
+            idle = self._idle.setdefault(key, list())
+            if len(idle) < self._max_idle_connections:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _connect(self, key: _PoolKey, timeout: Optional[float], request: Request) -> http.client.HTTPConnection:
+        """Opens a new connection to a host.
+
+        Raises:
+            ConnectTimeout: Raised when connecting takes longer than the connect timeout
+            ConnectError: Raised when the connection fails
+        """
+        scheme, host, port = key
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            connection: http.client.HTTPConnection = http.client.HTTPSConnection(
+                host, port, timeout=timeout, context=self._ssl_context
+            )
+        else:
+            connection = http.client.HTTPConnection(host, port, timeout=timeout)
+        try:
+            connection.connect()
+        except socket.timeout as exc:
+            raise ConnectTimeout(str(exc), request=request) from exc
+        except OSError as exc:
+            raise ConnectError(str(exc), request=request) from exc
+        return connection
+
+    def handle_request(self, request: Request) -> Response:
+        """Sends a request and reads its whole response.
+
+        Args:
+            request (Request): the request
+
+        Raises:
+            ConnectTimeout: Raised when connecting takes longer than the connect timeout
+            ConnectError: Raised when the connection fails
+            ReadTimeout: Raised when the response takes longer than the read timeout
+            ReadError: Raised when sending the request or reading the response fails
+
+        Returns:
+            Response: the response
+        """
+        key = _pool_key(request)
+        connect_timeout, read_timeout = _timeouts(request)
+        body = request.read()
+        connection = self._checkout(key)
+        while True:
+            reused = connection is not None
+            if connection is None:
+                connection = self._connect(key, connect_timeout, request)
+            try:
+                connection.sock.settimeout(read_timeout)
+                connection.putrequest(
+                    request.method, request.url.raw_path.decode("ascii"), skip_host=True, skip_accept_encoding=True
+                )
+                for name, value in request.headers.raw:
+                    connection.putheader(name, value)
+                connection.endheaders(body)
+                response = connection.getresponse()
+                content = response.read()
+            except _STALE_CONNECTION_ERRORS as exc:
+                connection.close()
+                if reused:
+                    connection = None
+                    continue
+                raise ReadError(str(exc), request=request) from exc
+            except socket.timeout as exc:
+                connection.close()
+                raise ReadTimeout(str(exc), request=request) from exc
+            except (OSError, http.client.HTTPException) as exc:
+                connection.close()
+                raise ReadError(str(exc), request=request) from exc
+            except BaseException:
+                # interrupted halfway, the connection may still have the response coming
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._checkin(key, connection)
+            return _response(response.status, response.reason, response.getheaders(), content)
+
+    def close(self) -> None:
+        """Closes the idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, dict()
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+
+class AsyncStreamTransport(AsyncBaseTransport):
+    """An httpx transport that writes HTTP/1.1 requests to asyncio streams, over keep-alive connections."""
+
+    def __init__(
+        self, max_idle_connections: int = DEFAULT_MAX_IDLE_CONNECTIONS, ssl_context: Optional[ssl.SSLContext] = None
+    ) -> None:
+        """An httpx transport that writes HTTP/1.1 requests to asyncio streams, over keep-alive connections.
+
+        Pass it to AsyncClient as ping_transport or api_transport. Each request is written with a single write,
+        headers and body together, and its response is read in full. Connections are opened as requests need
+        them and up to max_idle_connections per host are kept for the next requests. A request that finds its
+        connection closed by the server is sent again on a new one. Use it from one event loop.
+
+        Args:
+            max_idle_connections (int): idle connections kept per host. Defaults to 10.
+            ssl_context (Optional[ssl.SSLContext]): context for https connections. Defaults to None, the
+                system's default context.
+        """
+        self._max_idle_connections = max_idle_connections
+        self._ssl_context = ssl_context
+        self._idle: Dict[_PoolKey, List[_Stream]] = dict()
+        self._pid = os.getpid()
+
+    def _checkout(self, key: _PoolKey) -> Optional[_Stream]:
+        """Takes an idle connection to a host that the server hasn't closed, if there is one."""
+        if self._pid != os.getpid():
+            # forked, the idle connections' sockets are the parent's
+            self._pid = os.getpid()
+            self._idle = dict()
+        idle = self._idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof():
+                return reader, writer
+            writer.close()
+        return None
+
+    def _checkin(self, key: _PoolKey, stream: _Stream) -> None:
+        """Keeps a connection for the next request, or closes it if enough are kept already."""
+        idle = self._idle.setdefault(key, list())
+        if len(idle) < self._max_idle_connections:
+            idle.append(stream)
+        else:
+            stream[1].close()
+
+    async def _connect(self, key: _PoolKey, timeout: Optional[float], request: Request) -> _Stream:
+        """Opens a new connection to a host.
+
+        Raises:
+            ConnectTimeout: Raised when connecting takes longer than the connect timeout
+            ConnectError: Raised when the connection fails
+        """
+        scheme, host, port = key
+        context = None
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            context = self._ssl_context
+        try:
+            return await asyncio.wait_for(asyncio.open_connection(host, port, ssl=context), timeout)
+        except asyncio.TimeoutError as exc:
+            raise ConnectTimeout("connect timed out", request=request) from exc
+        except OSError as exc:
+            raise ConnectError(str(exc), request=request) from exc
+
+    @staticmethod
+    def _head(request: Request) -> bytes:
+        """The request line and headers of a request."""
+        lines = [b"%s %s HTTP/1.1" % (request.method.encode("ascii"), request.url.raw_path)]
+        lines.extend(b"%s: %s" % (name, value) for name, value in request.headers.raw)
+        return b"\r\n".join(lines) + b"\r\n\r\n"
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+        """Reads a chunked response body."""
+        chunks = list()
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";", 1)[0], 16)
+            if size == 0:
+                # skip the trailers, up to the blank line
+                while await reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                return b"".join(chunks)
+            chunks.append((await reader.readexactly(size + 2))[:-2])
+
+    async def _exchange(
+        self, stream: _Stream, data: bytes, method: str
+    ) -> Tuple[int, str, List[Tuple[str, str]], bytes, bool]:
+        """Writes a request and reads its whole response.
+
+        Returns:
+            Tuple[int, str, List[Tuple[str, str]], bytes, bool]: status, reason, headers, body and whether the
+                connection can be kept
+        """
+        reader, writer = stream
+        writer.write(data)
+        await writer.drain()
+        lines = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        version, status, reason = (lines[0].split(" ", 2) + [""])[:3]
+        headers = [
+            (name.strip(), value.strip()) for name, _, value in (line.partition(":") for line in lines[1:] if line)
+        ]
+        values = {name.lower(): value.lower() for name, value in headers}
+        status_code = int(status)
+        keep_alive = version == "HTTP/1.1" and values.get("connection") != "close"
+        if method == "HEAD" or status_code in (204, 304) or status_code < 200:
+            content = b""
+        elif "chunked" in values.get("transfer-encoding", ""):
+            content = await self._read_chunked(reader)
+        elif "content-length" in values:
+            content = await reader.readexactly(int(values["content-length"]))
+        else:
+            # the body runs until the server closes the connection
+            content = await reader.read()
+            keep_alive = False
+        return status_code, reason, headers, content, keep_alive
+
+    async def handle_async_request(self, request: Request) -> Response:
+        """Sends a request and reads its whole response.
+
+        Args:
+            request (Request): the request
+
+        Raises:
+            ConnectTimeout: Raised when connecting takes longer than the connect timeout
+            ConnectError: Raised when the connection fails
+            ReadTimeout: Raised when writing the request and reading the response take longer than the read timeout
+            ReadError: Raised when sending the request or reading the response fails
+
+        Returns:
+            Response: the response
+        """
+        key = _pool_key(request)
+        connect_timeout, read_timeout = _timeouts(request)
+        data = self._head(request) + await request.aread()
+        stream = self._checkout(key)
+        while True:
+            reused = stream is not None
+            if stream is None:
+                stream = await self._connect(key, connect_timeout, request)
+            try:
+                status, reason, headers, content, keep_alive = await asyncio.wait_for(
+                    self._exchange(stream, data, request.method), read_timeout
+                )
+            except asyncio.TimeoutError as exc:
+                stream[1].close()
+                raise ReadTimeout("read timed out", request=request) from exc
+            except (asyncio.IncompleteReadError, ConnectionError) as exc:
+                stream[1].close()
+                stale = not isinstance(exc, asyncio.IncompleteReadError) or not exc.partial
+                if reused and stale:
+                    stream = None
+                    continue
+                raise ReadError(str(exc), request=request) from exc
+            except (OSError, ValueError, asyncio.LimitOverrunError) as exc:
+                stream[1].close()
+                raise ReadError(str(exc), request=request) from exc
+            except BaseException:
+                # cancelled halfway, the connection may still have the response coming
+                stream[1].close()
+                raise
+            if keep_alive:
+                self._checkin(key, stream)
+            else:
+                stream[1].close()
+            return _response(status, reason, headers, content)
+
+    async def aclose(self) -> None:
+        """Closes the idle connections."""
+        idle, self._idle = self._idle, dict()
+        for streams in idle.values():
+            for _, writer in streams:
+                # the loop they were opened on may be closed already, when a finalizer closes the client at exit
+                with suppress(RuntimeError):
+                    writer.close()
@@ -0,0 +1,199 @@
+"""Prometheus/OpenMetrics statistics for healthchecks_io clients."""
+
+import threading
+from bisect import bisect_left
+from typing import Dict
+from typing import List
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from .client import AsyncClient
+from .client import AsyncPingDispatcher
+from .client import Client
+from .client import PingDispatcher
+from .client import RequestEvent
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# request latencies, in seconds, from a fast ping to a call that ran into the default 5 second timeout
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+SUCCESS = "success"
+FAILURE = "failure"
+SPOOLED = "spooled"
+
+
+class _Shard:
+    """One thread's counters. Only its own thread writes to it, so updates need no lock."""
+
+    __slots__ = ("requests", "retries", "buckets", "sums")
+
+    def __init__(self) -> None:
+        # (operation, result, exception) -> calls
+        self.requests: Dict[Tuple[str, str, str], int] = dict()
+        # operation -> retries
+        self.retries: Dict[str, int] = dict()
+        # (operation, host) -> calls per latency bucket, the last one being +Inf
+        self.buckets: Dict[Tuple[str, str], List[int]] = dict()
+        # (operation, host) -> total latency
+        self.sums: Dict[Tuple[str, str], float] = dict()
+
+
+class ClientMetrics:
+    """Aggregates the events of one or more clients into Prometheus/OpenMetrics metrics."""
+
+    def __init__(self, namespace: str = "healthchecks_io", buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Aggregates the events of one or more clients into Prometheus/OpenMetrics metrics.
+
+        Attach it to clients to count their calls. Every thread counts into its own shard, so recording a call
+        never waits on a lock. render sums the shards into OpenMetrics text when it is scraped.
+
+        Args:
+            namespace (str): prefix of every metric name. Defaults to "healthchecks_io".
+            buckets (Sequence[float]): upper bounds, in seconds, of the latency histogram buckets. Defaults to
+                DEFAULT_BUCKETS.
+
+        Raises:
+            ValueError: Raised if buckets is empty or not sorted
+        """
+        if not buckets or list(buckets) != sorted(buckets):
+            raise ValueError("buckets must be a non empty, sorted sequence")
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._shards: List[_Shard] = list()
+        self._queues: Dict[str, Union[PingDispatcher, AsyncPingDispatcher]] = dict()
+        self._lock = threading.Lock()
+
+    def attach(self, client: Union[Client, AsyncClient]) -> None:
+        """Starts counting a client's calls.
+
+        Args:
+            client (Union[Client, AsyncClient]): client to count
+        """
+        client.add_listener(self.record)
+
+    def detach(self, client: Union[Client, AsyncClient]) -> None:
+        """Stops counting a client's calls.
+
+        Args:
+            client (Union[Client, AsyncClient]): client attached with attach
+        """
+        client.remove_listener(self.record)
+
+    def watch_queue(self, dispatcher: Union[PingDispatcher, AsyncPingDispatcher], name: str = "default") -> None:
+        """Reports a dispatcher's queue depth. Its client has to be attached separately.
+
+        Args:
+            dispatcher (Union[PingDispatcher, AsyncPingDispatcher]): dispatcher to watch
+            name (str): value of the queue label. Defaults to "default".
+        """
+        with self._lock:
+            self._queues[name] = dispatcher
+
+    def _shard(self) -> _Shard:
+        """The calling thread's shard, created on its first call."""
+        try:
+            return self._local.shard  # type: ignore
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def record(self, event: RequestEvent) -> None:
+        """Counts a finished call. This is the listener attach registers.
+
+        Args:
+            event (RequestEvent): the call's event
+        """
+        shard = self._shard()
+        if event.spooled:
+            result = SPOOLED
+        elif event.exception is not None:
+            result = FAILURE
+        else:
+            result = SUCCESS
+        key = (event.operation, result, "" if event.exception is None else event.exception.__name__)
+        shard.requests[key] = shard.requests.get(key, 0) + 1
+        if event.attempts > 1:
+            shard.retries[event.operation] = shard.retries.get(event.operation, 0) + event.attempts - 1
+        latency_key = (event.operation, event.host)
+        counts = shard.buckets.get(latency_key)
+        if counts is None:
+            counts = shard.buckets[latency_key] = [0] * (len(self.buckets) + 1)
+        counts[bisect_left(self.buckets, event.elapsed)] += 1
+        shard.sums[latency_key] = shard.sums.get(latency_key, 0.0) + event.elapsed
+
+    def render(self) -> str:
+        """Renders every metric as OpenMetrics text, ready to serve with CONTENT_TYPE.
+
+        Returns:
+            str: OpenMetrics exposition
+        """
+        requests: Dict[Tuple[str, str, str], int] = dict()
+        retries: Dict[str, int] = dict()
+        buckets: Dict[Tuple[str, str], List[int]] = dict()
+        sums: Dict[Tuple[str, str], float] = dict()
+        with self._lock:
+            shards = list(self._shards)
+            queues = dict(self._queues)
+        for shard in shards:
+            for key, value in list(shard.requests.items()):
+                requests[key] = requests.get(key, 0) + value
+            for operation, value in list(shard.retries.items()):
+                retries[operation] = retries.get(operation, 0) + value
+            for latency_key, counts in list(shard.buckets.items()):
+                total = buckets.setdefault(latency_key, [0] * len(counts))
+                for index, count in enumerate(list(counts)):
+                    total[index] += count
+            for latency_key, value in list(shard.sums.items()):
+                sums[latency_key] = sums.get(latency_key, 0.0) + value
+
+        name = f"{self.namespace}_request_duration_seconds"
+        lines = [
+            f"# TYPE {name} histogram",
+            f"# UNIT {name} seconds",
+            f"# HELP {name} Latency of pings and api calls, retries included.",
+        ]
+        bounds = [_format_float(bound) for bound in self.buckets] + ["+Inf"]
+        for (operation, host), counts in sorted(buckets.items()):
+            labels = f'operation="{_escape(operation)}",host="{_escape(host)}"'
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_count{{{labels}}} {cumulative}")
+            lines.append(f"{name}_sum{{{labels}}} {_format_float(sums.get((operation, host), 0.0))}")
+
+        name = f"{self.namespace}_requests"
+        lines.extend(
+            [f"# TYPE {name} counter", f"# HELP {name} Pings and api calls by result and the exception they raised."]
+        )
+        for (operation, result, exception), value in sorted(requests.items()):
+            labels = f'operation="{_escape(operation)}",result="{result}",exception="{_escape(exception)}"'
+            lines.append(f"{name}_total{{{labels}}} {value}")
+
+        name = f"{self.namespace}_retries"
+        lines.extend([f"# TYPE {name} counter", f"# HELP {name} Retries sent by pings and api calls."])
+        for operation, value in sorted(retries.items()):
+            lines.append(f'{name}_total{{operation="{_escape(operation)}"}} {value}')
+
+        name = f"{self.namespace}_ping_queue_depth"
+        lines.extend([f"# TYPE {name} gauge", f"# HELP {name} Pings waiting in a dispatcher's queue."])
+        for queue, dispatcher in sorted(queues.items()):
+            lines.append(f'{name}{{queue="{_escape(queue)}"}} {dispatcher.qsize}')
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """Escapes a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_float(value: float) -> str:
+    """Formats a float the way OpenMetrics expects, without exponents for the usual bucket bounds."""
+    return repr(float(value))
@@ -0,0 +1,258 @@
+"""Pings with nothing but the standard library, for short lived processes like cron jobs.
+
+Importing Client imports httpx, which can take longer than the job's ping. Pinger sends the same pings, built
+with the same url rules, over http.client::
+
+    from healthchecks_io.ping import Pinger
+
+    with Pinger() as pinger:
+        pinger.start_ping(uuid="mychecksuuid")
+        run_job()
+        pinger.success_ping(uuid="mychecksuuid")
+"""
+
+import http.client
+from types import TracebackType
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from urllib.parse import urlsplit
+
+from . import __version__ as client_version
+from .client._status import check_ping_status
+from .client._urls import check_ping_target
+from .client._urls import ping_url_with_rid
+from .client._urls import PingUrlCache
+
+# errors of a request sent on a keep-alive connection the server closed while it was idle
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+class Pinger:
+    """Sends pings over a single keep-alive http.client connection."""
+
+    def __init__(self, ping_key: str = "", ping_url: str = "https://hc-ping.com/", timeout: float = 5.0) -> None:
+        """Sends pings over a single keep-alive http.client connection.
+
+        The connection is opened by the first ping and reused by the next ones. A ping that finds it closed by
+        the server is sent again on a new connection. Pingers are not thread safe, use one per thread.
+
+        Args:
+            ping_key (str): Healthchecks.io Ping key. Defaults to an empty string.
+            ping_url (str): Ping API url. Defaults to "https://hc-ping.com/".
+            timeout (float): seconds to wait for the connection and for each read. Defaults to 5.0.
+        """
+        if not ping_url.endswith("/"):
+            ping_url = f"{ping_url}/"
+        self._ping_key = ping_key
+        self._ping_urls = PingUrlCache(ping_url, ping_key)
+        self._timeout = timeout
+        parts = urlsplit(ping_url)
+        self._https = parts.scheme == "https"
+        self._host = parts.netloc
+        self._url_prefix = f"{parts.scheme}://{parts.netloc}"
+        self._connection: Optional[http.client.HTTPConnection] = None
+        self._headers = {"user-agent": f"py-healthchecks.io-ping/{client_version}"}
+
+    def __enter__(self) -> "Pinger":
+        """Context manager entrance.
+
+        Returns:
+            Pinger: returns this pinger as a context manager
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Context manager exit."""
+        self.close()
+
+    def close(self) -> None:
+        """Closes the keep-alive connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _connect(self) -> http.client.HTTPConnection:
+        """Creates the connection, it connects when the first request is sent.
+
+        Returns:
+            http.client.HTTPConnection: the connection
+        """
+        if self._https:
+            return http.client.HTTPSConnection(self._host, timeout=self._timeout)
+        return http.client.HTTPConnection(self._host, timeout=self._timeout)
+
+    def _post(self, url: str, body: bytes) -> Tuple[int, str]:
+        """Posts a ping, once more on a new connection if the keep-alive one was closed while idle.
+
+        Args:
+            url (str): ping url
+            body (bytes): request body
+
+        Returns:
+            Tuple[int, str]: response status code and text
+        """
+        path = url[len(self._url_prefix) :]
+        reused = self._connection is not None
+        while True:
+            if self._connection is None:
+                self._connection = self._connect()
+            try:
+                self._connection.request("POST", path, body=body, headers=self._headers)
+                response = self._connection.getresponse()
+                text = response.read().decode("utf-8", errors="replace")
+            except _STALE_CONNECTION_ERRORS:
+                self.close()
+                if not reused:
+                    raise
+                reused = False
+                continue
+            except BaseException:
+                self.close()
+                raise
+            if response.will_close:
+                self.close()
+            return response.status, text
+
+    def _ping(self, uuid: str, slug: str, endpoint: str, data: str, rid: str) -> Tuple[bool, str]:
+        """Sends a ping and checks its response.
+
+        Args:
+            uuid (str): Check's UUID
+            slug (str): Check's Slug
+            endpoint (str): ping endpoint, like "/start"
+            data (str): Text data to append to this check
+            rid (str): run id, or "" for none
+
+        Returns:
+            Tuple[bool, str]: success (true or false) and the response text
+        """
+        check_ping_target(uuid, slug, self._ping_key)
+        url = self._ping_urls.uuid_url(uuid, endpoint) if uuid != "" else self._ping_urls.slug_url(slug, endpoint)
+        url = ping_url_with_rid(url, rid)
+        status_code, text = self._post(url, data.encode("utf-8"))
+        check_ping_status(status_code, text, url)
+        return (True if status_code == 200 else False, text)
+
+    def success_ping(self, uuid: str = "", slug: str = "", data: str = "", rid: str = "") -> Tuple[bool, str]:
+        """Signals to Healthchecks.io that a job has completed successfully. See Client.success_ping.
+
+        Args:
+            uuid (str): Check's UUID. Defaults to "".
+            slug (str): Check's Slug. Defaults to "".
+            data (str): Text data to append to this check. Defaults to "".
+            rid (str): run id, pairing the start and finish pings of one run. Defaults to "", none.
+
+        Raises:
+            HCAPIAuthError: Raised when status_code == 401 or 403
+            HCAPIError: Raised when status_code is 5xx
+            CheckNotFoundError: Raised when status_code is 404 or response text has "not found" in it
+            BadAPIRequestError: Raised when status_code is 400, or if you pass a uuid and a slug, or if
+                pinging by a slug and do not have a ping key set
+            HCAPIRateLimitError: Raised when status code is 429 or response text has "rate limited" in it
+            NonUniqueSlugError: Raused when status code is 409.
+
+        Returns:
+            Tuple[bool, str]: success (true or false) and the response text
+        """
+        return self._ping(uuid, slug, "", data, rid)
+
+    def start_ping(self, uuid: str = "", slug: str = "", data: str = "", rid: str = "") -> Tuple[bool, str]:
+        """Sends a "job has started!" message to Healthchecks.io. See Client.start_ping.
+
+        Args:
+            uuid (str): Check's UUID. Defaults to "".
+            slug (str): Check's Slug. Defaults to "".
+            data (str): Text data to append to this check. Defaults to "".
+            rid (str): run id, pairing the start and finish pings of one run. Defaults to "", none.
+
+        Raises:
+            HCAPIAuthError: Raised when status_code == 401 or 403
+            HCAPIError: Raised when status_code is 5xx
+            CheckNotFoundError: Raised when status_code is 404 or response text has "not found" in it
+            BadAPIRequestError: Raised when status_code is 400, or if you pass a uuid and a slug, or if
+                pinging by a slug and do not have a ping key set
+            HCAPIRateLimitError: Raised when status code is 429 or response text has "rate limited" in it
+            NonUniqueSlugError: Raused when status code is 409.
+
+        Returns:
+            Tuple[bool, str]: success (true or false) and the response text
+        """
+        return self._ping(uuid, slug, "/start", data, rid)
+
+    def fail_ping(self, uuid: str = "", slug: str = "", data: str = "", rid: str = "") -> Tuple[bool, str]:
+        """Signals to Healthchecks.io that the job has failed. See Client.fail_ping.
+
+        Args:
+            uuid (str): Check's UUID. Defaults to "".
+            slug (str): Check's Slug. Defaults to "".
+            data (str): Text data to append to this check. Defaults to "".
+            rid (str): run id, pairing the start and finish pings of one run. Defaults to "", none.
+
+        Raises:
+            HCAPIAuthError: Raised when status_code == 401 or 403
+            HCAPIError: Raised when status_code is 5xx
+            CheckNotFoundError: Raised when status_code is 404 or response text has "not found" in it
+            BadAPIRequestError: Raised when status_code is 400, or if you pass a uuid and a slug, or if
+                pinging by a slug and do not have a ping key set
+            HCAPIRateLimitError: Raised when status code is 429 or response text has "rate limited" in it
+            NonUniqueSlugError: Raused when status code is 409.
+
+        Returns:
+            Tuple[bool, str]: success (true or false) and the response text
+        """
+        return self._ping(uuid, slug, "/fail", data, rid)
+
+    def exit_code_ping(
+        self, exit_code: int, uuid: str = "", slug: str = "", data: str = "", rid: str = ""
+    ) -> Tuple[bool, str]:
+        """Signals to Healthchecks.io that the job has finished with an exit code. See Client.exit_code_ping.
+
+        Args:
+            exit_code (int): Exit code to sent, int from 0 to 255
+            uuid (str): Check's UUID. Defaults to "".
+            slug (str): Check's Slug. Defaults to "".
+            data (str): Text data to append to this check. Defaults to "".
+            rid (str): run id, pairing the start and finish pings of one run. Defaults to "", none.
+
+        Raises:
+            HCAPIAuthError: Raised when status_code == 401 or 403
+            HCAPIError: Raised when status_code is 5xx
+            CheckNotFoundError: Raised when status_code is 404 or response text has "not found" in it
+            BadAPIRequestError: Raised when status_code is 400, or if you pass a uuid and a slug, or if
+                pinging by a slug and do not have a ping key set
+            HCAPIRateLimitError: Raised when status code is 429 or response text has "rate limited" in it
+            NonUniqueSlugError: Raused when status code is 409.
+
+        Returns:
+            Tuple[bool, str]: success (true or false) and the response text
+        """
+        return self._ping(uuid, slug, f"/{exit_code}", data, rid)
+
+    def log_ping(self, uuid: str = "", slug: str = "", data: str = "", rid: str = "") -> Tuple[bool, str]:
+        """Adds data to the check's event log without changing its status.
+
+        Args:
+            uuid (str): Check's UUID. Defaults to "".
+            slug (str): Check's Slug. Defaults to "".
+            data (str): Text data to append to this check. Defaults to "".
+            rid (str): run id, pairing the start and finish pings of one run. Defaults to "", none.
+
+        Raises:
+            HCAPIAuthError: Raised when status_code == 401 or 403
+            HCAPIError: Raised when status_code is 5xx
+            CheckNotFoundError: Raised when status_code is 404 or response text has "not found" in it
+            BadAPIRequestError: Raised when status_code is 400, or if you pass a uuid and a slug, or if
+                pinging by a slug and do not have a ping key set
+            HCAPIRateLimitError: Raised when status code is 429 or response text has "rate limited" in it
+            NonUniqueSlugError: Raused when status code is 409.
+
+        Returns:
+            Tuple[bool, str]: success (true or false) and the response text
+        """
+        return self._ping(uuid, slug, "/log", data, rid)
@@ -1,12 +1,30 @@
 """Schemas for healthchecks_io."""
 
-from .badges import Badges
-from .checks import Check
-from .checks import CheckCreate
-from .checks import CheckPings
-from .checks import CheckStatuses
-from .checks import CheckUpdate
-from .integrations import Integration
+from typing import TYPE_CHECKING
+
+from healthchecks_io._lazy import lazy_exports
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .badges import Badges
+    from .checks import Check
+    from .checks import CheckCreate
+    from .checks import CheckPings
+    from .checks import CheckStatuses
+    from .checks import CheckUpdate
+    from .integrations import Integration
+
+# the schemas need pydantic, croniter and pytz, they are imported on first use
+_EXPORTS = {
+    "Badges": ".badges",
+    "Check": ".checks",
+    "CheckCreate": ".checks",
+    "CheckPings": ".checks",
+    "CheckStatuses": ".checks",
+    "CheckUpdate": ".checks",
+    "Integration": ".integrations",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     "Check",
@@ -12,9 +12,20 @@ from healthchecks_io import HCAPIRateLimitError
 from healthchecks_io import NonUniqueSlugError
 
 
-def test_abstract_add_url_params(test_abstract_client):
-    url = test_abstract_client._add_url_params("http://test.com/?test=test", {"test": "test2"})
-    assert url == "http://test.com/?test=test2"
+def test_get_api_request_url(test_abstract_client):
+    assert test_abstract_client._get_api_request_url("checks/") == f"{test_abstract_client._api_url}checks/"
+    assert test_abstract_client._get_api_request_url("checks/", {}) == f"{test_abstract_client._api_url}checks/"
+    url = test_abstract_client._get_api_request_url("checks/", [("tag", "one"), ("tag", "two words")])
+    assert url == f"{test_abstract_client._api_url}checks/?tag=one&tag=two+words"
+
+
+def test_get_ping_url_cached(test_abstract_client):
+    assert (
+        test_abstract_client._get_ping_url("", "slug", "/start") == f"{test_abstract_client._ping_url}1234/slug/start"
+    )
+    test_abstract_client._get_ping_url("uuid", "", "/fail")
+    test_abstract_client._get_ping_url("uuid", "", "/fail")
+    assert test_abstract_client._ping_urls.uuid_url.cache_info().hits == 1
 
 
 def test_get_ping_url(test_abstract_client):
@@ -157,6 +157,20 @@ async def test_aget_checks_tags(fake_check_api_result, respx_mock, test_async_cl
     assert checks[0].name == fake_check_api_result["name"]
 
 
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_aping_uses_separate_client(respx_mock, test_async_client):
+    assert test_async_client._ping_client is not test_async_client._client
+    route = respx_mock.post(urljoin(test_async_client._ping_url, "test")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    await test_async_client.success_ping(uuid="test")
+    headers = route.calls.last.request.headers
+    assert "x-api-key" not in headers
+    assert "content-type" not in headers
+    assert headers["user-agent"].startswith("py-healthchecks.io-async/")
+
+
 @pytest.mark.asyncio
 def test_finalizer_closes(test_async_client):
     """Tests our finalizer works to close the method"""
@@ -351,3 +365,13 @@ async def test_asuccess_ping(respx_mocker, tc, url, ping_method, method_kwargs):
     result = await ping_method(**method_kwargs)
     assert result[0] is True
     assert result[1] == "OK"
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+@pytest.mark.parametrize("respx_mocker, tc, url, ping_method, method_kwargs", ping_test_parameters)
+async def test_aping_rid(respx_mocker, tc, url, ping_method, method_kwargs):
+    route = respx_mocker.post(urljoin(tc._ping_url, url)).mock(return_value=Response(status_code=200, text="OK"))
+    assert await getattr(tc, ping_method)(**method_kwargs, rid="a7ec1b5e-run") == (True, "OK")
+    request_url = route.calls.last.request.url
+    assert request_url.path.endswith(url) and request_url.params["rid"] == "a7ec1b5e-run"
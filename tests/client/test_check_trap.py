@@ -1,11 +1,16 @@
+import asyncio
 from urllib.parse import urljoin
 
 import pytest
 from httpx import Response
 
+from healthchecks_io import BadAPIRequestError
 from healthchecks_io import CheckTrap
+from healthchecks_io import Client
 from healthchecks_io import PingFailedError
+from healthchecks_io import SlugResolver
 from healthchecks_io import WrongClientError
+from tests.conftest import client_kwargs
 
 
 @pytest.mark.respx
@@ -90,3 +95,350 @@ def test_check_trap_no_uuid_or_slug(test_client):
         with CheckTrap(test_client):
             pass
         assert str(exc) == "Must pass a slug or an uuid"
+
+
+@pytest.mark.respx
+def test_check_trap_sync_caps_log(respx_mock, test_client):
+    respx_mock.post(urljoin(test_client._ping_url, "test/start")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    success = respx_mock.post(urljoin(test_client._ping_url, "test")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    with CheckTrap(test_client, uuid="test", max_log_bytes=1000) as trap:
+        for index in range(1000):
+            trap.add_log(f"line {index}")
+    body = success.calls.last.request.content
+    assert len(body) <= 1000
+    assert body.startswith(b"line 0\nline 1\n") and body.endswith(b"\nline 999")
+    assert trap.log_lines[-1] == "line 999"
+
+
+def test_check_trap_log_lines_write_through(test_client):
+    trap = CheckTrap(test_client, uuid="test")
+    trap.add_log("first")
+    trap.log_lines.append("second")
+    trap.log_lines.extend(["third"])
+    trap.log_lines += ["fourth"]
+    assert trap.log_lines == ["first", "second", "third", "fourth"]
+    assert trap.log.getvalue() == "first\nsecond\nthird\nfourth"
+    assert len(trap.log_lines) == 4 and trap.log_lines[1:3] == ["second", "third"]
+    with pytest.raises(TypeError):
+        trap.log_lines[0] = "changed"
+    trap.log_lines = ["replaced"]
+    assert trap.log.lines() == ["replaced"]
+    trap.log_lines.clear()
+    assert trap.log_lines == [] and trap.log.getvalue() == ""
+
+
+@pytest.mark.asyncio
+async def test_check_trap_async_background_start(monkeypatch, test_async_client):
+    events = list()
+    answer_start = asyncio.Event()
+
+    async def start_ping(uuid, slug, timeout=None, rid=""):
+        events.append("start sent")
+        await answer_start.wait()
+        events.append("start answered")
+        return True, "OK"
+
+    async def success_ping(uuid, slug, data="", timeout=None, rid=""):
+        events.append("success sent")
+        return True, "OK"
+
+    monkeypatch.setattr(test_async_client, "start_ping", start_ping)
+    monkeypatch.setattr(test_async_client, "success_ping", success_ping)
+    async with CheckTrap(test_async_client, uuid="test", background_start=True):
+        events.append("block")
+        await asyncio.sleep(0)
+        answer_start.set()
+    assert events == ["block", "start sent", "start answered", "success sent"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+@pytest.mark.parametrize("status_code", [444, 404])
+async def test_check_trap_async_background_start_fails(respx_mock, test_async_client, status_code):
+    respx_mock.post(urljoin(test_async_client._ping_url, "test/start")).mock(
+        return_value=Response(status_code=status_code, text="OK")
+    )
+    fail = respx_mock.post(urljoin(test_async_client._ping_url, "test/fail")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    with pytest.raises(RuntimeError):
+        async with CheckTrap(test_async_client, uuid="test", background_start=True) as trap:
+            raise RuntimeError("broke")
+    assert trap.log_lines[0].startswith("start ping failed: ")
+    assert trap.log_lines[1] == "broke"
+    assert fail.called
+
+
+@pytest.mark.respx
+def test_check_trap_decorator(respx_mock, test_client):
+    respx_mock.post(urljoin(test_client._ping_url, "test/start")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    success = respx_mock.post(urljoin(test_client._ping_url, "test")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    fail = respx_mock.post(urljoin(test_client._ping_url, "test/fail")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+
+    @CheckTrap.decorate(test_client, uuid="test")
+    def job(value, double=False):
+        """Doubles a value."""
+        if value is None:
+            raise ValueError("no value")
+        return value * 2 if double else value
+
+    assert job.__name__ == "job" and job.__doc__ == "Doubles a value."
+    assert job(2, double=True) == 4
+    assert success.call_count == 1
+    with pytest.raises(ValueError):
+        job(None)
+    body = fail.calls.last.request.content
+    assert body.startswith(b"Traceback") and body.endswith(b"ValueError: no value\n")
+    assert CheckTrap.decorate(test_client, uuid="test", suppress_exceptions=True)(job.__wrapped__)(None) is None
+
+
+@pytest.mark.respx
+def test_check_trap_decorator_exit_codes(respx_mock, test_client):
+    respx_mock.post(urljoin(test_client._ping_url, "test/start")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    exit_code = respx_mock.post(url__regex=r".*/test/\d+$").mock(return_value=Response(status_code=200, text="OK"))
+
+    @CheckTrap.decorate(test_client, uuid="test", exit_codes={OSError: 3, Exception: 1})
+    def job(exc):
+        raise exc
+
+    for exc, path in [
+        (FileNotFoundError("gone"), "/test/3"),
+        (KeyError("key"), "/test/1"),
+        (SystemExit(2), "/test/2"),
+        (SystemExit(), "/test/0"),
+    ]:
+        with pytest.raises(type(exc)):
+            job(exc)
+        assert exit_code.calls.last.request.url.path.endswith(path)
+
+
+@pytest.mark.respx
+def test_check_trap_decorator_failed_start_ping(respx_mock, test_client):
+    respx_mock.post(urljoin(test_client._ping_url, "test/start")).mock(
+        return_value=Response(status_code=444, text="OK")
+    )
+    with pytest.raises(PingFailedError):
+        CheckTrap.decorate(test_client, uuid="test")(lambda: None)()
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_check_trap_decorator_async(respx_mock, test_async_client):
+    respx_mock.post(urljoin(test_async_client._ping_url, "test/start")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    success = respx_mock.post(urljoin(test_async_client._ping_url, "test")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    fail = respx_mock.post(urljoin(test_async_client._ping_url, "test/fail")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    exit_code = respx_mock.post(urljoin(test_async_client._ping_url, "test/4")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+
+    @CheckTrap.decorate(test_async_client, uuid="test", exit_codes={LookupError: 4})
+    async def job(exc=None):
+        await asyncio.sleep(0)
+        if exc is not None:
+            raise exc
+        return "done"
+
+    assert await job() == "done"
+    assert success.call_count == 1
+    with pytest.raises(KeyError):
+        await job(KeyError("key"))
+    assert exit_code.call_count == 1
+    with pytest.raises(RuntimeError):
+        await job(RuntimeError("broke"))
+    assert fail.calls.last.request.content.endswith(b"RuntimeError: broke\n")
+    assert (
+        await CheckTrap.decorate(test_async_client, uuid="test", suppress_exceptions=True)(job.__wrapped__)(
+            RuntimeError("broke")
+        )
+        is None
+    )
+
+    respx_mock.post(urljoin(test_async_client._ping_url, "other/start")).mock(
+        return_value=Response(status_code=444, text="OK")
+    )
+    with pytest.raises(PingFailedError):
+        await CheckTrap.decorate(test_async_client, uuid="other")(job.__wrapped__)()
+
+
+def test_check_trap_decorator_errors(test_client, test_async_client):
+    async def coroutine_function():
+        pass
+
+    with pytest.raises(WrongClientError):
+        CheckTrap.decorate(test_client, uuid="test")(coroutine_function)
+    with pytest.raises(WrongClientError):
+        CheckTrap.decorate(test_async_client, uuid="test")(lambda: None)
+    with pytest.raises(Exception):
+        CheckTrap.decorate(test_client)
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_check_trap_disabled(monkeypatch, respx_mock, test_client, test_async_client):
+    # respx fails any request that reaches it, no routes are mocked
+    monkeypatch.setattr(CheckTrap, "disabled", True)
+
+    @CheckTrap.decorate(test_client, uuid="test")
+    def job():
+        return "done"
+
+    @CheckTrap.decorate(test_async_client, uuid="test")
+    async def async_job():
+        return "done"
+
+    assert job() == "done"
+    assert await async_job() == "done"
+    with CheckTrap(test_client, uuid="test"):
+        pass
+    with CheckTrap(test_client, uuid="test", suppress_exceptions=True):
+        raise RuntimeError("broke")
+    async with CheckTrap(test_async_client, uuid="test"):
+        pass
+    assert not respx_mock.calls
+
+
+@pytest.mark.respx
+def test_check_trap_rid(respx_mock, test_client):
+    start = respx_mock.post(urljoin(test_client._ping_url, "test/start")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    success = respx_mock.post(urljoin(test_client._ping_url, "test")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    trap = CheckTrap(test_client, uuid="test", rid=True)
+    rids = list()
+    for _ in range(2):
+        with trap:
+            rids.append(trap.rid)
+        assert start.calls.last.request.url.params["rid"] == success.calls.last.request.url.params["rid"] == trap.rid
+    assert len(set(rids)) == 2 and all(len(rid) == 36 for rid in rids)
+    with CheckTrap(test_client, uuid="test", rid="run-1"):
+        pass
+    assert success.calls.last.request.url.params["rid"] == "run-1"
+    with CheckTrap(test_client, uuid="test"):
+        pass
+    assert "rid" not in success.calls.last.request.url.params
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_check_trap_async_rid(respx_mock, test_async_client):
+    start = respx_mock.post(urljoin(test_async_client._ping_url, "test/start")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    fail = respx_mock.post(urljoin(test_async_client._ping_url, "test/fail")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+
+    async def run():
+        async with CheckTrap(test_async_client, uuid="test", rid=True, background_start=True) as trap:
+            await asyncio.sleep(0)
+            raise RuntimeError(trap.rid)
+
+    await asyncio.gather(*(run() for _ in range(3)), return_exceptions=True)
+    start_rids = sorted(call.request.url.params["rid"] for call in start.calls)
+    fail_rids = sorted(call.request.url.params["rid"] for call in fail.calls)
+    assert start_rids == fail_rids and len(set(start_rids)) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_check_trap_decorator_rid(respx_mock, test_client, test_async_client):
+    start = respx_mock.post(urljoin(test_client._ping_url, "test/start")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    success = respx_mock.post(urljoin(test_client._ping_url, "test")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    CheckTrap.decorate(test_client, uuid="test", rid=True)(lambda: None)()
+
+    @CheckTrap.decorate(test_async_client, uuid="test", rid=True)
+    async def job():
+        pass
+
+    await job()
+    start_rids = [call.request.url.params["rid"] for call in start.calls]
+    assert start_rids == [call.request.url.params["rid"] for call in success.calls]
+    assert len(set(start_rids)) == 2
+
+
+@pytest.mark.respx
+def test_check_trap_decorator_never_suppresses_base_exceptions(respx_mock, test_client):
+    respx_mock.post(urljoin(test_client._ping_url, "test/start")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    fail = respx_mock.post(urljoin(test_client._ping_url, "test/fail")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    exit_code = respx_mock.post(urljoin(test_client._ping_url, "test/3")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+
+    @CheckTrap.decorate(test_client, uuid="test", suppress_exceptions=True)
+    def job(exc):
+        raise exc
+
+    with pytest.raises(KeyboardInterrupt):
+        job(KeyboardInterrupt())
+    assert fail.call_count == 1
+    with pytest.raises(SystemExit):
+        job(SystemExit(3))
+    assert exit_code.call_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_check_trap_decorator_cancelled(respx_mock, test_async_client):
+    respx_mock.post(urljoin(test_async_client._ping_url, "test/start")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    started = asyncio.Event()
+
+    @CheckTrap.decorate(test_async_client, uuid="test", suppress_exceptions=True)
+    async def job():
+        started.set()
+        await asyncio.sleep(60)
+
+    task = asyncio.ensure_future(job())
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    # the run didn't finish, so no result ping is sent
+    assert len(respx_mock.calls) == 1
+
+
+@pytest.mark.respx
+def test_check_trap_decorator_resolved_slug(respx_mock, fake_check_api_result):
+    client_args = {name: value for name, value in client_kwargs.items() if name != "ping_key"}
+    client = Client(**client_args, slug_resolver=SlugResolver())
+    check = dict(fake_check_api_result, slug="backup", ping_url="testhc.io/ping/uuid-1")
+    respx_mock.get(urljoin(client._api_url, "checks/")).mock(
+        return_value=Response(status_code=200, json={"checks": [check]})
+    )
+    start = respx_mock.post(urljoin(client._ping_url, "uuid-1/start")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    respx_mock.post(urljoin(client._ping_url, "uuid-1")).mock(return_value=Response(status_code=200, text="OK"))
+    assert CheckTrap.decorate(client, slug="backup")(lambda: "done")() == "done"
+    assert start.called
+    with pytest.raises(BadAPIRequestError):
+        CheckTrap.decorate(Client(**client_args), slug="backup")
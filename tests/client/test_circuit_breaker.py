@@ -0,0 +1,154 @@
+import time
+from urllib.parse import urljoin
+
+import pytest
+from httpx import ConnectError
+from httpx import Response
+
+from healthchecks_io import AsyncClient
+from healthchecks_io import CircuitBreaker
+from healthchecks_io import CircuitOpenError
+from healthchecks_io import Client
+from healthchecks_io import DeadlineExceededError
+from healthchecks_io import HCAPIError
+from healthchecks_io import PingSpool
+from healthchecks_io import TokenBucket
+from healthchecks_io.client._abstract import CIRCUIT_OPEN
+from healthchecks_io.client.spool import SPOOLED
+from tests.conftest import client_kwargs
+
+
+def test_circuit_breaker_validates_arguments():
+    with pytest.raises(ValueError):
+        CircuitBreaker(failure_rate=0)
+    with pytest.raises(ValueError):
+        CircuitBreaker(min_calls=0)
+
+
+def test_circuit_breaker_transitions():
+    transitions = []
+    breaker = CircuitBreaker(
+        failure_rate=0.5,
+        min_calls=4,
+        probe_interval=0.05,
+        on_state_change=lambda old, new: transitions.append((old, new)),
+    )
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+    time.sleep(0.06)
+    # a single probe is let through while half-open
+    assert breaker.allow_request()
+    assert breaker.state == "half-open"
+    assert not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow_request()
+    assert transitions == [
+        ("closed", "open"),
+        ("open", "half-open"),
+        ("half-open", "open"),
+        ("open", "half-open"),
+        ("half-open", "closed"),
+    ]
+
+
+def test_circuit_breaker_release_probe():
+    breaker = CircuitBreaker(min_calls=1, probe_interval=0)
+    breaker.release_probe()
+    breaker.record_failure()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    # the probe gave up before it was sent, the next request probes instead
+    breaker.release_probe()
+    assert breaker.state == "half-open"
+    assert breaker.allow_request()
+
+
+def test_circuit_breaker_window_forgets_old_outcomes():
+    breaker = CircuitBreaker(min_calls=2, window=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.respx
+def test_client_ping_circuit_open(respx_mock, tmp_path):
+    breaker = CircuitBreaker(min_calls=2, probe_interval=60)
+    client = Client(**client_kwargs, ping_circuit_breaker=breaker)
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=503))
+    respx_mock.post(urljoin(client._ping_url, "test/fail")).mock(side_effect=ConnectError("down"))
+    with pytest.raises(HCAPIError):
+        client.success_ping(uuid="test")
+    with pytest.raises(ConnectError):
+        client.fail_ping(uuid="test")
+    assert breaker.state == "open"
+    assert client.success_ping(uuid="test") == (False, CIRCUIT_OPEN)
+    assert route.call_count == 1
+
+    client._spool = PingSpool(str(tmp_path / "pings.spool"))
+    assert client.success_ping(uuid="test") == (True, SPOOLED)
+
+
+@pytest.mark.respx
+def test_client_api_circuit_open(respx_mock):
+    breaker = CircuitBreaker(min_calls=1, probe_interval=60)
+    client = Client(**client_kwargs, api_circuit_breaker=breaker)
+    respx_mock.get(urljoin(client._api_url, "checks/")).mock(return_value=Response(status_code=500))
+    with pytest.raises(HCAPIError):
+        client.get_checks()
+    with pytest.raises(CircuitOpenError):
+        client.get_checks()
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_client_circuit_breaker(respx_mock):
+    breaker = CircuitBreaker(min_calls=1, probe_interval=0)
+    client = AsyncClient(**client_kwargs, ping_circuit_breaker=breaker)
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(side_effect=ConnectError("down"))
+    with pytest.raises(ConnectError):
+        await client.success_ping(uuid="test")
+    assert breaker.state == "open"
+    route.side_effect = None
+    route.return_value = Response(status_code=200, text="OK")
+    assert await client.success_ping(uuid="test") == (True, "OK")
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_async_client_circuit_open(test_async_client):
+    test_async_client._ping_circuit_breaker = CircuitBreaker(min_calls=1, probe_interval=60)
+    test_async_client._ping_circuit_breaker.record_failure()
+    assert await test_async_client.success_ping(uuid="test") == (False, CIRCUIT_OPEN)
+
+
+@pytest.mark.respx
+def test_client_probe_gives_up_in_rate_limit_wait(respx_mock):
+    breaker = CircuitBreaker(min_calls=1, probe_interval=0.05)
+    client = Client(**client_kwargs, ping_circuit_breaker=breaker, ping_rate_limit=TokenBucket(rate=0.1))
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=500))
+    with pytest.raises(HCAPIError):
+        client.success_ping(uuid="test")
+    assert breaker.state == "open"
+    time.sleep(0.06)
+    # the probe's rate limit wait outlasts its deadline, so it's never sent
+    with pytest.raises(DeadlineExceededError):
+        client.success_ping(uuid="test", timeout=0.5)
+    assert breaker.state == "half-open"
+    client._ping_rate_limit = None
+    route.return_value = Response(status_code=200, text="OK")
+    assert client.success_ping(uuid="test") == (True, "OK")
+    assert breaker.state == "closed"
+    assert route.call_count == 2
@@ -0,0 +1,258 @@
+import socket
+import threading
+import time
+from urllib.parse import urljoin
+
+import pytest
+from httpx import ConnectTimeout
+from httpx import ReadTimeout
+from httpx import Request
+from httpx import Response
+from httpx import Timeout
+
+from healthchecks_io import AsyncClient
+from healthchecks_io import AsyncPingDispatcher
+from healthchecks_io import CheckTrap
+from healthchecks_io import CircuitBreaker
+from healthchecks_io import Client
+from healthchecks_io import DeadlineExceededError
+from healthchecks_io import HCAPIError
+from healthchecks_io import PingDispatcher
+from healthchecks_io import PingSpool
+from healthchecks_io import RetryPolicy
+from healthchecks_io import TokenBucket
+from healthchecks_io.client._abstract import AbstractClient
+from healthchecks_io.client._deadline import Deadline
+from tests.conftest import client_kwargs
+
+
+@pytest.fixture
+def silent_server():
+    """A server that accepts connections and never answers."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+    yield f"http://127.0.0.1:{server.getsockname()[1]}/"
+    server.close()
+
+
+@pytest.fixture
+def trickling_server():
+    """A server that answers with a body it sends a byte at a time, each well within the read timeout."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+    stop = threading.Event()
+
+    def trickle(connection: socket.socket) -> None:
+        with connection:
+            connection.recv(65536)
+            connection.sendall(b"HTTP/1.1 200 OK\r\ncontent-length: 100\r\n\r\n")
+            for _ in range(100):
+                if stop.wait(0.05):
+                    return
+                try:
+                    connection.sendall(b"K")
+                except OSError:
+                    return
+
+    def serve() -> None:
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+            threading.Thread(target=trickle, args=(connection,), daemon=True).start()
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield f"http://127.0.0.1:{server.getsockname()[1]}/"
+    stop.set()
+    server.close()
+
+
+def test_deadline_check():
+    assert Deadline(10).check("url") > 9
+    with pytest.raises(DeadlineExceededError):
+        Deadline(0).check("url")
+
+
+def test_deadline_extensions_keep_shorter_client_timeouts():
+    deadline = Deadline(2)
+    extensions = deadline.extensions(Timeout(5.0, connect=1.0))
+    assert extensions["timeout"]["connect"] == 1.0
+    assert 1.9 < extensions["timeout"]["read"] <= 2
+    request = Request("GET", "http://test")
+    assert not deadline.caused(ConnectTimeout("connect", request=request))
+    assert deadline.caused(ReadTimeout("read", request=request))
+    # the trace callback shrinks the timeouts in place as each phase starts
+    deadline.expires -= 1.5
+    extensions["trace"]("http11.receive_response_headers.started", {})
+    assert extensions["timeout"]["read"] <= 0.5
+    assert deadline.caused(ConnectTimeout("connect", request=request))
+
+
+def test_deadline_exceeded_is_transient():
+    assert AbstractClient._is_transient_error(DeadlineExceededError("slow"))
+
+
+def test_client_ping_deadline(silent_server):
+    client = Client(ping_url=silent_server)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        client.success_ping(uuid="test", timeout=0.2)
+    assert time.monotonic() - start < 2
+
+
+def test_client_deadline_bounds_trickling_body(trickling_server):
+    client = Client(ping_url=trickling_server)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        client.success_ping(uuid="test", timeout=0.5)
+    assert time.monotonic() - start < 1
+
+
+@pytest.mark.asyncio
+async def test_async_client_deadline_bounds_trickling_body(trickling_server):
+    start = time.monotonic()
+    async with AsyncClient(ping_url=trickling_server) as client:
+        with pytest.raises(DeadlineExceededError):
+            await client.success_ping(uuid="test", timeout=0.5)
+    assert time.monotonic() - start < 1
+
+
+def test_client_timeout_of_replay_prewarm_and_dispatcher(silent_server, tmp_path):
+    spool = PingSpool(str(tmp_path / "pings.spool"))
+    spool.append("test", "", "", "spooled")
+    client = Client(ping_url=silent_server, spool=spool)
+    start = time.monotonic()
+    # the ping that ran out of its timeout stays in the spool
+    assert client.replay_spool(timeout=0.2) == (0, 1)
+    client.prewarm(timeout=0.2).join()
+    with PingDispatcher(client) as dispatcher:
+        with pytest.raises(DeadlineExceededError):
+            dispatcher.success_ping(uuid="test", timeout=0.2).result()
+    assert time.monotonic() - start < 3
+
+
+@pytest.mark.asyncio
+async def test_async_client_timeout_of_replay_prewarm_and_dispatcher(silent_server, tmp_path):
+    spool = PingSpool(str(tmp_path / "pings.spool"))
+    spool.append("test", "", "", "spooled")
+    start = time.monotonic()
+    async with AsyncClient(ping_url=silent_server, spool=spool) as client:
+        assert await client.replay_spool(timeout=0.2) == (0, 1)
+        await client.prewarm(timeout=0.2)
+        async with AsyncPingDispatcher(client) as dispatcher:
+            with pytest.raises(DeadlineExceededError):
+                await (await dispatcher.success_ping(uuid="test", timeout=0.2))
+    assert time.monotonic() - start < 3
+
+
+def test_client_default_timeout(silent_server):
+    client = Client(api_url=silent_server, default_timeout=0.2)
+    with pytest.raises(DeadlineExceededError):
+        client.get_checks()
+
+
+def test_client_shorter_httpx_timeout_is_not_a_deadline(silent_server):
+    client = Client(ping_url=silent_server, ping_timeout=0.1)
+    with pytest.raises(ReadTimeout):
+        client.success_ping(uuid="test", timeout=5)
+
+
+def test_check_trap_deadline(silent_server):
+    client = Client(ping_url=silent_server)
+    with pytest.raises(DeadlineExceededError):
+        with CheckTrap(client, uuid="test", timeout=0.2):
+            pass
+
+
+@pytest.mark.respx
+def test_client_deadline_bounds_retries(respx_mock):
+    client = Client(**client_kwargs, retry_policy=RetryPolicy(base_delay=1, max_delay=1))
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=503))
+    with pytest.raises(HCAPIError):
+        client.success_ping(uuid="test", timeout=0.5)
+    assert route.call_count == 1
+    assert client.retries == 0
+
+
+@pytest.mark.respx(assert_all_called=False)
+def test_client_deadline_bounds_rate_limit_wait(respx_mock):
+    client = Client(**client_kwargs, ping_rate_limit=TokenBucket(rate=0.1))
+    respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=200, text="OK"))
+    assert client.success_ping(uuid="test", timeout=1) == (True, "OK")
+    with pytest.raises(DeadlineExceededError):
+        client.success_ping(uuid="test", timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_async_client_deadline(silent_server):
+    start = time.monotonic()
+    async with AsyncClient(ping_url=silent_server, api_url=silent_server, default_timeout=0.2) as client:
+        with pytest.raises(DeadlineExceededError):
+            await client.success_ping(uuid="test")
+        with pytest.raises(DeadlineExceededError):
+            await client.get_checks(timeout=0.2)
+        with pytest.raises(DeadlineExceededError):
+            async with CheckTrap(client, uuid="test", timeout=0.2):
+                pass
+    assert time.monotonic() - start < 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx(assert_all_called=False)
+async def test_async_client_deadline_bounds_retries_and_waits(respx_mock):
+    client = AsyncClient(
+        **client_kwargs, retry_policy=RetryPolicy(base_delay=1, max_delay=1), ping_rate_limit=TokenBucket(rate=0.1)
+    )
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=503))
+    with pytest.raises(HCAPIError):
+        await client.success_ping(uuid="test", timeout=0.5)
+    assert route.call_count == 1
+    with pytest.raises(DeadlineExceededError):
+        await client.success_ping(uuid="test", timeout=0.5)
+
+
+def half_open_breaker():
+    breaker = CircuitBreaker(min_calls=1, probe_interval=0)
+    breaker.record_failure()
+    return breaker
+
+
+@pytest.mark.respx
+def test_client_deadline_in_stream_wait_keeps_probing(respx_mock):
+    breaker = half_open_breaker()
+    client = Client(**client_kwargs, ping_circuit_breaker=breaker, ping_max_streams=1)
+    respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=200, text="OK"))
+    client._ping_streams.acquire()
+    with pytest.raises(DeadlineExceededError):
+        client.success_ping(uuid="test", timeout=0.05)
+    assert breaker.state == "half-open"
+    client._ping_streams.release()
+    assert client.success_ping(uuid="test") == (True, "OK")
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_client_deadline_in_waits_keeps_probing(respx_mock):
+    breaker = half_open_breaker()
+    client = AsyncClient(**client_kwargs, ping_circuit_breaker=breaker, ping_max_streams=1)
+    respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=200, text="OK"))
+    streams = client._streams(True)
+    await streams.acquire()
+    # the deadline cancels the probe while it waits for a stream
+    with pytest.raises(DeadlineExceededError):
+        await client.success_ping(uuid="test", timeout=0.05)
+    assert breaker.state == "half-open"
+    streams.release()
+    # and while it waits on the rate limiter, which it can't wait out
+    client._ping_rate_limit = TokenBucket(rate=0.1)
+    client._ping_rate_limit.reserve()
+    with pytest.raises(DeadlineExceededError):
+        await client.success_ping(uuid="test", timeout=0.5)
+    assert breaker.state == "half-open"
+    client._ping_rate_limit = None
+    assert await client.success_ping(uuid="test") == (True, "OK")
+    assert breaker.state == "closed"
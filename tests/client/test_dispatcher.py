@@ -0,0 +1,204 @@
+import asyncio
+import threading
+from urllib.parse import urljoin
+
+import pytest
+from httpx import Response
+
+from healthchecks_io import AsyncPingDispatcher
+from healthchecks_io import CheckNotFoundError
+from healthchecks_io import PingDispatcher
+from healthchecks_io import PingQueueClosedError
+from healthchecks_io import PingQueueFullError
+
+
+def test_async_dispatcher_requires_workers(test_async_client):
+    with pytest.raises(ValueError):
+        AsyncPingDispatcher(test_async_client, workers=0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_dispatcher_pings(respx_mock, test_async_client):
+    respx_mock.post(urljoin(test_async_client._ping_url, "test")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    respx_mock.post(urljoin(test_async_client._ping_url, "test/start")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    respx_mock.post(urljoin(test_async_client._ping_url, "test/fail")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    respx_mock.post(urljoin(test_async_client._ping_url, "test/3")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    async with AsyncPingDispatcher(test_async_client, workers=2) as dispatcher:
+        futures = [
+            await dispatcher.start_ping(uuid="test"),
+            await dispatcher.success_ping(uuid="test"),
+            await dispatcher.fail_ping(uuid="test"),
+            await dispatcher.exit_code_ping(3, uuid="test"),
+            await dispatcher.start_ping(uuid="test", rid="run-1"),
+        ]
+        assert await dispatcher.flush(timeout=5)
+        assert dispatcher.qsize == 0
+    for future in futures:
+        assert await future == (True, "OK")
+    assert dispatcher.sent == 5
+    assert [call.request.url.params.get("rid") for call in respx_mock.calls].count("run-1") == 1
+    assert dispatcher.failed == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_dispatcher_ping_exception(respx_mock, test_async_client):
+    respx_mock.post(urljoin(test_async_client._ping_url, "test")).mock(return_value=Response(status_code=404))
+    dispatcher = AsyncPingDispatcher(test_async_client, workers=1)
+    future = await dispatcher.success_ping(uuid="test")
+    # fire and forget pings should not need their result retrieved
+    await dispatcher.success_ping(uuid="test")
+    assert await dispatcher.aclose(timeout=5)
+    with pytest.raises(CheckNotFoundError):
+        await future
+    assert dispatcher.failed == 2
+
+
+@pytest.mark.asyncio
+async def test_async_dispatcher_closed(test_async_client):
+    dispatcher = AsyncPingDispatcher(test_async_client)
+    assert await dispatcher.flush()
+    assert await dispatcher.aclose()
+    with pytest.raises(PingQueueClosedError):
+        await dispatcher.success_ping(uuid="test")
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx(assert_all_called=False)
+async def test_async_dispatcher_close_deadline(respx_mock, test_async_client):
+    async def slow_response(request):
+        await asyncio.sleep(10)
+        return Response(status_code=200, text="OK")  # pragma: no cover
+
+    respx_mock.post(urljoin(test_async_client._ping_url, "test")).mock(side_effect=slow_response)
+    dispatcher = AsyncPingDispatcher(test_async_client, workers=1, max_queue_size=5)
+    in_flight = await dispatcher.success_ping(uuid="test")
+    queued = await dispatcher.success_ping(uuid="test")
+    await asyncio.sleep(0)
+    assert dispatcher.qsize == 1
+    assert not await dispatcher.aclose(timeout=0.05)
+    assert in_flight.cancelled()
+    assert queued.cancelled()
+
+
+def test_dispatcher_validates_arguments(test_client):
+    with pytest.raises(ValueError):
+        PingDispatcher(test_client, workers=0)
+    with pytest.raises(ValueError):
+        PingDispatcher(test_client, overflow="explode")
+
+
+@pytest.mark.respx
+def test_dispatcher_pings(respx_mock, test_client):
+    for path in ("test", "test/start", "test/fail", "test/3"):
+        respx_mock.post(urljoin(test_client._ping_url, path)).mock(return_value=Response(status_code=200, text="OK"))
+    with PingDispatcher(test_client, workers=2) as dispatcher:
+        futures = [
+            dispatcher.start_ping(uuid="test"),
+            dispatcher.success_ping(uuid="test"),
+            dispatcher.fail_ping(uuid="test"),
+            dispatcher.exit_code_ping(3, uuid="test"),
+            dispatcher.success_ping(uuid="test", rid="run-1"),
+        ]
+        assert dispatcher.flush(timeout=5)
+        assert dispatcher.qsize == 0
+    for future in futures:
+        assert future.result(timeout=5) == (True, "OK")
+    assert dispatcher.sent == 5
+    assert [call.request.url.params.get("rid") for call in respx_mock.calls].count("run-1") == 1
+    with pytest.raises(PingQueueClosedError):
+        dispatcher.success_ping(uuid="test")
+
+
+@pytest.mark.respx
+def test_dispatcher_ping_exception(respx_mock, test_client):
+    respx_mock.post(urljoin(test_client._ping_url, "test")).mock(return_value=Response(status_code=404))
+    dispatcher = PingDispatcher(test_client, workers=1)
+    future = dispatcher.success_ping(uuid="test")
+    assert dispatcher.close(timeout=5)
+    with pytest.raises(CheckNotFoundError):
+        future.result(timeout=5)
+    assert dispatcher.failed == 1
+
+
+def _blocking_route(respx_mock, test_client):
+    """Mocks the test ping url with a route that blocks until the returned event is set."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocked_response(request):
+        started.set()
+        release.wait(5)
+        return Response(status_code=200, text=request.content.decode())
+
+    respx_mock.post(urljoin(test_client._ping_url, "test")).mock(side_effect=blocked_response)
+    return started, release
+
+
+@pytest.mark.respx
+def test_dispatcher_drop(respx_mock, test_client):
+    started, release = _blocking_route(respx_mock, test_client)
+    dispatcher = PingDispatcher(test_client, workers=1, max_queue_size=1, overflow="drop")
+    in_flight = dispatcher.success_ping(uuid="test", data="1")
+    assert started.wait(5)
+    queued = dispatcher.success_ping(uuid="test", data="2")
+    dropped = dispatcher.success_ping(uuid="test", data="3")
+    with pytest.raises(PingQueueFullError):
+        dropped.result(timeout=1)
+    release.set()
+    assert dispatcher.close(timeout=5)
+    assert in_flight.result(timeout=5) == (True, "1")
+    assert queued.result(timeout=5) == (True, "2")
+    assert dispatcher.dropped == 1
+
+
+@pytest.mark.respx
+def test_dispatcher_block_timeout(respx_mock, test_client):
+    started, release = _blocking_route(respx_mock, test_client)
+    dispatcher = PingDispatcher(test_client, workers=1, max_queue_size=1, block_timeout=0.01)
+    dispatcher.success_ping(uuid="test")
+    assert started.wait(5)
+    dispatcher.success_ping(uuid="test")
+    with pytest.raises(PingQueueFullError):
+        dispatcher.success_ping(uuid="test").result(timeout=1)
+    release.set()
+    assert dispatcher.close(timeout=5)
+
+
+@pytest.mark.respx
+def test_dispatcher_coalesce(respx_mock, test_client):
+    started, release = _blocking_route(respx_mock, test_client)
+    dispatcher = PingDispatcher(test_client, workers=1, max_queue_size=1, overflow="coalesce")
+    dispatcher.success_ping(uuid="test", data="1")
+    assert started.wait(5)
+    queued = dispatcher.success_ping(uuid="test", data="2")
+    coalesced = dispatcher.success_ping(uuid="test", data="3")
+    assert coalesced is queued
+    with pytest.raises(PingQueueFullError):
+        dispatcher.fail_ping(uuid="test").result(timeout=1)
+    release.set()
+    assert dispatcher.close(timeout=5)
+    assert queued.result(timeout=5) == (True, "3")
+    assert dispatcher.coalesced == 1
+    assert dispatcher.dropped == 1
+
+
+@pytest.mark.respx(assert_all_called=False)
+def test_dispatcher_close_timeout(respx_mock, test_client):
+    started, release = _blocking_route(respx_mock, test_client)
+    dispatcher = PingDispatcher(test_client, workers=1, max_queue_size=5)
+    dispatcher.success_ping(uuid="test")
+    assert started.wait(5)
+    queued = dispatcher.success_ping(uuid="test")
+    assert not dispatcher.close(timeout=0.01)
+    assert queued.cancelled()
+    release.set()
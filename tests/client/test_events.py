@@ -0,0 +1,97 @@
+from urllib.parse import urljoin
+
+import pytest
+from httpx import ConnectError
+from httpx import Response
+
+from healthchecks_io import AsyncClient
+from healthchecks_io import CheckNotFoundError
+from healthchecks_io import Client
+from healthchecks_io import PingSpool
+from healthchecks_io import RequestEvent
+from healthchecks_io import RetryPolicy
+from healthchecks_io.client.events import NO_RECORDER
+from tests.conftest import client_kwargs
+
+
+def test_no_listeners_no_event(test_client):
+    assert test_client._record("success_ping", True, "POST", "https://localhost/ping/test") is NO_RECORDER
+
+
+def test_event_host_and_phases():
+    event = RequestEvent("success_ping", True, "POST", "https://hc-ping.com:443/test")
+    assert event.host == "hc-ping.com"
+    trace = event.trace()
+    trace("connection.connect_tcp.started", {})
+    trace("connection.connect_tcp.complete", {})
+    trace("http11.receive_response_body.failed", {})
+    assert list(event.timings) == ["connect_tcp"]
+
+
+@pytest.mark.respx
+def test_client_listener(respx_mock):
+    client = Client(**client_kwargs, retry_policy=RetryPolicy(base_delay=0.001, max_delay=0.01))
+    events = list()
+    client.add_listener(events.append)
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(
+        side_effect=[Response(status_code=503), Response(status_code=200, text="OK")]
+    )
+    respx_mock.get(urljoin(client._api_url, "checks/test")).mock(return_value=Response(status_code=404))
+
+    assert client.success_ping(uuid="test", data="hello") == (True, "OK")
+    with pytest.raises(CheckNotFoundError):
+        client.get_check("test")
+
+    ping, check = events
+    assert (ping.operation, ping.ping, ping.method, ping.host) == ("success_ping", True, "POST", "localhost")
+    assert (ping.status, ping.exception, ping.attempts) == (200, None, 2)
+    assert (ping.bytes_sent, ping.bytes_received) == (5, 2)
+    assert ping.elapsed > 0
+    assert (check.operation, check.ping, check.status, check.exception) == ("get_check", False, 404, CheckNotFoundError)
+
+    client.remove_listener(events.append)
+    route.mock(return_value=Response(status_code=200, text="OK"))
+    client.success_ping(uuid="test")
+    assert len(events) == 2
+
+
+@pytest.mark.respx
+def test_client_listener_spooled(respx_mock, tmp_path):
+    client = Client(**client_kwargs, spool=PingSpool(str(tmp_path / "pings.spool")))
+    events = list()
+    client.add_listener(events.append)
+    respx_mock.post(urljoin(client._ping_url, "test/fail")).mock(side_effect=ConnectError("down"))
+    client.fail_ping(uuid="test")
+    assert (events[0].operation, events[0].spooled, events[0].exception) == ("fail_ping", True, ConnectError)
+
+
+def test_client_listener_timings(local_server):
+    client = Client(ping_url=local_server)
+    events = list()
+    client.add_listener(events.append)
+    assert client.start_ping(uuid="test") == (True, "OK")
+    assert {"connect_tcp", "send_request_headers", "receive_response_headers"} <= set(events[0].timings)
+
+
+@pytest.mark.asyncio
+async def test_async_client_listener_timings(local_server):
+    events = list()
+    async with AsyncClient(ping_url=local_server) as client:
+        client.add_listener(events.append)
+        assert await client.exit_code_ping(3, uuid="test") == (True, "OK")
+    assert events[0].operation == "exit_code_ping"
+    assert events[0].status == 200
+    assert {"connect_tcp", "send_request_headers", "receive_response_headers"} <= set(events[0].timings)
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_client_listener(respx_mock):
+    client = AsyncClient(**client_kwargs)
+    events = list()
+    client.add_listener(events.append)
+    respx_mock.get(urljoin(client._api_url, "checks/")).mock(
+        return_value=Response(status_code=200, json={"checks": []})
+    )
+    assert await client.get_checks() == []
+    assert (events[0].operation, events[0].status, events[0].attempts) == ("get_checks", 200, 1)
@@ -0,0 +1,113 @@
+import asyncio
+import multiprocessing
+import os
+from urllib.parse import urljoin
+
+import pytest
+from httpx import Client as HTTPXClient
+from httpx import Response
+
+from healthchecks_io import AsyncClient
+from healthchecks_io import AsyncPingDispatcher
+from healthchecks_io import Client
+from healthchecks_io import PingDispatcher
+from healthchecks_io import SlugResolver
+from tests.conftest import client_kwargs
+
+requires_fork = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+
+# created before the pool forks, like a client made at import time in a pre-fork server
+CLIENT = None
+
+
+def ping_from_child(uuid):
+    return os.getpid(), CLIENT.success_ping(uuid=uuid), CLIENT._pid == os.getpid()
+
+
+@requires_fork
+def test_client_after_os_fork(local_server):
+    client = Client(ping_url=local_server)
+    # the parent has a keep-alive connection open when it forks
+    assert client.success_ping(uuid="parent") == (True, "OK")
+    parent_clients = (client._client, client._ping_client)
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        try:
+            ok = client.success_ping(uuid="child") == (True, "OK")
+            ok = ok and client._ping_client is not parent_clients[1] and client._client is not parent_clients[0]
+        except BaseException:
+            ok = False
+        os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert (client._client, client._ping_client) == parent_clients
+    assert client.success_ping(uuid="parent") == (True, "OK")
+
+
+@requires_fork
+def test_client_in_process_pool(local_server):
+    global CLIENT
+    CLIENT = Client(ping_url=local_server)
+    assert CLIENT.success_ping(uuid="parent") == (True, "OK")
+    try:
+        with multiprocessing.get_context("fork").Pool(2) as pool:
+            results = pool.map(ping_from_child, [f"check-{index}" for index in range(8)])
+    finally:
+        CLIENT = None
+    assert all(pid != os.getpid() for pid, _, _ in results)
+    assert all(result == (True, "OK") and rebuilt for _, result, rebuilt in results)
+
+
+@pytest.mark.respx
+def test_client_rebuilds_only_its_own_httpx_clients(respx_mock):
+    httpx_client = HTTPXClient()
+    client = Client(**client_kwargs, client=httpx_client, slug_resolver=SlugResolver())
+    client._slug_resolver._refreshing = True
+    respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=200, text="OK"))
+    client._pid = -1
+    assert client.success_ping(uuid="test") == (True, "OK")
+    assert client._client is httpx_client and client._ping_client is httpx_client
+    assert not client._slug_resolver._refreshing
+
+    client = Client(**client_kwargs)
+    api_client = client._client
+    client._pid = -1
+    assert client.success_ping(uuid="test") == (True, "OK")
+    assert client._client is not api_client
+    assert client._client.headers["X-Api-Key"] == "test"
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_client_rebuilds_after_fork(respx_mock):
+    client = AsyncClient(**client_kwargs)
+    respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=200, text="OK"))
+    ping_client = client._ping_client
+    client._pid = -1
+    assert await client.success_ping(uuid="test") == (True, "OK")
+    assert client._ping_client is not ping_client
+    assert client._ping_client.headers["user-agent"] == ping_client.headers["user-agent"]
+
+
+def test_dispatcher_drops_parent_queue_after_fork():
+    dispatcher = PingDispatcher(Client(**client_kwargs))
+    dispatcher._queue.put_nowait(None)
+    dispatcher._threads = ["a worker thread of the parent"]
+    dispatcher._pid = -1
+    assert dispatcher.flush(timeout=0.1)
+    assert dispatcher.qsize == 0
+    assert dispatcher._threads == []
+
+
+@pytest.mark.asyncio
+async def test_async_dispatcher_drops_parent_queue_after_fork():
+    dispatcher = AsyncPingDispatcher(AsyncClient(**client_kwargs))
+    parent_queue = dispatcher._ensure_started()
+    parent_tasks = dispatcher._tasks
+    dispatcher._pid = -1
+    assert dispatcher._ensure_started() is not parent_queue
+    assert not set(dispatcher._tasks) & set(parent_tasks)
+    await dispatcher.aclose()
+    for task in parent_tasks:
+        task.cancel()
+    await asyncio.gather(*parent_tasks, return_exceptions=True)
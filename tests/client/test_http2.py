@@ -0,0 +1,97 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from healthchecks_io import AsyncClient
+from healthchecks_io import Client
+from healthchecks_io import DeadlineExceededError
+from healthchecks_io.client._abstract import H2_MISSING
+from tests.conftest import client_kwargs
+
+try:
+    import h2  # noqa: F401
+
+    HAS_H2 = True
+except ImportError:  # pragma: no cover
+    HAS_H2 = False
+requires_h2 = pytest.mark.skipif(not HAS_H2, reason="needs h2")
+
+
+@requires_h2
+def test_http2_is_passed_to_httpx():
+    client = Client(**client_kwargs, http2=True)
+    assert client._ping_client._transport._pool._http2
+    assert client._client._transport._pool._http2
+    assert not Client(**client_kwargs)._ping_client._transport._pool._http2
+
+
+@requires_h2
+def test_async_http2_is_passed_to_httpx():
+    client = AsyncClient(**client_kwargs, http2=True)
+    assert client._ping_client._transport._pool._http2
+    assert client._client._transport._pool._http2
+
+
+@pytest.mark.parametrize("module", ["sync_client", "async_client"])
+def test_http2_without_h2(monkeypatch, module):
+    monkeypatch.setattr(f"healthchecks_io.client.{module}.find_spec", lambda name: None)
+    client_class = Client if module == "sync_client" else AsyncClient
+    with pytest.raises(ImportError, match="healthchecks-io\\[http2\\]") as excinfo:
+        client_class(**client_kwargs, http2=True)
+    assert str(excinfo.value) == H2_MISSING
+    client_class(**client_kwargs)
+
+
+def test_max_streams(local_server):
+    client = Client(ping_url=local_server, ping_max_streams=2, api_max_streams=1)
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda index: client.success_ping(uuid=f"check-{index}"), range(16)))
+    assert results == [(True, "OK")] * 16
+    # every slot was given back
+    assert client._ping_streams._value == 2
+    assert client._api_streams._value == 1
+
+
+def test_max_streams_wait_within_deadline(local_server):
+    client = Client(ping_url=local_server, ping_max_streams=1)
+    client._ping_streams.acquire()
+    with pytest.raises(DeadlineExceededError):
+        client.success_ping(uuid="test", timeout=0.05)
+    client._ping_streams.release()
+    assert client.success_ping(uuid="test", timeout=1) == (True, "OK")
+
+
+def test_max_streams_released_on_error():
+    client = Client(ping_url="http://127.0.0.1:1/", ping_max_streams=1)
+    for _ in range(2):
+        with pytest.raises(Exception):
+            client.success_ping(uuid="test", timeout=1)
+    assert client._ping_streams._value == 1
+
+
+def test_max_streams_after_fork():
+    client = Client(**client_kwargs, ping_max_streams=1)
+    client._ping_streams.acquire()
+    client._after_fork()
+    assert client._ping_streams._value == 1
+    assert client._api_streams is None
+
+
+@pytest.mark.asyncio
+async def test_async_max_streams(local_server):
+    client = AsyncClient(ping_url=local_server, ping_max_streams=2, api_max_streams=1)
+    assert client._ping_streams is None
+    results = await asyncio.gather(*(client.success_ping(uuid=f"check-{index}") for index in range(16)))
+    assert results == [(True, "OK")] * 16
+    assert client._ping_streams._value == 2
+    assert client._streams(False)._value == 1
+    await client._ping_streams.acquire()
+    await client._ping_streams.acquire()
+    with pytest.raises(DeadlineExceededError):
+        await client.success_ping(uuid="test", timeout=0.05)
+    client._ping_streams.release()
+    client._ping_streams.release()
+    assert await client.success_ping(uuid="test") == (True, "OK")
+    client._after_fork()
+    assert client._ping_streams is None
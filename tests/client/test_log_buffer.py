@@ -0,0 +1,73 @@
+import pytest
+
+from healthchecks_io import LogBuffer
+
+
+def test_log_buffer_under_cap():
+    log = LogBuffer()
+    assert log.getvalue() == ""
+    assert log.lines() == []
+    log.append("first")
+    log.append("")
+    log.append("ünïcode")
+    assert log.getvalue() == "first\n\nünïcode"
+    assert log.lines() == ["first", "", "ünïcode"]
+    assert log.nbytes == len("first\n\nünïcode\n".encode("utf-8"))
+    assert log.elided_lines == 0
+
+
+def test_log_buffer_keeps_head_and_tail():
+    log = LogBuffer(max_bytes=1000, head_bytes=100)
+    for index in range(10000):
+        log.append(f"line {index:05d}")
+    body = log.getvalue()
+    assert len(body.encode("utf-8")) <= 1000
+    lines = log.lines()
+    # the head is the first lines, the tail the last ones, in order, around the marker
+    assert lines[:3] == ["line 00000", "line 00001", "line 00002"]
+    assert lines[-1] == "line 09999"
+    marker = next(line for line in lines if line.startswith("[..."))
+    assert marker == f"[... {log.elided_lines} lines, {log.elided_bytes} bytes elided ...]"
+    kept = [line for line in lines if line != marker]
+    assert len(kept) + log.elided_lines == 10000
+    assert kept == sorted(kept)
+    assert log.nbytes <= 1000 - 80
+
+
+def test_log_buffer_clear():
+    log = LogBuffer(max_bytes=200, head_bytes=0)
+    for index in range(100):
+        log.append(f"line {index}")
+    log.clear()
+    assert (log.lines(), log.nbytes, log.elided_lines, log.elided_bytes) == ([], 0, 0, 0)
+    log.append("again")
+    assert log.getvalue() == "again"
+
+
+def test_log_buffer_never_grows_past_cap():
+    log = LogBuffer(max_bytes=300)
+    for index in range(500):
+        log.append("é" * (index % 97))
+        assert len(log.getvalue().encode("utf-8")) <= 300
+
+
+def test_log_buffer_long_line_keeps_its_end():
+    log = LogBuffer(max_bytes=200, head_bytes=0)
+    log.append("ü" * 200 + "end!")
+    body = log.getvalue()
+    assert body.endswith("üend!")
+    assert "�" not in body
+    assert len(body.encode("utf-8")) <= 200
+    assert log.elided_lines == 0 and log.elided_bytes > 0
+
+
+def test_log_buffer_arguments():
+    with pytest.raises(ValueError):
+        LogBuffer(max_bytes=100)
+    with pytest.raises(ValueError):
+        LogBuffer(head_bytes=-1)
+    # the head takes at most the whole budget, leaving no tail
+    log = LogBuffer(max_bytes=200, head_bytes=1000)
+    log.append("x" * 100)
+    log.append("y" * 50)
+    assert log.lines() == ["x" * 100, "[... 1 lines, 51 bytes elided ...]"]
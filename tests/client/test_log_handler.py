@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import threading
+from urllib.parse import urljoin
+
+import pytest
+from httpx import Response
+
+from healthchecks_io import CheckTrap
+from healthchecks_io import LogBuffer
+from healthchecks_io import LogBufferHandler
+
+
+class CountingFormatter(logging.Formatter):
+    calls = 0
+
+    def format(self, record):
+        CountingFormatter.calls += 1
+        return super().format(record)
+
+
+@pytest.fixture
+def job_logger():
+    logger = logging.getLogger("healthchecks_io.tests.job")
+    logger.setLevel(logging.DEBUG)
+    yield logger
+    logger.handlers.clear()
+
+
+def test_handler_formats_only_kept_records(job_logger):
+    CountingFormatter.calls = 0
+    buffer = LogBuffer()
+    handler = LogBufferHandler(buffer, logging.WARNING, CountingFormatter("%(levelname)s %(message)s"))
+    job_logger.addHandler(handler)
+    for index in range(100):
+        job_logger.debug("item %d", index)
+    job_logger.warning("item %d failed", 7)
+    assert CountingFormatter.calls == 1
+    assert buffer.lines() == ["WARNING item 7 failed"]
+
+
+def test_handler_default_format_and_errors(job_logger):
+    buffer = LogBuffer()
+    handler = LogBufferHandler(buffer)
+    job_logger.addHandler(handler)
+    job_logger.info("done")
+    assert buffer.getvalue().endswith(" INFO healthchecks_io.tests.job done")
+    # a record that can't be formatted goes to handleError instead of raising
+    handler.handle(job_logger.makeRecord(job_logger.name, logging.INFO, __file__, 1, "%d", ("a",), None))
+    assert len(buffer.lines()) == 1
+
+
+def test_handler_from_threads(job_logger):
+    buffer = LogBuffer()
+    job_logger.addHandler(LogBufferHandler(buffer, formatter=logging.Formatter("%(message)s")))
+
+    def work(worker):
+        for index in range(500):
+            job_logger.info("%d-%d", worker, index)
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(buffer.lines()) == sorted(f"{worker}-{index}" for worker in range(8) for index in range(500))
+
+
+@pytest.mark.respx
+def test_check_trap_captures_logging(respx_mock, test_client, job_logger):
+    respx_mock.post(urljoin(test_client._ping_url, "test/start")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    fail = respx_mock.post(urljoin(test_client._ping_url, "test/fail")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    job_logger.info("before the block")
+    with pytest.raises(RuntimeError):
+        with CheckTrap(
+            test_client,
+            uuid="test",
+            log_level=logging.INFO,
+            logger=job_logger.name,
+            log_formatter=logging.Formatter("%(levelname)s %(message)s"),
+        ) as trap:
+            job_logger.debug("too chatty")
+            job_logger.info("working")
+            trap.add_log("by hand")
+            raise RuntimeError("broke")
+    assert job_logger.handlers == []
+    job_logger.info("after the block")
+    assert fail.calls.last.request.content.startswith(b"INFO working\nby hand\nbroke")
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_check_traps_capture_their_own_task(respx_mock, test_async_client, job_logger):
+    respx_mock.post(url__regex=r".*/start$").mock(return_value=Response(status_code=200, text="OK"))
+    success = respx_mock.post(url__regex=r".*/job-\d$").mock(return_value=Response(status_code=200, text="OK"))
+
+    async def job(name):
+        async with CheckTrap(
+            test_async_client, uuid=name, log_level=logging.INFO, logger=job_logger, log_formatter=logging.Formatter()
+        ):
+            for index in range(3):
+                job_logger.info("%s step %d", name, index)
+                await asyncio.sleep(0)
+            # tasks the job starts log into its trap too
+            await asyncio.ensure_future(asyncio.sleep(0, job_logger.info("%s subtask", name)))
+
+    await asyncio.gather(job("job-1"), job("job-2"))
+    bodies = {call.request.url.path.rsplit("/", 1)[-1]: call.request.content for call in success.calls}
+    for name in ("job-1", "job-2"):
+        assert bodies[name].decode().split("\n") == [f"{name} step {index}" for index in range(3)] + [f"{name} subtask"]
+    assert job_logger.handlers == []
+
+
+def test_bound_handler_ignores_other_contexts(job_logger):
+    buffer = LogBuffer()
+    handler = LogBufferHandler(buffer, formatter=logging.Formatter("%(message)s"))
+    job_logger.addHandler(handler)
+    token = handler.bind()
+    job_logger.info("bound context")
+    thread = threading.Thread(target=job_logger.info, args=("another thread",))
+    thread.start()
+    thread.join()
+    handler.unbind(token)
+    job_logger.info("unbound")
+    assert buffer.lines() == ["bound context"]
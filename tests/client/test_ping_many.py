@@ -0,0 +1,62 @@
+from urllib.parse import urljoin
+
+import pytest
+from httpx import ConnectError
+from httpx import Response
+
+from healthchecks_io import AsyncClient
+from healthchecks_io import CheckNotFoundError
+from healthchecks_io import Client
+from tests.conftest import client_kwargs
+
+
+def test_ping_many_validates_kind(test_client):
+    with pytest.raises(ValueError):
+        test_client.ping_many(["a"], kind="finish")
+    with pytest.raises(ValueError):
+        test_client.ping_many(["a"], kind="exit_code")
+    assert test_client.ping_many() == {}
+
+
+def test_ping_many_rejects_duplicates(test_client):
+    with pytest.raises(ValueError):
+        test_client.ping_many(["a", "b", "a"])
+    with pytest.raises(ValueError):
+        test_client.ping_many(["a"], ["a"])
+
+
+@pytest.mark.asyncio
+async def test_async_ping_many_rejects_duplicates():
+    client = AsyncClient(**client_kwargs)
+    with pytest.raises(ValueError):
+        await client.ping_many(slugs=["backup", "backup"])
+
+
+@pytest.mark.respx
+def test_client_ping_many(respx_mock):
+    client = Client(**client_kwargs)
+    respx_mock.post(urljoin(client._ping_url, "a/fail")).mock(return_value=Response(status_code=200, text="OK"))
+    respx_mock.post(urljoin(client._ping_url, "gone/fail")).mock(return_value=Response(status_code=404))
+    respx_mock.post(urljoin(client._ping_url, f"{client._ping_key}/slug/fail")).mock(side_effect=ConnectError("down"))
+    results = client.ping_many(["a", "gone"], ["slug"], kind="fail", data="etl failed", concurrency=2)
+    assert results["a"] == (True, "OK")
+    assert isinstance(results["gone"], CheckNotFoundError)
+    assert isinstance(results["slug"], ConnectError)
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_client_ping_many(respx_mock):
+    client = AsyncClient(**client_kwargs)
+    routes = [
+        respx_mock.post(urljoin(client._ping_url, f"check{index}/3")).mock(
+            return_value=Response(status_code=200, text="OK")
+        )
+        for index in range(10)
+    ]
+    respx_mock.post(urljoin(client._ping_url, "gone/3")).mock(return_value=Response(status_code=404))
+    uuids = [f"check{index}" for index in range(10)] + ["gone"]
+    results = await client.ping_many(uuids, kind="exit_code", exit_code=3, concurrency=3)
+    assert [results[f"check{index}"] for index in range(10)] == [(True, "OK")] * 10
+    assert isinstance(results["gone"], CheckNotFoundError)
+    assert all(route.call_count == 1 for route in routes)
@@ -0,0 +1,72 @@
+import threading
+
+import pytest
+from httpx import Response
+
+from healthchecks_io import AsyncClient
+from healthchecks_io import Client
+from tests.conftest import client_kwargs
+
+
+def test_client_creates_httpx_clients_on_first_use(local_server):
+    client = Client(ping_url=local_server)
+    assert client._api_httpx is None and client._ping_httpx is None
+    assert not client.is_closed
+    assert client.success_ping(uuid="test") == (True, "OK")
+    assert client._api_httpx is None and client._ping_httpx is not None
+    client._finalizer_method()
+    assert client.is_closed
+    with pytest.raises(RuntimeError):
+        client.get_checks()
+
+
+def test_client_prewarm(local_server):
+    client = Client(api_key="test", ping_url=local_server, api_url=local_server)
+    events = list()
+    client.add_listener(events.append)
+    client.prewarm().join()
+    assert client._api_httpx is not None
+    assert client.success_ping(uuid="test") == (True, "OK")
+    # the ping went out on the prewarmed keep-alive connection
+    assert "connect_tcp" not in events[0].timings
+    assert "receive_response_headers" in events[0].timings
+    client._finalizer_method()
+
+
+def test_client_prewarm_targets():
+    client = Client()
+    assert client._prewarm_targets(True, None) == [(True, "https://hc-ping.com/")]
+    assert client._prewarm_targets(False, True) == [(False, "https://healthchecks.io/api/v1/")]
+    # prewarming an unreachable host is not an error
+    Client(ping_url="http://127.0.0.1:1/").prewarm().join()
+
+
+@pytest.mark.respx(assert_all_called=False)
+def test_client_closed_during_prewarm(respx_mock, monkeypatch):
+    errors = list()
+    monkeypatch.setattr(threading, "excepthook", errors.append)
+    client = Client(**client_kwargs)
+
+    def close(request):
+        client._finalizer_method()
+        return Response(status_code=200)
+
+    ping_route = respx_mock.head(client._ping_url).mock(side_effect=close)
+    api_route = respx_mock.head(client._api_url).mock(return_value=Response(status_code=200))
+    client.prewarm(api=True).join()
+    assert ping_route.called
+    assert not api_route.called
+    assert errors == []
+
+
+@pytest.mark.asyncio
+async def test_async_client_prewarm(local_server):
+    events = list()
+    async with AsyncClient(api_key="test", ping_url=local_server, api_url=local_server) as client:
+        assert client._ping_httpx is None
+        client.add_listener(events.append)
+        await client.prewarm()
+        assert client._api_httpx is not None
+        assert await client.success_ping(uuid="test") == (True, "OK")
+    assert "connect_tcp" not in events[0].timings
+    assert client.is_closed
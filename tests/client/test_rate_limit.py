@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+from urllib.parse import urljoin
+
+import pytest
+from httpx import Response
+
+from healthchecks_io import AsyncClient
+from healthchecks_io import Client
+from healthchecks_io import DeadlineExceededError
+from healthchecks_io import TokenBucket
+from tests.conftest import client_kwargs
+
+
+def test_token_bucket_validates_arguments():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1, burst=0)
+
+
+def test_token_bucket_reserve():
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.09 < bucket.reserve() <= 0.1
+    # callers queue up behind each other
+    assert 0.19 < bucket.reserve() <= 0.2
+
+
+def test_token_bucket_refund():
+    bucket = TokenBucket(rate=10, burst=2)
+    bucket.reserve()
+    bucket.refund()
+    bucket.refund()
+    # never more than burst tokens
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.09 < bucket.reserve() <= 0.1
+    bucket.refund()
+    assert 0.09 < bucket.reserve() <= 0.1
+
+
+def test_token_bucket_threads():
+    bucket = TokenBucket(rate=1, burst=1)
+    waits = []
+
+    def reserve():
+        for _ in range(50):
+            waits.append(bucket.reserve())
+
+    threads = [threading.Thread(target=reserve) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # every reservation got its own slot, the last one waits for all the others
+    assert len(waits) == 200
+    assert 198 < max(waits) <= 199
+
+
+@pytest.mark.respx
+def test_client_rate_limited_pings(respx_mock):
+    bucket = TokenBucket(rate=50, burst=1)
+    client = Client(**client_kwargs, ping_rate_limit=bucket)
+    respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=200, text="OK"))
+    respx_mock.get(urljoin(client._api_url, "checks/")).mock(
+        return_value=Response(status_code=200, json={"checks": []})
+    )
+    start = time.monotonic()
+    for _ in range(3):
+        client.success_ping(uuid="test")
+    assert time.monotonic() - start >= 0.04
+    # the api host has its own bucket, none here
+    client.get_checks()
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_client_rate_limited_api(respx_mock):
+    bucket = TokenBucket(rate=50, burst=1)
+    client = AsyncClient(**client_kwargs, api_rate_limit=bucket)
+    respx_mock.get(urljoin(client._api_url, "checks/")).mock(
+        return_value=Response(status_code=200, json={"checks": []})
+    )
+    start = time.monotonic()
+    await asyncio.gather(*(client.get_checks() for _ in range(3)))
+    assert time.monotonic() - start >= 0.04
+
+
+@pytest.mark.respx
+def test_client_deadline_rejected_ping_refunds_token(respx_mock):
+    bucket = TokenBucket(rate=1, burst=1)
+    client = Client(**client_kwargs, ping_rate_limit=bucket)
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=200, text="OK"))
+    client.success_ping(uuid="test")
+    with pytest.raises(DeadlineExceededError):
+        client.success_ping(uuid="test", timeout=0.1)
+    # the rejected ping didn't keep its slot, the next caller only waits for the first ping's, not for two
+    assert bucket.reserve() <= 1.0
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_client_cancelled_wait_refunds_token(respx_mock):
+    bucket = TokenBucket(rate=1, burst=1)
+    client = AsyncClient(**client_kwargs, ping_rate_limit=bucket)
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=200, text="OK"))
+    await client.success_ping(uuid="test")
+    with pytest.raises(DeadlineExceededError):
+        await client.success_ping(uuid="test", timeout=0.1)
+    waiting = asyncio.ensure_future(client.success_ping(uuid="test"))
+    await asyncio.sleep(0.05)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert bucket.reserve() <= 1.0
+    assert route.call_count == 1
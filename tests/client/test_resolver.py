@@ -0,0 +1,171 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import pytest
+from httpx import Response
+
+from healthchecks_io import AsyncClient
+from healthchecks_io import Client
+from healthchecks_io import NonUniqueSlugError
+from healthchecks_io import SlugResolver
+from tests.conftest import client_kwargs
+
+
+@pytest.fixture
+def checks_json(fake_check_api_result):
+    def make(slug, uuid):
+        check = dict(fake_check_api_result)
+        check["slug"] = slug
+        check["ping_url"] = f"testhc.io/ping/{uuid}"
+        check["update_url"] = f"testhc.io/api/v1/checks/{uuid}"
+        return check
+
+    yield {"checks": [make("backup", "uuid-1"), make("report", "uuid-2"), make("report", "uuid-3")]}
+
+
+def test_resolver_update(fake_check):
+    resolver = SlugResolver()
+    read_only = fake_check.copy(update={"slug": "read-only", "uuid": None})
+    resolver.update([fake_check, fake_check, read_only])
+    assert resolver.lookup("Test Check") == "test-uuid"
+    assert resolver.lookup("read-only") == ""
+    assert resolver.duplicates == set()
+
+
+@pytest.mark.respx
+def test_client_resolver(checks_json, respx_mock):
+    resolver = SlugResolver()
+    client = Client(**client_kwargs, slug_resolver=resolver)
+    checks = respx_mock.get(urljoin(client._api_url, "checks/")).mock(
+        return_value=Response(status_code=200, json=checks_json)
+    )
+    by_uuid = respx_mock.post(urljoin(client._ping_url, "uuid-1/start")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    by_slug = respx_mock.post(urljoin(client._ping_url, "1234/new-check")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    assert client.start_ping(slug="backup") == (True, "OK")
+    assert client.success_ping(slug="new-check") == (True, "OK")
+    with pytest.raises(NonUniqueSlugError):
+        client.success_ping(slug="report")
+    assert resolver.duplicates == {"report"}
+    assert (checks.call_count, by_uuid.call_count, by_slug.call_count) == (1, 1, 1)
+
+
+@pytest.mark.respx
+def test_client_resolver_refreshes(checks_json, respx_mock):
+    resolver = SlugResolver(ttl=60)
+    client = Client(**client_kwargs, slug_resolver=resolver)
+    checks = respx_mock.get(urljoin(client._api_url, "checks/")).mock(return_value=Response(status_code=500))
+    respx_mock.post(urljoin(client._ping_url, "1234/backup")).mock(return_value=Response(status_code=200, text="OK"))
+    # loading failed, so the slug is pinged as is until the ttl passes
+    assert client.success_ping(slug="backup") == (True, "OK")
+    assert client.success_ping(slug="backup") == (True, "OK")
+    assert checks.call_count == 1
+    checks.mock(return_value=Response(status_code=200, json=checks_json))
+    resolver._loaded_at -= 60
+    # the refresh runs in a thread
+    resolver.resolve(client, "backup")
+    while resolver._refreshing:
+        time.sleep(0.01)
+    assert checks.call_count == 2
+    assert resolver.lookup("backup") == "uuid-1"
+
+
+@pytest.mark.respx
+def test_client_resolver_interrupted_load(checks_json, respx_mock):
+    resolver = SlugResolver()
+    client = Client(**client_kwargs, slug_resolver=resolver)
+
+    def interrupt(request):
+        raise KeyboardInterrupt
+
+    checks = respx_mock.get(urljoin(client._api_url, "checks/")).mock(side_effect=interrupt)
+    respx_mock.post(urljoin(client._ping_url, "uuid-1")).mock(return_value=Response(status_code=200, text="OK"))
+    with pytest.raises(KeyboardInterrupt):
+        client.success_ping(slug="backup")
+    # the next ping loads the index again
+    assert not resolver._refreshing
+    checks.mock(return_value=Response(status_code=200, json=checks_json))
+    assert client.success_ping(slug="backup") == (True, "OK")
+    assert resolver.lookup("backup") == "uuid-1"
+
+
+@pytest.mark.respx
+def test_client_resolver_pings_wait_for_first_load(checks_json, respx_mock):
+    resolver = SlugResolver()
+    # no ping key, a slug ping that didn't wait for the index would raise BadAPIRequestError
+    client = Client(
+        api_key="test", api_url=client_kwargs["api_url"], ping_url=client_kwargs["ping_url"], slug_resolver=resolver
+    )
+
+    def slow_checks(request):
+        time.sleep(0.3)
+        return Response(status_code=200, json=checks_json)
+
+    checks = respx_mock.get(urljoin(client._api_url, "checks/")).mock(side_effect=slow_checks)
+    route = respx_mock.post(urljoin(client._ping_url, "uuid-1")).mock(return_value=Response(status_code=200, text="OK"))
+    with ThreadPoolExecutor(3) as pool:
+        results = list(pool.map(lambda _: client.success_ping(slug="backup"), range(3)))
+    assert results == [(True, "OK")] * 3
+    assert (checks.call_count, route.call_count) == (1, 3)
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_client_resolver_pings_wait_for_first_load(checks_json, respx_mock):
+    resolver = SlugResolver()
+    client = AsyncClient(
+        api_key="test", api_url=client_kwargs["api_url"], ping_url=client_kwargs["ping_url"], slug_resolver=resolver
+    )
+
+    async def slow_checks(request):
+        await asyncio.sleep(0.3)
+        return Response(status_code=200, json=checks_json)
+
+    checks = respx_mock.get(urljoin(client._api_url, "checks/")).mock(side_effect=slow_checks)
+    route = respx_mock.post(urljoin(client._ping_url, "uuid-1")).mock(return_value=Response(status_code=200, text="OK"))
+    results = await asyncio.gather(*(client.success_ping(slug="backup") for _ in range(3)))
+    assert results == [(True, "OK")] * 3
+    assert (checks.call_count, route.call_count) == (1, 3)
+    assert await client.ping_many(slugs=["backup"]) == {"backup": (True, "OK")}
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_client_resolver_cancelled_load(checks_json, respx_mock):
+    resolver = SlugResolver()
+    client = AsyncClient(**client_kwargs, slug_resolver=resolver)
+
+    def cancel(request):
+        raise asyncio.CancelledError
+
+    checks = respx_mock.get(urljoin(client._api_url, "checks/")).mock(side_effect=cancel)
+    respx_mock.post(urljoin(client._ping_url, "uuid-1")).mock(return_value=Response(status_code=200, text="OK"))
+    with pytest.raises(asyncio.CancelledError):
+        await client.success_ping(slug="backup")
+    assert not resolver._refreshing
+    checks.mock(return_value=Response(status_code=200, json=checks_json))
+    assert await client.success_ping(slug="backup") == (True, "OK")
+    assert resolver.lookup("backup") == "uuid-1"
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_client_resolver(checks_json, respx_mock):
+    resolver = SlugResolver(ttl=60)
+    client = AsyncClient(**client_kwargs, slug_resolver=resolver)
+    checks = respx_mock.get(urljoin(client._api_url, "checks/")).mock(
+        return_value=Response(status_code=200, json=checks_json)
+    )
+    route = respx_mock.post(urljoin(client._ping_url, "uuid-1")).mock(return_value=Response(status_code=200, text="OK"))
+    assert await client.success_ping(slug="backup") == (True, "OK")
+    with pytest.raises(NonUniqueSlugError):
+        await client.fail_ping(slug="report")
+    resolver._loaded_at -= 60
+    assert await client.success_ping(slug="backup") == (True, "OK")
+    await resolver._task
+    assert (checks.call_count, route.call_count) == (2, 2)
@@ -0,0 +1,136 @@
+from email.utils import formatdate
+from time import time
+from urllib.parse import urljoin
+
+import pytest
+from httpx import ConnectError
+from httpx import ReadError
+from httpx import Request
+from httpx import Response
+
+from healthchecks_io import AsyncClient
+from healthchecks_io import CheckCreate
+from healthchecks_io import Client
+from healthchecks_io import HCAPIError
+from healthchecks_io import HCAPIRateLimitError
+from healthchecks_io import RetryPolicy
+from healthchecks_io.client.retry import parse_retry_after
+from tests.conftest import client_kwargs
+
+fast_policy = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.01)
+
+
+def test_retry_policy_validates_attempts():
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+
+def test_should_retry_response():
+    policy = RetryPolicy()
+    assert policy.should_retry_response(Response(status_code=503), idempotent=True)
+    assert not policy.should_retry_response(Response(status_code=503), idempotent=False)
+    assert policy.should_retry_response(Response(status_code=429), idempotent=False)
+    assert not policy.should_retry_response(Response(status_code=404), idempotent=True)
+
+
+def test_should_retry_error():
+    request = Request("GET", "http://test")
+    policy = RetryPolicy()
+    assert policy.should_retry_error(ReadError("read", request=request), idempotent=True)
+    assert not policy.should_retry_error(ReadError("read", request=request), idempotent=False)
+    assert policy.should_retry_error(ConnectError("connect", request=request), idempotent=False)
+    assert not RetryPolicy(retry_transport_errors=False).should_retry_error(
+        ConnectError("connect", request=request), idempotent=True
+    )
+
+
+def test_next_delay():
+    policy = RetryPolicy(max_attempts=3, deadline=10, base_delay=1, max_delay=5)
+    for _ in range(100):
+        assert 1 <= policy.next_delay(1, 4, 0) <= 5
+    assert policy.next_delay(3, 1, 0) is None
+    assert policy.next_delay(1, 1, 9.5) is None
+    retry_after = Response(status_code=429, headers={"Retry-After": "7"})
+    assert policy.next_delay(1, 0, 0, retry_after) == 7
+    assert RetryPolicy(respect_retry_after=False, max_delay=5).next_delay(1, 0, 0, retry_after) <= 5
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("-3") == 0
+    assert parse_retry_after("not a date") is None
+    assert 50 < parse_retry_after(formatdate(time() + 60, usegmt=True)) <= 60
+
+
+@pytest.mark.respx
+def test_client_retries_5xx(respx_mock):
+    client = Client(**client_kwargs, retry_policy=fast_policy)
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(
+        side_effect=[Response(status_code=503), Response(status_code=200, text="OK")]
+    )
+    assert client.success_ping(uuid="test") == (True, "OK")
+    assert route.call_count == 2
+    assert client.retries == 1
+
+
+@pytest.mark.respx
+def test_client_retries_exhausted(respx_mock):
+    client = Client(**client_kwargs, retry_policy=fast_policy)
+    route = respx_mock.get(urljoin(client._api_url, "checks/")).mock(return_value=Response(status_code=429))
+    with pytest.raises(HCAPIRateLimitError):
+        client.get_checks()
+    assert route.call_count == 3
+    assert client.retries == 2
+
+
+@pytest.mark.respx
+def test_client_retries_transport_errors(respx_mock):
+    client = Client(**client_kwargs, retry_policy=fast_policy)
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(side_effect=ReadError("boom"))
+    with pytest.raises(ReadError):
+        client.success_ping(uuid="test")
+    assert route.call_count == 3
+
+
+@pytest.mark.respx
+def test_client_create_check_not_retried_blindly(respx_mock):
+    client = Client(**client_kwargs, retry_policy=fast_policy)
+    route = respx_mock.post(urljoin(client._api_url, "checks/")).mock(return_value=Response(status_code=503))
+    with pytest.raises(HCAPIError):
+        client.create_check(CheckCreate(name="test"))
+    assert route.call_count == 1
+
+    route.side_effect = ReadError("boom")
+    with pytest.raises(ReadError):
+        client.create_check(CheckCreate(name="test"))
+    assert route.call_count == 2
+    assert client.retries == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_client_retries(respx_mock):
+    client = AsyncClient(**client_kwargs, retry_policy=fast_policy)
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(
+        side_effect=[ReadError("boom"), Response(status_code=500), Response(status_code=200, text="OK")]
+    )
+    assert await client.success_ping(uuid="test") == (True, "OK")
+    assert route.call_count == 3
+    assert client.retries == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_client_retries_exhausted(respx_mock):
+    client = AsyncClient(**client_kwargs, retry_policy=fast_policy)
+    respx_mock.get(urljoin(client._api_url, "checks/")).mock(return_value=Response(status_code=500))
+    with pytest.raises(HCAPIError):
+        await client.get_checks()
+    respx_mock.post(urljoin(client._ping_url, "test")).mock(side_effect=ReadError("boom"))
+    with pytest.raises(ReadError):
+        await client.success_ping(uuid="test")
+    respx_mock.post(urljoin(client._api_url, "checks/")).mock(side_effect=ReadError("boom"))
+    with pytest.raises(ReadError):
+        await client.create_check(CheckCreate(name="test"))
+    assert client.retries == 4
@@ -0,0 +1,218 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import pytest
+from httpx import ConnectError
+from httpx import Response
+
+from healthchecks_io import AsyncClient
+from healthchecks_io import Client
+from healthchecks_io import HCAPIError
+from healthchecks_io import PingSpool
+from healthchecks_io.client.spool import group_by_check
+from healthchecks_io.client.spool import SPOOLED
+from tests.conftest import client_kwargs
+
+
+@pytest.fixture
+def spool(tmp_path):
+    yield PingSpool(str(tmp_path / "pings.spool"))
+
+
+def test_spool_validates_fsync(tmp_path):
+    with pytest.raises(ValueError):
+        PingSpool(str(tmp_path / "pings.spool"), fsync="sometimes")
+
+
+@pytest.mark.parametrize("fsync", ["always", "interval", "never"])
+def test_spool_append_take(tmp_path, fsync):
+    spool = PingSpool(str(tmp_path / "pings.spool"), fsync=fsync)
+    assert spool.append("a", "", "", "one")
+    assert spool.append("a", "", "/fail", "two")
+    assert len(spool) == 2
+    entries = spool.take()
+    assert [entry["data"] for entry in entries] == ["one", "two"]
+    # taken pings are kept in the replay file until the replay finishes
+    assert len(spool) == 2
+    spool.finish_replay([])
+    assert len(spool) == 0
+
+
+def test_spool_max_bytes(tmp_path):
+    spool = PingSpool(str(tmp_path / "pings.spool"), max_bytes=150)
+    assert spool.append("a", "", "", "one")
+    assert not spool.append("a", "", "", "x" * 100)
+    assert len(spool) == 1
+
+
+def test_spool_unfinished_replay_comes_first(spool):
+    spool.append("a", "", "", "one")
+    spool.take()
+    spool.append("a", "", "", "two")
+    # the process replaying the spool crashed, the next one to open it finds the pings it was sending
+    spool = PingSpool(spool.path)
+    assert [entry["data"] for entry in spool.take()] == ["one", "two"]
+
+
+def test_spool_take_during_replay(spool):
+    spool.append("a", "", "", "one")
+    assert len(spool.take()) == 1
+    spool.append("a", "", "", "two")
+    # the running replay is sending "one", a second replay must not send it again
+    assert spool.take() == []
+    spool.finish_replay([])
+    assert [entry["data"] for entry in spool.take()] == ["two"]
+
+
+def test_spool_finish_replay_keeps_order(spool):
+    spool.append("a", "", "", "one")
+    spool.append("a", "", "", "two")
+    entries = spool.take()
+    spool.append("a", "", "", "three")
+    spool.finish_replay(entries[1:])
+    assert [entry["data"] for entry in spool.take()] == ["two", "three"]
+
+
+def test_spool_skips_torn_lines(spool):
+    spool.append("a", "", "", "one")
+    with open(spool.path, "ab") as spool_file:
+        spool_file.write(b'{"uuid": "a", "sl')
+    assert len(spool) == 1
+
+
+def test_group_by_check():
+    entries = [
+        {"uuid": "a", "slug": "", "data": "1"},
+        {"uuid": "", "slug": "b", "data": "2"},
+        {"uuid": "a", "slug": "", "data": "3"},
+    ]
+    assert [[entry["data"] for entry in group] for group in group_by_check(entries)] == [["1", "3"], ["2"]]
+
+
+@pytest.mark.respx
+def test_client_spools_failed_pings(respx_mock, spool):
+    client = Client(**client_kwargs, spool=spool)
+    respx_mock.post(urljoin(client._ping_url, "test")).mock(side_effect=ConnectError("down"))
+    respx_mock.post(urljoin(client._ping_url, "test/fail")).mock(return_value=Response(status_code=502))
+    assert client.success_ping(uuid="test", data="one") == (True, SPOOLED)
+    assert client.fail_ping(uuid="test", data="two") == (True, SPOOLED)
+    assert len(spool) == 2
+
+
+@pytest.mark.respx
+def test_client_raises_when_spool_full(respx_mock, tmp_path):
+    client = Client(**client_kwargs, spool=PingSpool(str(tmp_path / "pings.spool"), max_bytes=1))
+    respx_mock.post(urljoin(client._ping_url, "test")).mock(side_effect=ConnectError("down"))
+    respx_mock.post(urljoin(client._ping_url, "test/fail")).mock(return_value=Response(status_code=502))
+    with pytest.raises(ConnectError):
+        client.success_ping(uuid="test")
+    with pytest.raises(HCAPIError):
+        client.fail_ping(uuid="test")
+
+
+@pytest.mark.respx
+def test_client_replay_spool(respx_mock, spool):
+    client = Client(**client_kwargs, spool=spool)
+    assert Client(**client_kwargs).replay_spool() == (0, 0)
+    spool.append("a", "", "", "a1")
+    spool.append("b", "", "", "b1")
+    spool.append("a", "", "", "a2")
+    spool.append("b", "", "", "b2")
+    spool.append("gone", "", "", "gone")
+    respx_mock.post(urljoin(client._ping_url, "a")).mock(return_value=Response(status_code=200, text="OK"))
+    b_route = respx_mock.post(urljoin(client._ping_url, "b")).mock(
+        side_effect=[Response(status_code=200, text="OK"), Response(status_code=503)]
+    )
+    respx_mock.post(urljoin(client._ping_url, "gone")).mock(return_value=Response(status_code=404))
+
+    assert client.replay_spool(concurrency=2) == (3, 1)
+    assert b_route.call_count == 2
+    assert [entry["data"] for entry in spool.take()] == ["b2"]
+
+
+@pytest.mark.respx
+def test_client_concurrent_replays_send_each_ping_once(respx_mock, spool):
+    client = Client(**client_kwargs, spool=spool)
+    spool.append("test", "", "", "one")
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_ok(request):
+        started.set()
+        release.wait(5)
+        return Response(status_code=200, text="OK")
+
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(side_effect=slow_ok)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        first = executor.submit(client.replay_spool)
+        assert started.wait(5)
+        # "one" is being sent by the first replay and still counts as spooled
+        assert client.replay_spool() == (0, 1)
+        release.set()
+        assert first.result() == (1, 0)
+    assert route.call_count == 1
+
+
+@pytest.mark.respx
+def test_client_replay_drops_unsendable_ping(respx_mock, spool):
+    client = Client(api_url=client_kwargs["api_url"], ping_url=client_kwargs["ping_url"], spool=spool)
+    # a slug ping spooled while the client had a ping key
+    spool.append("", "backup", "", "orphan")
+    spool.append("test", "", "", "after")
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=200, text="OK"))
+    assert client.replay_spool() == (1, 0)
+    assert route.call_count == 1
+    assert len(spool) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_client_spool_and_replay(respx_mock, spool):
+    client = AsyncClient(**client_kwargs, spool=spool)
+    assert await AsyncClient(**client_kwargs).replay_spool() == (0, 0)
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(
+        side_effect=[ConnectError("down"), Response(status_code=500), Response(status_code=200, text="OK")]
+    )
+    assert await client.success_ping(uuid="test", data="one") == (True, SPOOLED)
+    assert await client.success_ping(uuid="test", data="two") == (True, SPOOLED)
+    route.side_effect = [ConnectError("down"), Response(status_code=200, text="OK"), Response(status_code=200)]
+    # the first replay stops at the first ping that can't be delivered, keeping the order
+    assert await client.replay_spool() == (0, 2)
+    assert await client.replay_spool() == (2, 0)
+    assert [call.request.content for call in route.calls][-2:] == [b"one", b"two"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_client_concurrent_replays_send_each_ping_once(respx_mock, spool):
+    client = AsyncClient(**client_kwargs, spool=spool)
+    spool.append("test", "", "", "one")
+    started = asyncio.Event()
+
+    async def slow_ok(request):
+        started.set()
+        await asyncio.sleep(0.2)
+        return Response(status_code=200, text="OK")
+
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(side_effect=slow_ok)
+    first = asyncio.ensure_future(client.replay_spool())
+    await started.wait()
+    assert await client.replay_spool() == (0, 1)
+    assert await first == (1, 0)
+    assert route.call_count == 1
+
+
+@pytest.mark.respx
+def test_client_spools_and_replays_rid(respx_mock, spool):
+    client = Client(**client_kwargs, spool=spool)
+    route = respx_mock.post(urljoin(client._ping_url, "test/start")).mock(side_effect=ConnectError("down"))
+    assert client.start_ping(uuid="test", rid="run-1") == (True, SPOOLED)
+    # a ping spooled before run ids were
+    with open(spool.path, "a") as spool_file:
+        spool_file.write('{"uuid": "test", "slug": "", "endpoint": "/start", "data": "", "ts": 0}\n')
+    route.side_effect = None
+    route.return_value = Response(status_code=200, text="OK")
+    assert client.replay_spool() == (2, 0)
+    assert [call.request.url.params.get("rid") for call in route.calls][-2:] == ["run-1", None]
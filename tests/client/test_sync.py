@@ -2,6 +2,7 @@ from urllib.parse import urljoin
 
 import pytest
 from httpx import Client as HTTPXClient
+from httpx import Limits
 from httpx import Response
 
 from healthchecks_io import CheckCreate
@@ -150,6 +151,37 @@ def test_get_checks_tags(fake_check_api_result, respx_mock, test_client):
     assert checks[0].name == fake_check_api_result["name"]
 
 
+@pytest.mark.respx
+def test_ping_uses_separate_client(respx_mock, test_client):
+    assert test_client._ping_client is not test_client._client
+    route = respx_mock.post(urljoin(test_client._ping_url, "test")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    test_client.success_ping(uuid="test")
+    headers = route.calls.last.request.headers
+    assert "x-api-key" not in headers
+    assert "content-type" not in headers
+    assert headers["user-agent"].startswith("py-healthchecks.io/")
+
+
+def test_ping_client_limits():
+    limits = Limits(max_connections=5, max_keepalive_connections=3)
+    test_client = Client(api_key="test", ping_limits=limits, ping_timeout=1.0)
+    ping_pool = test_client._ping_client._transport._pool
+    assert (ping_pool._max_connections, ping_pool._max_keepalive_connections) == (5, 3)
+    assert test_client._ping_client.timeout.read == 1.0
+    api_pool = test_client._client._transport._pool
+    assert (api_pool._max_connections, api_pool._max_keepalive_connections) != (5, 3)
+    assert test_client._client.timeout.read == 5.0
+
+
+def test_passed_in_client_shared_for_pings():
+    httpx_client = HTTPXClient()
+    assert Client(api_key="test", client=httpx_client)._ping_client is httpx_client
+    ping_client = HTTPXClient()
+    assert Client(api_key="test", client=httpx_client, ping_client=ping_client)._ping_client is ping_client
+
+
 def test_finalizer_closes(test_client):
     """Tests our finalizer works to close the method"""
     assert not test_client.is_closed
@@ -330,3 +362,14 @@ def test_success_ping(respx_mocker, tc, url, ping_method, method_kwargs):
     result, text = ping_method(**method_kwargs)
     assert result is True
     assert text == "OK"
+
+
+@pytest.mark.respx
+@pytest.mark.parametrize("respx_mocker, tc, url, ping_method, method_kwargs", ping_test_parameters)
+def test_ping_rid(respx_mocker, tc, url, ping_method, method_kwargs):
+    route = respx_mocker.post(urljoin(tc._ping_url, url)).mock(return_value=Response(status_code=200, text="OK"))
+    assert getattr(tc, ping_method)(**method_kwargs, rid="a7ec1b5e-run") == (True, "OK")
+    request_url = route.calls.last.request.url
+    assert request_url.path.endswith(url) and request_url.params["rid"] == "a7ec1b5e-run"
+    # the url cache keeps the url without the run id
+    assert "rid" not in tc._get_ping_url(method_kwargs.get("uuid", ""), method_kwargs.get("slug", ""), "")
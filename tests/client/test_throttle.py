@@ -0,0 +1,180 @@
+import asyncio
+import time
+from urllib.parse import urljoin
+
+import pytest
+from httpx import ConnectError
+from httpx import Response
+
+from healthchecks_io import AsyncClient
+from healthchecks_io import Client
+from healthchecks_io import PingThrottle
+from healthchecks_io.client.throttle import THROTTLED
+from tests.conftest import client_kwargs
+
+
+def test_throttle_validates_interval():
+    with pytest.raises(ValueError):
+        PingThrottle(0)
+
+
+def test_throttle_suppress():
+    throttle = PingThrottle(60)
+    assert not throttle.suppress("a", "", "")
+    assert throttle.suppress("a", "", "")
+    assert not throttle.suppress("b", "", "")
+    # fail, start and exit code pings always go out and end the interval
+    assert not throttle.suppress("a", "", "/fail")
+    assert not throttle.suppress("a", "", "")
+    assert throttle.suppress("a", "", "")
+    assert throttle.suppressed_for("a") == 2
+    assert throttle.suppressed == 2
+
+
+def test_throttle_never_drops_a_state_change():
+    throttle = PingThrottle(60)
+    sent = [
+        endpoint
+        for endpoint in ["", "", "/fail", "/fail", "", "", "/start", "/0", "", "/fail"]
+        if not throttle.suppress("a", "", endpoint)
+    ]
+    assert sent == ["", "/fail", "/fail", "", "/start", "/0", "", "/fail"]
+    # a failed success ping doesn't forget the fail sent since
+    throttle.release("a", "", "")
+    assert throttle.suppress("a", "", "") is False
+    assert throttle.suppress("a", "", "") is True
+    throttle.release("a", "", "")
+    assert throttle.suppress("a", "", "") is False
+
+
+def test_throttle_keeps_newest_held_back_ping():
+    throttle = PingThrottle(60)
+    assert throttle.take_pending("a", "") is None
+    assert not throttle.suppress("a", "", "", "first")
+    assert throttle.suppress("a", "", "", "second")
+    assert throttle.suppress("a", "", "", "third")
+    assert 59 < throttle.pending_delay("a", "") <= 60
+    assert throttle.take_pending("a", "") == "third"
+    assert throttle.take_pending("a", "") is None
+    # it was sent, so it starts the check's interval
+    assert throttle.suppress("a", "", "", "fourth")
+    # a success let through is newer than the one held back
+    throttle._last_sent[("a", "")] = ("", time.monotonic() - 60)
+    assert throttle.pending_delay("a", "") == 0
+    assert not throttle.suppress("a", "", "", "fifth")
+    assert throttle.take_pending("a", "") is None
+
+
+def test_throttle_interval_passes():
+    throttle = PingThrottle(0.001)
+    assert not throttle.suppress("", "slug", "")
+    throttle._last_sent[("", "slug")] = ("", throttle._last_sent[("", "slug")][1] - 1)
+    assert not throttle.suppress("", "slug", "")
+
+
+@pytest.mark.respx
+def test_client_throttle(respx_mock):
+    throttle = PingThrottle(60)
+    client = Client(**client_kwargs, ping_throttle=throttle)
+    success = respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=200, text="OK"))
+    fail = respx_mock.post(urljoin(client._ping_url, "test/fail")).mock(
+        return_value=Response(status_code=200, text="OK")
+    )
+    assert client.success_ping(uuid="test") == (True, "OK")
+    assert client.success_ping(uuid="test", data="held back") == (True, THROTTLED)
+    # the success held back goes out before the fail
+    assert client.fail_ping(uuid="test") == (True, "OK")
+    assert success.calls.last.request.content == b"held back"
+    assert client.success_ping(uuid="test") == (True, "OK")
+    assert (success.call_count, fail.call_count, throttle.suppressed) == (3, 1, 1)
+
+
+@pytest.mark.respx
+def test_client_throttle_releases_failed_pings(respx_mock):
+    client = Client(**client_kwargs, ping_throttle=PingThrottle(60))
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(
+        side_effect=[ConnectError("down"), Response(status_code=200, text="OK")]
+    )
+    with pytest.raises(ConnectError):
+        client.success_ping(uuid="test")
+    assert client.success_ping(uuid="test") == (True, "OK")
+    assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_client_throttle(respx_mock):
+    throttle = PingThrottle(60)
+    client = AsyncClient(**client_kwargs, ping_throttle=throttle)
+    ok = Response(status_code=200, text="OK")
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(side_effect=[ok, ok, ConnectError("down"), ok])
+    exit_code = respx_mock.post(urljoin(client._ping_url, "test/0")).mock(return_value=ok)
+    assert await client.success_ping(uuid="test") == (True, "OK")
+    assert await client.success_ping(uuid="test") == (True, THROTTLED)
+    assert await client.exit_code_ping(0, uuid="test") == (True, "OK")
+    assert (route.call_count, exit_code.call_count) == (2, 1)
+    with pytest.raises(ConnectError):
+        await client.success_ping(uuid="test")
+    assert await client.success_ping(uuid="test") == (True, "OK")
+    assert route.call_count == 4
+    assert throttle.suppressed_for(uuid="test") == 1
+
+
+@pytest.mark.respx
+def test_client_throttle_skips_runs(respx_mock):
+    throttle = PingThrottle(60)
+    client = Client(**client_kwargs, ping_throttle=throttle)
+    success = respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=200, text="OK"))
+    assert client.success_ping(uuid="test") == (True, "OK")
+    # each run's success ping is needed to pair it with its start ping
+    assert client.success_ping(uuid="test", rid="run-1") == (True, "OK")
+    assert client.success_ping(uuid="test", rid="run-2") == (True, "OK")
+    assert client.success_ping(uuid="test") == (True, THROTTLED)
+    assert success.call_count == 3
+
+
+@pytest.mark.respx
+def test_client_throttle_sends_last_ping_of_burst(respx_mock):
+    client = Client(**client_kwargs, ping_throttle=PingThrottle(1.0))
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=200, text="OK"))
+    for index in range(5):
+        client.success_ping(uuid="test", data=f"batch {index}")
+    assert route.call_count == 1
+    # the newest ping held back goes out when the interval ends
+    waited = 0.0
+    while route.call_count < 2 and waited < 5:
+        time.sleep(0.05)
+        waited += 0.05
+    assert route.call_count == 2
+    assert route.calls.last.request.content == b"batch 4"
+    assert client._throttle_timers == dict()
+
+
+@pytest.mark.respx
+def test_client_close_sends_held_back_ping(respx_mock):
+    client = Client(**client_kwargs, ping_throttle=PingThrottle(60))
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=200, text="OK"))
+    with client:
+        client.success_ping(uuid="test", data="first")
+        client.success_ping(uuid="test", data="last")
+        assert route.call_count == 1
+    assert route.call_count == 2
+    assert route.calls.last.request.content == b"last"
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx
+async def test_async_client_throttle_sends_last_ping_of_burst(respx_mock):
+    client = AsyncClient(**client_kwargs, ping_throttle=PingThrottle(1.0))
+    route = respx_mock.post(urljoin(client._ping_url, "test")).mock(return_value=Response(status_code=200, text="OK"))
+    for index in range(5):
+        await client.success_ping(uuid="test", data=f"batch {index}")
+    assert route.call_count == 1
+    await client._throttle_tasks[("test", "")]
+    assert route.call_count == 2
+    assert route.calls.last.request.content == b"batch 4"
+    # and at close
+    await client.success_ping(uuid="test", data="closing")
+    await client._afinalizer_method()
+    assert route.call_count == 3
+    assert route.calls.last.request.content == b"closing"
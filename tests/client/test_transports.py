@@ -0,0 +1,307 @@
+import asyncio
+import http.client
+import itertools
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+from httpx import AsyncClient as HTTPXAsyncClient
+from httpx import Client as HTTPXClient
+from httpx import ConnectError
+from httpx import ReadTimeout
+from httpx import Request
+
+from healthchecks_io import AsyncClient
+from healthchecks_io import AsyncStreamTransport
+from healthchecks_io import CheckNotFoundError
+from healthchecks_io import Client
+from healthchecks_io import HTTPClientTransport
+from tests.conftest import PingHandler
+
+
+class TransportHandler(PingHandler):
+    """Answers like the ping api, with the response framing picked by the last part of the path.
+
+    Each connection gets a number, and the number of the connection each request came on is recorded in
+    connections. Requests to a "slow" path wait for the release event before they're answered.
+    """
+
+    connections = []
+    close_after_response = False
+    numbers = itertools.count()
+    # set when a slow request arrives, and set by the test to answer it
+    received = threading.Event()
+    release = threading.Event()
+    # released each time the server closes a connection
+    closed = threading.Semaphore(0)
+
+    def setup(self):
+        super().setup()
+        self.number = next(self.numbers)
+
+    def _answer(self):
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        self.connections.append(self.number)
+        kind = self.path.rsplit("/", 1)[-1]
+        if kind == "slow":
+            self.received.set()
+            self.release.wait(5)
+        self.send_response(404 if kind == "missing" else 200)
+        if kind == "chunked":
+            self.send_header("transfer-encoding", "chunked")
+            self.end_headers()
+            self.wfile.write(b"1;ext=1\r\nO\r\n1\r\nK\r\n0\r\ntrailer: 1\r\n\r\n")
+        elif kind == "close":
+            # no length, the body runs until the connection closes
+            self.send_header("connection", "close")
+            self.end_headers()
+            self.wfile.write(b"OK")
+            self.close_connection = True
+        else:
+            self.send_header("content-length", "2")
+            self.end_headers()
+            self.wfile.write(b"OK")
+            # closes without a connection: close header, like a server dropping an idle keep-alive connection
+            self.close_connection = self.close_after_response
+
+    def do_HEAD(self):
+        self.connections.append(self.number)
+        super().do_HEAD()
+
+    do_GET = _answer
+    do_POST = _answer
+
+
+class TransportServer(ThreadingHTTPServer):
+    """Tells the tests when it has closed a connection."""
+
+    daemon_threads = True
+
+    def shutdown_request(self, request):
+        super().shutdown_request(request)
+        TransportHandler.closed.release()
+
+
+@pytest.fixture
+def transport_server():
+    TransportHandler.connections = []
+    TransportHandler.close_after_response = False
+    TransportHandler.numbers = itertools.count()
+    TransportHandler.received = threading.Event()
+    TransportHandler.release = threading.Event()
+    TransportHandler.closed = threading.Semaphore(0)
+    server = TransportServer(("127.0.0.1", 0), TransportHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    TransportHandler.release.set()
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_pings_over_http_client_transport(transport_server):
+    transport = HTTPClientTransport()
+    client = Client(ping_url=transport_server, ping_transport=transport)
+    assert client.prewarm(api=False).join() is None
+    for _ in range(3):
+        assert client.success_ping(uuid="test") == (True, "OK")
+    with pytest.raises(CheckNotFoundError):
+        client.success_ping(uuid="missing")
+    # the prewarm's connection carried every ping
+    assert TransportHandler.connections == [0] * 5
+    assert client._ping_client._transport is transport
+    client._finalizer_method()
+    assert transport._idle == dict()
+
+
+def test_http_client_transport_response_framing(transport_server):
+    with HTTPXClient(transport=HTTPClientTransport()) as client:
+        response = client.get(f"{transport_server}chunked")
+        assert (response.status_code, response.text) == (200, "OK")
+        response = client.post(f"{transport_server}close", content=b"data")
+        assert (response.status_code, response.text) == (200, "OK")
+        assert response.extensions["http_version"] == b"HTTP/1.1"
+        # the second request reused the first one's connection, then the server closed it
+        assert client._transport._idle[("http", "127.0.0.1", response.url.port)] == []
+
+
+def test_http_client_transport_reconnects_after_server_closed_connection(transport_server):
+    TransportHandler.close_after_response = True
+    with HTTPXClient(transport=HTTPClientTransport()) as client:
+        assert client.post(f"{transport_server}test").text == "OK"
+        assert TransportHandler.closed.acquire(timeout=5)
+        assert client.post(f"{transport_server}test").text == "OK"
+    assert TransportHandler.connections == [0, 1]
+
+
+def test_http_client_transport_errors(transport_server):
+    with HTTPXClient(transport=HTTPClientTransport(), timeout=0.1) as client:
+        with pytest.raises(ConnectError):
+            client.post("http://127.0.0.1:1/test")
+        with pytest.raises(ReadTimeout):
+            client.post(f"{transport_server}slow")
+        with pytest.raises(ConnectError):
+            client.post("https://127.0.0.1:1/test")
+        assert client._transport._ssl_context is not None
+
+
+def test_http_client_transport_closes_interrupted_request(transport_server, monkeypatch):
+    closed = []
+    close = http.client.HTTPConnection.close
+
+    def interrupt(self):
+        raise KeyboardInterrupt
+
+    def record_close(self):
+        closed.append(self)
+        close(self)
+
+    monkeypatch.setattr(http.client.HTTPConnection, "getresponse", interrupt)
+    monkeypatch.setattr(http.client.HTTPConnection, "close", record_close)
+    transport = HTTPClientTransport()
+    with pytest.raises(KeyboardInterrupt):
+        transport.handle_request(Request("POST", f"{transport_server}test"))
+    assert len(closed) == 1
+    assert transport._idle == dict()
+
+
+def test_http_client_transport_pool():
+    transport = HTTPClientTransport(max_idle_connections=1)
+    key = ("http", "localhost", 80)
+
+    class Connection:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    first, second = Connection(), Connection()
+    transport._checkin(key, first)
+    transport._checkin(key, second)
+    assert second.closed and not first.closed
+    # a forked child doesn't use the parent's connections
+    transport._pid = -1
+    assert transport._checkout(key) is None
+    transport._checkin(key, first)
+    assert transport._checkout(key) is first
+
+
+@pytest.mark.asyncio
+async def test_async_client_pings_over_stream_transport(transport_server):
+    transport = AsyncStreamTransport()
+    client = AsyncClient(ping_url=transport_server, ping_transport=transport)
+    await client.prewarm(api=False)
+    for _ in range(3):
+        assert await client.success_ping(uuid="test") == (True, "OK")
+    with pytest.raises(CheckNotFoundError):
+        await client.success_ping(uuid="missing")
+    results = await asyncio.gather(*(client.success_ping(uuid=f"check-{index}") for index in range(4)))
+    assert results == [(True, "OK")] * 4
+    # the prewarm and the sequential pings share a connection, concurrent ones open more
+    assert TransportHandler.connections[:5] == [0] * 5
+    assert set(TransportHandler.connections) == {0, 1, 2, 3}
+    await client._ping_client.aclose()
+    assert transport._idle == dict()
+
+
+@pytest.mark.asyncio
+async def test_async_stream_transport_response_framing(transport_server):
+    async with HTTPXAsyncClient(transport=AsyncStreamTransport()) as client:
+        response = await client.get(f"{transport_server}chunked")
+        assert (response.status_code, response.text) == (200, "OK")
+        response = await client.post(f"{transport_server}close", content=b"data")
+        assert (response.status_code, response.text) == (200, "OK")
+        assert response.extensions["reason_phrase"] == b"OK"
+        assert client._transport._idle[("http", "127.0.0.1", response.url.port)] == []
+
+
+class ClosedByServer:
+    """The writer of a keep-alive connection the server closed while it was idle."""
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.closed = False
+
+    def write(self, data):
+        self.reader.feed_eof()
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_async_stream_transport_reconnects_after_server_closed_connection(transport_server):
+    transport = AsyncStreamTransport()
+    async with HTTPXAsyncClient(transport=transport) as client:
+        url = f"{transport_server}test"
+        key = ("http", "127.0.0.1", int(transport_server.rsplit(":", 1)[1].strip("/")))
+        reader = asyncio.StreamReader()
+        stale = ClosedByServer(reader)
+        transport._idle[key] = [(reader, stale)]
+        assert (await client.post(url)).text == "OK"
+        assert stale.closed
+        # a connection whose close was already read isn't used
+        closed = asyncio.StreamReader()
+        closed.feed_eof()
+        closed_writer = ClosedByServer(closed)
+        transport._idle[key].append((closed, closed_writer))
+        TransportHandler.close_after_response = True
+        assert (await client.post(url)).text == "OK"
+        assert closed_writer.closed
+        assert TransportHandler.closed.acquire(timeout=5)
+        assert (await client.post(url)).text == "OK"
+    assert TransportHandler.connections == [0, 0, 1]
+
+
+def test_async_stream_transport_drops_parent_connections_after_fork():
+    transport = AsyncStreamTransport()
+    key = ("http", "localhost", 80)
+    transport._idle[key] = [(asyncio.StreamReader(), ClosedByServer(None))]
+    transport._pid = -1
+    assert transport._checkout(key) is None
+    assert transport._idle == dict()
+
+
+@pytest.mark.asyncio
+async def test_async_stream_transport_errors(transport_server):
+    async with HTTPXAsyncClient(transport=AsyncStreamTransport(), timeout=0.1) as client:
+        with pytest.raises(ConnectError):
+            await client.post("http://127.0.0.1:1/test")
+        with pytest.raises(ReadTimeout):
+            await client.post(f"{transport_server}slow")
+        with pytest.raises(ConnectError):
+            await client.post("https://127.0.0.1:1/test")
+        assert client._transport._ssl_context is not None
+
+
+@pytest.mark.asyncio
+async def test_async_stream_transport_closes_cancelled_request(transport_server):
+    transport = AsyncStreamTransport()
+    streams = []
+    connect = transport._connect
+
+    async def record_connect(*args):
+        stream = await connect(*args)
+        streams.append(stream)
+        return stream
+
+    transport._connect = record_connect
+    task = asyncio.ensure_future(transport.handle_async_request(Request("POST", f"{transport_server}slow")))
+    # cancel it once the server has the request, while it waits for the response
+    assert await asyncio.get_running_loop().run_in_executor(None, TransportHandler.received.wait, 5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert streams[0][1].is_closing()
+    assert transport._idle == dict()
+
+
+def test_async_stream_transport_request_head():
+    request = Request("POST", "http://localhost:8000/ping/test?rid=1", content=b"data")
+    head = AsyncStreamTransport._head(request)
+    assert head.startswith(b"POST /ping/test?rid=1 HTTP/1.1\r\nHost: localhost:8000\r\n")
+    assert b"\r\nContent-Length: 4\r\n" in head
+    assert head.endswith(b"\r\n\r\n")
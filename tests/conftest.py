@@ -1,4 +1,7 @@
+import threading
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
 from typing import Dict
 from typing import Union
 
@@ -109,6 +112,42 @@ def test_abstract_client():
     yield AbstractClient(**client_kwargs)
 
 
+class PingHandler(BaseHTTPRequestHandler):
+    """Answers every request with a 200 OK, like the ping api does."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _answer(self):
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        self.send_response(200)
+        self.send_header("content-length", "2")
+        self.end_headers()
+        self.wfile.write(b"OK")
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("content-length", "2")
+        self.end_headers()
+
+    do_GET = _answer
+    do_POST = _answer
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    """A local http server answering every request with a 200 OK, yields its url."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PingHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
 @pytest.fixture
 def fake_check_pings_api_result():
     yield [
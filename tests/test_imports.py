@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+import pytest
+
+import healthchecks_io
+
+HEAVY_MODULES = ("pydantic", "croniter", "pytz")
+
+
+def imported_modules(code):
+    """Runs code in a fresh interpreter and returns the modules -X importtime saw it import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    return {line.split("|")[-1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+
+
+def test_pinging_does_not_import_schemas():
+    modules = imported_modules(
+        "import healthchecks_io; healthchecks_io.Client(ping_url='http://127.0.0.1:1/')._get_ping_url('uuid', '', '')"
+    )
+    assert "healthchecks_io.client.sync_client" in modules
+    assert not {module.split(".")[0] for module in modules} & set(HEAVY_MODULES)
+    assert "healthchecks_io.client.async_client" not in modules
+
+
+def test_schemas_import_on_first_use():
+    modules = imported_modules("import healthchecks_io; healthchecks_io.Check")
+    assert "healthchecks_io.schemas.checks" in modules
+    assert "pydantic" in modules
+
+
+def test_lazy_exports():
+    assert set(healthchecks_io.__all__) <= set(dir(healthchecks_io))
+    assert healthchecks_io.SlugResolver is healthchecks_io.client.resolver.SlugResolver
+    with pytest.raises(AttributeError):
+        healthchecks_io.NotExported
@@ -0,0 +1,102 @@
+import threading
+from urllib.parse import urljoin
+
+import pytest
+from httpx import Response
+
+from healthchecks_io import AsyncClient
+from healthchecks_io import AsyncPingDispatcher
+from healthchecks_io import Client
+from healthchecks_io import ClientMetrics
+from healthchecks_io import HCAPIRateLimitError
+from healthchecks_io import RequestEvent
+from healthchecks_io import RetryPolicy
+from tests.conftest import client_kwargs
+
+
+def make_event(operation="success_ping", elapsed=0.02, exception=None, attempts=1, spooled=False):
+    event = RequestEvent(operation, True, "POST", "https://hc-ping.com/test")
+    event.elapsed = elapsed
+    event.exception = exception
+    event.attempts = attempts
+    event.spooled = spooled
+    return event
+
+
+def test_metrics_validates_buckets():
+    with pytest.raises(ValueError):
+        ClientMetrics(buckets=())
+    with pytest.raises(ValueError):
+        ClientMetrics(buckets=(1.0, 0.5))
+
+
+def test_metrics_render():
+    metrics = ClientMetrics(buckets=(0.01, 0.1))
+    metrics.record(make_event(elapsed=0.005))
+    metrics.record(make_event(elapsed=0.05, attempts=3))
+    metrics.record(make_event(elapsed=1, exception=HCAPIRateLimitError))
+    metrics.record(make_event(operation="fail_ping", spooled=True))
+    text = metrics.render()
+    labels = 'operation="success_ping",host="hc-ping.com"'
+    assert f'healthchecks_io_request_duration_seconds_bucket{{{labels},le="0.01"}} 1' in text
+    assert f'healthchecks_io_request_duration_seconds_bucket{{{labels},le="0.1"}} 2' in text
+    assert f'healthchecks_io_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+    assert f"healthchecks_io_request_duration_seconds_count{{{labels}}} 3" in text
+    assert f"healthchecks_io_request_duration_seconds_sum{{{labels}}} 1.055" in text
+    assert 'healthchecks_io_requests_total{operation="success_ping",result="success",exception=""} 2' in text
+    assert (
+        'healthchecks_io_requests_total{operation="success_ping",result="failure",exception="HCAPIRateLimitError"} 1'
+        in text
+    )
+    assert 'healthchecks_io_requests_total{operation="fail_ping",result="spooled",exception=""} 1' in text
+    assert 'healthchecks_io_retries_total{operation="success_ping"} 2' in text
+    assert text.startswith("# TYPE healthchecks_io_request_duration_seconds histogram\n")
+    assert text.endswith("# EOF\n")
+
+
+def test_metrics_sums_thread_shards():
+    metrics = ClientMetrics()
+
+    def record():
+        for _ in range(1000):
+            metrics.record(make_event())
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(metrics._shards) == 4
+    assert 'healthchecks_io_requests_total{operation="success_ping",result="success",exception=""} 4000' in (
+        metrics.render()
+    )
+
+
+def test_metrics_escapes_labels():
+    metrics = ClientMetrics(namespace="jobs")
+    metrics.record(make_event(operation='a"b\\c\n'))
+    assert 'jobs_requests_total{operation="a\\"b\\\\c\\n",result="success",exception=""} 1' in metrics.render()
+
+
+@pytest.mark.respx
+def test_metrics_attach(respx_mock):
+    client = Client(**client_kwargs, retry_policy=RetryPolicy(base_delay=0.001, max_delay=0.01))
+    metrics = ClientMetrics()
+    metrics.attach(client)
+    respx_mock.post(urljoin(client._ping_url, "test")).mock(
+        side_effect=[Response(status_code=429), Response(status_code=200, text="OK")]
+    )
+    client.success_ping(uuid="test")
+    metrics.detach(client)
+    text = metrics.render()
+    assert 'healthchecks_io_requests_total{operation="success_ping",result="success",exception=""} 1' in text
+    assert 'healthchecks_io_retries_total{operation="success_ping"} 1' in text
+    assert not client._listeners
+
+
+@pytest.mark.asyncio
+async def test_metrics_queue_depth():
+    metrics = ClientMetrics()
+    dispatcher = AsyncPingDispatcher(AsyncClient(**client_kwargs))
+    metrics.watch_queue(dispatcher, name="pings")
+    assert 'healthchecks_io_ping_queue_depth{queue="pings"} 0' in metrics.render()
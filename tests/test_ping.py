@@ -0,0 +1,105 @@
+import subprocess
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from healthchecks_io import BadAPIRequestError
+from healthchecks_io import CheckNotFoundError
+from healthchecks_io import HCAPIError
+from healthchecks_io import NonUniqueSlugError
+from healthchecks_io import Pinger
+from tests.conftest import PingHandler
+
+
+class RecordingHandler(PingHandler):
+    """Answers like the ping api, recording each request and closing the connection when asked to."""
+
+    requests = []
+    close_after_response = False
+
+    def _answer(self):
+        body = self.rfile.read(int(self.headers.get("content-length", 0)))
+        self.requests.append((self.path, body, self.client_address[1]))
+        status = {"missing": 404, "shared": 409, "down": 503}.get(self.path.rsplit("/", 1)[-1], 200)
+        self.send_response(status)
+        self.send_header("content-length", "2")
+        self.end_headers()
+        self.wfile.write(b"OK")
+        # closes without a connection: close header, like a server dropping an idle keep-alive connection
+        self.close_connection = self.close_after_response
+
+    do_POST = _answer
+
+
+@pytest.fixture
+def ping_server():
+    RecordingHandler.requests = []
+    RecordingHandler.close_after_response = False
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/ping"
+    server.shutdown()
+    server.server_close()
+
+
+def test_pinger_pings(ping_server):
+    with Pinger(ping_key="1234", ping_url=ping_server) as pinger:
+        assert pinger.start_ping(uuid="test") == (True, "OK")
+        assert pinger.success_ping(slug="backup", data="done") == (True, "OK")
+        assert pinger.fail_ping(uuid="test") == (True, "OK")
+        assert pinger.exit_code_ping(3, uuid="test") == (True, "OK")
+        assert pinger.log_ping(uuid="test", data="ünïcode") == (True, "OK")
+    assert pinger._connection is None
+    paths = [path for path, _, _ in RecordingHandler.requests]
+    assert paths == ["/ping/test/start", "/ping/1234/backup", "/ping/test/fail", "/ping/test/3", "/ping/test/log"]
+    assert RecordingHandler.requests[1][1] == b"done"
+    assert RecordingHandler.requests[4][1] == "ünïcode".encode("utf-8")
+    # every ping went over the same keep-alive connection
+    assert len({port for _, _, port in RecordingHandler.requests}) == 1
+
+
+def test_pinger_reconnects_after_server_closed_connection(ping_server):
+    RecordingHandler.close_after_response = True
+    pinger = Pinger(ping_url=ping_server)
+    assert pinger.success_ping(uuid="test") == (True, "OK")
+    assert pinger.success_ping(uuid="test") == (True, "OK")
+    assert len({port for _, _, port in RecordingHandler.requests}) == 2
+    pinger.close()
+
+
+def test_pinger_errors(ping_server):
+    pinger = Pinger(ping_url=ping_server)
+    with pytest.raises(BadAPIRequestError):
+        pinger.success_ping(slug="no-ping-key")
+    with pytest.raises(CheckNotFoundError):
+        pinger.success_ping(uuid="missing")
+    with pytest.raises(NonUniqueSlugError):
+        Pinger(ping_key="1234", ping_url=ping_server).success_ping(slug="shared")
+    with pytest.raises(HCAPIError):
+        pinger.success_ping(uuid="down")
+    with pytest.raises(ConnectionRefusedError):
+        Pinger(ping_url="http://127.0.0.1:1/").success_ping(uuid="test")
+    pinger.close()
+
+
+def test_pinger_https_connection():
+    pinger = Pinger(ping_url="https://hc-ping.com")
+    assert type(pinger._connect()).__name__ == "HTTPSConnection"
+
+
+def test_ping_module_imports_only_the_standard_library():
+    code = "import sys, healthchecks_io.ping; print(sorted(m for m in ('httpx', 'pydantic') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_pinger_rid(ping_server):
+    with Pinger(ping_key="1234", ping_url=ping_server) as pinger:
+        assert pinger.start_ping(uuid="test", rid="run-1") == (True, "OK")
+        assert pinger.exit_code_ping(0, slug="backup", rid="run 2") == (True, "OK")
+    paths = [path for path, _, _ in RecordingHandler.requests]
+    assert paths == ["/ping/test/start?rid=run-1", "/ping/1234/backup/0?rid=run+2"]